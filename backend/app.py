@@ -1,37 +1,84 @@
 # app.py
 
+import json
 from contextlib import asynccontextmanager
+from typing import Any
+from threading import Lock
+from uuid import uuid4
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, HTTPException
+from collections.abc import AsyncIterator, Iterator
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from question import (
     evaluate,
+    evaluate_batch,
+    prepare_evaluation,
+    finish_evaluation,
     create_question,
-    get_all_questions,
+    create_questions,
+    list_questions,
+    iter_questions,
+    get_version,
     update_question,
     delete_question,
+    get_similar_questions,
+    get_question_stats,
+    get_bank_stats,
+    find_duplicates,
+    encode_statement,
+    search_questions,
     save_questions_to_json,
     load_questions_from_json, 
+    questions,
 )
 
 from admin import admin_login
+from batching import batcher
+from inference import executor as inference_executor, InferenceQueueFull
+from worker_pool import pool as worker_pool
+from similarity_cache import similarity_cache
+from submissions import submissions
+from grading_stats import grading_stats
+from lexical import cascade
+from warmup import warmup
+from metrics import STAGE_SECONDS, MetricsMiddleware, register_gauge, render as render_metrics
+import config
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Gerenciador de ciclo de vida da aplicação, executando rotinas de inicialização
-    e finalização, como carregar e salvar questões.
+    e finalização, como carregar e salvar questões. Com config.WARMUP ativo, o modelo
+    e os embeddings são aquecidos em segundo plano e /readyz só responde 200 ao final.
+    Sem ele, o modelo só é importado e carregado na primeira requisição que usar NLP.
 
     Args:
         app (FastAPI): Instância do aplicativo FastAPI.
 
     ## Assertivas de saída:
         - O arquivo questions.json será carregado no início da aplicação (se existir).
+        - Sem aquecimento, a inicialização não importa o torch nem carrega o modelo.
         - As questões serão salvas no arquivo questions.json ao final da execução.
+        - A fila de avaliações agrupadas e os pools de inferência serão encerrados ao final da execução.
+        - As submissões pendentes do histórico serão gravadas antes do encerramento.
+        - As estatísticas de avaliação serão recarregadas no início e salvas ao final da execução.
     """
 
-    load_questions_from_json()
+    load_questions_from_json(precompute=False)
+    submissions.start()
+    grading_stats.start()
+    if config.WARMUP:
+        warmup.start()
+    else:
+        warmup.mark_ready()
     yield
+    inference_executor.shutdown()
+    batcher.stop()
+    worker_pool.shutdown()
+    submissions.stop()
+    grading_stats.stop()
     save_questions_to_json()
 
 
@@ -43,34 +90,162 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Duplicate-Of", "X-Duplicate-Check"],
 )
+app.add_middleware(MetricsMiddleware)
+
+# Métricas lidas dos demais módulos no momento da coleta, sem custo nas requisições
+register_gauge('flavify_questions', "Questões no banco.", lambda: len(questions))
+register_gauge('flavify_similarity_cache_hits_total', "Acertos do cache de similaridades.",
+               lambda: similarity_cache.stats()['hits'], kind='counter')
+register_gauge('flavify_similarity_cache_misses_total', "Falhas do cache de similaridades.",
+               lambda: similarity_cache.stats()['misses'], kind='counter')
+register_gauge('flavify_similarity_cache_hit_rate', "Taxa de acertos do cache de similaridades.",
+               lambda: similarity_cache.stats()['hit_rate'])
+register_gauge('flavify_similarity_cache_size', "Entradas no cache de similaridades.",
+               lambda: similarity_cache.stats()['size'])
+register_gauge('flavify_cascade_hit_rate', "Fração das respostas avaliadas sem o codificador (cascata lexical).",
+               lambda: cascade.stats()['hit_rate'])
+register_gauge('flavify_cascade_encoder_total', "Respostas enviadas ao codificador pela cascata lexical.",
+               lambda: cascade.stats()['encoder'], kind='counter')
+register_gauge('flavify_inference_pending', "Avaliações em execução ou na fila de inferência.",
+               lambda: inference_executor.stats()['pending'])
+register_gauge('flavify_inference_rejected_total', "Avaliações recusadas com a fila cheia (503).",
+               lambda: inference_executor.stats()['rejected'], kind='counter')
+register_gauge('flavify_batching_mean_batch_size', "Tamanho médio dos lotes de avaliações agrupadas.",
+               lambda: batcher.stats()['mean_batch_size'])
+register_gauge('flavify_submissions_written_total', "Submissões gravadas no histórico.",
+               lambda: submissions.stats()['written'], kind='counter')
+register_gauge('flavify_submissions_flushes_total', "Gravações em lote do histórico de submissões.",
+               lambda: submissions.stats()['flushes'], kind='counter')
+register_gauge('flavify_submissions_dropped_total', "Submissões descartadas com a fila do histórico cheia.",
+               lambda: submissions.stats()['dropped'], kind='counter')
+register_gauge('flavify_ready', "1 quando o aquecimento terminou (/readyz).",
+               lambda: 1.0 if warmup.is_ready() else 0.0)
+
+
+# Respostas serializadas de GET /questions, válidas apenas para a versão _listing_version
+# do banco. O prefixo aleatório do ETag evita colisões entre reinícios do processo.
+_listing_epoch: str = uuid4().hex[:8]
+_listing_version: int = -1
+_listing_cache: dict[tuple[int | None, str | None, str | None, str | None], tuple[bytes, str | None]] = {}
+_listing_lock: Lock = Lock()
+_LISTING_CACHE_SIZE: int = 256
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Verifica se o cabeçalho If-None-Match contém o ETag informado."""
+
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
 
 
 @app.get('/questions')
-def api_get_all_questions() -> dict[str, dict[str, str]]:
+def api_get_all_questions(
+    limit: int | None = Query(None, ge=1, le=1000),
+    cursor: str | None = None,
+    q: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
     """
-    Endpoint que retorna todas as questões cadastradas.
+    Endpoint que retorna as questões cadastradas, com paginação, filtro e projeção opcionais.
+    Sem parâmetros, retorna todas as questões. A resposta traz um ETag derivado da versão
+    do banco; enquanto nada mudar, o JSON já serializado é reaproveitado e um
+    If-None-Match igual ao ETag recebe 304 sem corpo.
+
+    Args:
+        limit (int | None): Quantidade máxima de questões por página (1 a 1000).
+        cursor (str | None): Valor do cabeçalho X-Next-Cursor da página anterior.
+        q (str | None): Texto a ser buscado no enunciado.
+        fields (str | None): Campos retornados, separados por vírgula
+            (ex.: question_id,statement para a página dos alunos).
 
     Returns:
-        (dict[str, dict[str, str]]): Dicionário contendo todas as questões registradas.
+        (Response): JSON com um dicionário contendo as questões da página.
 
     ## Assertivas de saída:
-        - Cada questão retornada possui campos question_id, statement e correct_answer.
+        - Sem fields, cada questão retornada possui campos question_id, statement e correct_answer.
         - O question_id de cada questão corresponde à chave do dicionário.
+        - Se houver mais questões, o cabeçalho X-Next-Cursor traz o cursor da próxima página.
+        - Retorna 304 se If-None-Match corresponder à versão atual.
+        - Retorna erro HTTP 400 se o cursor ou algum campo for inválido.
+    """
+
+    global _listing_version
+
+    version = get_version()
+    etag = f'"{_listing_epoch}-{version}"'
+    # O ETag só depende da versão: a revalidação não consulta nem preenche o cache de respostas
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={'ETag': etag})
+
+    key = (limit, cursor, q, fields)
+
+    with _listing_lock:
+        if version != _listing_version:
+            _listing_cache.clear()
+            _listing_version = version
+        cached = _listing_cache.get(key)
+
+    if cached is None:
+        field_list = None if fields is None else [f.strip() for f in fields.split(',') if f.strip()]
+        try:
+            page, next_cursor = list_questions(limit, cursor, q, field_list)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cached = (json.dumps(page, ensure_ascii=False).encode('utf-8'), next_cursor)
+        with _listing_lock:
+            if version == _listing_version and len(_listing_cache) < _LISTING_CACHE_SIZE:
+                _listing_cache[key] = cached
+
+    content, next_cursor = cached
+    headers = {'ETag': etag}
+    if next_cursor is not None:
+        headers['X-Next-Cursor'] = next_cursor
+    return Response(content=content, media_type='application/json', headers=headers)
+
+
+def _valid_alternatives(alternatives: object) -> bool:
+    """Verifica se as respostas alternativas são uma lista de textos não vazios."""
+    return isinstance(alternatives, list) and all(isinstance(a, str) and a.strip() for a in alternatives)
+
+
+def _question_body(body: dict[str, str | list[str]]) -> tuple[str, str, list[str] | None]:
     """
+    Extrai enunciado, gabarito e respostas alternativas do corpo de criação ou atualização.
 
-    return get_all_questions()
+    ## Assertivas de saída:
+        - Campos ausentes viram '' (enunciado e gabarito) ou None (alternativas).
+        - Levanta HTTPException 422 se statement ou correct_answer não forem strings, ou se
+          alternative_answers não for uma lista de textos não vazios (a mesma regra da
+          importação em lote).
+    """
+
+    statement = body.get('statement', '')
+    correct_answer = body.get('correct_answer', '')
+    alternatives = body.get('alternative_answers')
+    if not isinstance(statement, str) or not isinstance(correct_answer, str):
+        raise HTTPException(status_code=422, detail="statement e correct_answer devem ser textos.")
+    if alternatives is not None and not _valid_alternatives(alternatives):
+        raise HTTPException(status_code=422, detail="alternative_answers deve ser uma lista de textos não vazios.")
+    return statement, correct_answer, alternatives
 
 
 @app.post('/questions')
-def api_create_question(body: dict[str, str]) -> int:
+def api_create_question(body: dict[str, str | list[str]], response: Response) -> int:
     """
-    Endpoint para criação de uma nova questão.
+    Endpoint para criação de uma nova questão. Se já houver questões com enunciado
+    quase igual, a questão é criada mesmo assim e os seus identificadores são
+    informados no cabeçalho X-Duplicate-Of.
 
     Args:
-        body (dict[str, str]): Dicionário contendo os campos:
+        body (dict[str, str | list[str]]): Dicionário contendo os campos:
             - statement (str): enunciado da questão.
             - correct_answer (str): gabarito da questão.
+            - alternative_answers (list[str], opcional): outras respostas aceitas como corretas.
 
     Returns:
         (int): Código indicando o sucesso (1) ou falha (0) na criação.
@@ -79,23 +254,306 @@ def api_create_question(body: dict[str, str]) -> int:
         - Os campos statement e correct_answer devem ser strings não vazias.
     ## Assertivas de saída:
         - Retorna 1 em caso de sucesso e 0 em caso de falha.
+        - X-Duplicate-Of traz os question_id das possíveis duplicatas, separados por vírgula.
+        - X-Duplicate-Check vale 'skipped' se a verificação não foi feita (embeddings ainda
+          não carregados, ex.: durante o aquecimento ou com FLAVIFY_WARMUP=0).
     """
 
-    statement = body.get('statement', '')
-    correct_answer = body.get('correct_answer', '')
-    return create_question(statement, correct_answer)
+    statement, correct_answer, alternatives = _question_body(body)
+    # O enunciado é codificado uma única vez, para a busca de duplicatas e para o índice
+    embedding = encode_statement(statement)
+    duplicates = find_duplicates(statement, embedding=embedding)
+    if duplicates is None:
+        response.headers['X-Duplicate-Check'] = 'skipped'
+    elif duplicates:
+        response.headers['X-Duplicate-Of'] = ','.join(duplicates)
+    return create_question(statement, correct_answer, alternatives, embedding)
+
+
+# Importação em lote: erros detalhados devolvidos no máximo (os demais só são contados)
+_BULK_MAX_ERRORS: int = 100
+# Exportação: linhas NDJSON agrupadas em cada pedaço enviado
+_EXPORT_CHUNK_LINES: int = 500
+
+
+def _parse_bulk_line(line: bytes) -> dict[str, Any]:
+    """
+    Valida uma linha da importação em lote. Um question_id já existente é rejeitado na
+    criação (ver create_questions).
+
+    Args:
+        line (bytes): Linha NDJSON (um objeto JSON).
+    Returns:
+        (dict[str, Any]): Questão com statement, correct_answer e, se informados,
+        alternative_answers e question_id.
+
+    ## Assertivas de saída:
+        - Levanta ValueError com a descrição do problema se a linha for inválida.
+    """
+
+    try:
+        item = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"JSON inválido: {e}")
+    if not isinstance(item, dict):
+        raise ValueError("A linha deve ser um objeto JSON.")
+
+    question: dict[str, Any] = {}
+    for field in ('statement', 'correct_answer'):
+        value = item.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"Campo {field} ausente ou vazio.")
+        question[field] = value
+
+    alternatives = item.get('alternative_answers')
+    if alternatives is not None:
+        if not _valid_alternatives(alternatives):
+            raise ValueError("Campo alternative_answers deve ser uma lista de textos não vazios.")
+        question['alternative_answers'] = alternatives
+
+    question_id = item.get('question_id')
+    if question_id is not None:
+        if not isinstance(question_id, str) or not question_id:
+            raise ValueError("Campo question_id inválido.")
+        question['question_id'] = question_id
+    return question
+
+
+@app.post('/questions/bulk')
+async def api_bulk_create_questions(request: Request) -> dict[str, object]:
+    """
+    Endpoint para importação em lote. O corpo é lido em streaming, no formato NDJSON
+    (um objeto JSON por linha, como o gerado por /questions/export), e as questões
+    válidas são criadas em blocos de config.BULK_CHUNK_SIZE, cada um com uma única
+    gravação no armazenamento e um único lote de embeddings.
+
+    Args:
+        request (Request): Requisição com o corpo NDJSON. Cada linha contém statement,
+            correct_answer e, opcionalmente, alternative_answers e question_id.
+
+    Returns:
+        (dict[str, object]): Objeto contendo os campos:
+            - created (int): quantidade de questões criadas.
+            - failed (int): quantidade de linhas rejeitadas.
+            - errors (list): as primeiras linhas rejeitadas, como objetos com line
+              (numeração a partir de 1) e error.
+
+    ## Assertivas de saída:
+        - Linhas inválidas não interrompem a importação das demais.
+        - Linhas em branco são ignoradas.
+    """
+
+    created = 0
+    failed = 0
+    errors: list[dict[str, object]] = []
+    batch: list[dict[str, Any]] = []
+    batch_lines: list[int] = []
+    line_number = 0
+    pending = bytearray()
+
+    def reject(line: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < _BULK_MAX_ERRORS:
+            errors.append({'line': line, 'error': error})
+
+    async def flush() -> None:
+        nonlocal created
+        ids = await run_in_threadpool(create_questions, batch.copy())
+        for item, line, question_id in zip(batch, batch_lines, ids):
+            if question_id is None:
+                reject(line, f"Questão {item['question_id']} já existe.")
+            else:
+                created += 1
+        batch.clear()
+        batch_lines.clear()
+
+    async def lines() -> AsyncIterator[bytes]:
+        # Só o pedaço recém-chegado é procurado e só as linhas completas são separadas,
+        # mantendo a leitura linear mesmo com linhas maiores que os pedaços do stream
+        async for chunk in request.stream():
+            searched = len(pending)
+            pending.extend(chunk)
+            end = pending.rfind(b'\n', searched)
+            if end < 0:
+                continue
+            complete = bytes(pending[:end])
+            del pending[:end + 1]
+            for line in complete.split(b'\n'):
+                yield line
+        yield bytes(pending)
+
+    async for line in lines():
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            batch.append(_parse_bulk_line(line))
+        except ValueError as e:
+            reject(line_number, str(e))
+            continue
+        batch_lines.append(line_number)
+        if len(batch) >= config.BULK_CHUNK_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    # Ids repetidos só são rejeitados na criação de cada bloco, depois das linhas seguintes do bloco
+    errors.sort(key=lambda error: error['line'])
+    return {'created': created, 'failed': failed, 'errors': errors}
+
+
+@app.get('/questions/export')
+def api_export_questions(fields: str | None = None) -> StreamingResponse:
+    """
+    Endpoint que exporta o banco de questões em NDJSON (um objeto JSON por linha), na
+    ordem de criação. As linhas são geradas enquanto a resposta é enviada, sem montar
+    o banco inteiro em memória. O resultado pode ser importado em /questions/bulk.
+
+    Args:
+        fields (str | None): Campos exportados, separados por vírgula. Se None, exporta
+            question_id, statement e correct_answer.
+
+    Returns:
+        (StreamingResponse): Corpo application/x-ndjson.
+
+    ## Assertivas de saída:
+        - Retorna erro HTTP 400 se algum campo for inválido.
+    """
+
+    field_list = None if fields is None else [f.strip() for f in fields.split(',') if f.strip()]
+    try:
+        rows = iter_questions(field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson() -> Iterator[bytes]:
+        chunk: list[str] = []
+        for row in rows:
+            chunk.append(json.dumps(row, ensure_ascii=False))
+            if len(chunk) == _EXPORT_CHUNK_LINES:
+                yield ('\n'.join(chunk) + '\n').encode('utf-8')
+                chunk.clear()
+        if chunk:
+            yield ('\n'.join(chunk) + '\n').encode('utf-8')
+
+    return StreamingResponse(ndjson(), media_type='application/x-ndjson',
+                             headers={'Content-Disposition': 'attachment; filename="questions.ndjson"'})
+
+
+def _queue_full() -> HTTPException:
+    """Erro retornado quando a fila de inferência está cheia."""
+    return HTTPException(
+        status_code=503,
+        detail="Fila de avaliação cheia. Tente novamente.",
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.get('/questions/search')
+async def api_search_questions(q: str = Query(..., min_length=1),
+                               k: int = Query(10, ge=1, le=100)) -> list[dict[str, str | float]]:
+    """
+    Endpoint de busca semântica: retorna as questões cujo enunciado ou gabarito é mais
+    parecido com o texto buscado. A codificação do texto roda no pool de inferência.
+
+    Args:
+        q (str): Texto buscado (ex.: um tema).
+        k (int): Quantidade máxima de questões retornadas (1 a 100).
+
+    Returns:
+        (list[dict[str, str | float]]): Lista de objetos contendo question_id, statement
+        e similarity, da mais para a menos similar.
+
+    ## Assertivas de saída:
+        - Retorna erro HTTP 503 se a fila de inferência estiver cheia.
+    """
+
+    try:
+        return await inference_executor.run(search_questions, q, k)
+    except InferenceQueueFull:
+        raise _queue_full()
+
+
+@app.get('/questions/stats')
+def api_bank_stats(k: int = Query(5, ge=1, le=100)) -> dict[str, object]:
+    """
+    Endpoint que resume as avaliações de todo o banco de questões.
+
+    Args:
+        k (int): Quantidade de questões listadas em hardest (1 a 100).
+
+    Returns:
+        (dict[str, object]): Objeto contendo attempts, scores, mean_score, similarity
+        e last_attempt_at de todas as avaliações, mais questions (questões no banco),
+        answered (questões já avaliadas) e hardest (questões com menor pontuação média).
+    """
+
+    return get_bank_stats(k)
+
+
+@app.get('/questions/{question_id}/stats')
+def api_question_stats(question_id: str) -> dict[str, object]:
+    """
+    Endpoint que retorna as estatísticas de avaliação de uma questão.
+
+    Args:
+        question_id (str): Identificador da questão.
+
+    Returns:
+        (dict[str, object]): Objeto contendo:
+            - attempts (int): respostas avaliadas.
+            - scores (dict[str, int]): respostas por pontuação ("0", "40", "70", "100").
+            - mean_score (float): pontuação média.
+            - similarity (dict): média (mean), desvio padrão (std) e histogram, com a
+              quantidade de respostas em cada faixa de 0,1 de similaridade.
+            - last_attempt_at (float | None): horário da última avaliação (timestamp Unix).
+
+    ## Assertivas de saída:
+        - Retorna erro HTTP 404 se a questão não existir.
+    """
+
+    stats = get_question_stats(question_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Questão não encontrada.")
+    return stats
+
+
+@app.get('/questions/{question_id}/similar')
+def api_similar_questions(question_id: str, k: int = Query(5, ge=1, le=100)) -> list[dict[str, str | float]]:
+    """
+    Endpoint que retorna as questões com enunciado mais parecido com o da questão informada.
+
+    Args:
+        question_id (str): Identificador da questão.
+        k (int): Quantidade máxima de questões retornadas (1 a 100).
+
+    Returns:
+        (list[dict[str, str | float]]): Lista de objetos contendo question_id, statement
+        e similarity (similaridade de cosseno entre os enunciados), da mais para a menos similar.
+
+    ## Assertivas de saída:
+        - Retorna erro HTTP 404 se a questão não existir.
+    """
+
+    similar = get_similar_questions(question_id, k)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Questão não encontrada.")
+    return similar
 
 
 @app.put('/questions/{question_id}')
-def api_update_question(question_id: str, body: dict[str, str]) -> int:
+def api_update_question(question_id: str, body: dict[str, str | list[str]]) -> int:
     """
     Endpoint para atualizar uma questão existente.
 
     Args:
         question_id (str): Identificador da questão.
-        body (dict[str, str]): Dicionário contendo:
+        body (dict[str, str | list[str]]): Dicionário contendo:
             - statement (str): novo enunciado.
             - correct_answer (str): novo gabarito.
+            - alternative_answers (list[str], opcional): novas respostas alternativas. Se
+              ausente, as atuais são mantidas.
 
     Returns:
         (int): Código indicando sucesso (1) ou falha (0).
@@ -108,15 +566,34 @@ def api_update_question(question_id: str, body: dict[str, str]) -> int:
         - Retorna 0 se a questão não existir.
     """
 
-    statement = body.get('statement', '')
-    correct_answer = body.get('correct_answer', '')
-    return update_question(question_id, statement, correct_answer)
+    statement, correct_answer, alternatives = _question_body(body)
+    return update_question(question_id, statement, correct_answer, alternatives)
+
+
+async def _evaluate(question_id: str, answer: str) -> int:
+    """
+    Avalia uma resposta pelo pool de inferência. Com micro-batching, só a preparação
+    (cascata, cache e embeddings das referências) ocupa uma thread: a espera pelo lote é
+    feita no event loop, então um lote pode reunir mais avaliações que INFERENCE_THREADS.
+    """
+
+    if config.BATCH_WINDOW_MS <= 0:
+        return await inference_executor.run(evaluate, question_id, answer)
+
+    prepared = await inference_executor.run(prepare_evaluation, question_id, answer)
+    if isinstance(prepared, int):
+        return prepared
+    _, references, generation = prepared
+    with STAGE_SECONDS.time('similarity'):
+        similarity = await inference_executor.wait(lambda: batcher.submit(answer, references))
+    return finish_evaluation(question_id, answer, similarity, generation)
 
 
 @app.post('/questions/evaluate/{question_id}')
-def api_evaluate(question_id: str, body: dict[str, str]) -> dict[str, int]:
+async def api_evaluate(question_id: str, body: dict[str, str]) -> dict[str, int]:
     """
-    Endpoint para avaliar a resposta de uma questão.
+    Endpoint para avaliar a resposta de uma questão. A inferência roda no pool
+    dedicado do módulo inference, mantendo o event loop livre para as demais rotas.
 
     Args:
         question_id (str): Identificador da questão.
@@ -132,13 +609,152 @@ def api_evaluate(question_id: str, body: dict[str, str]) -> dict[str, int]:
         - answer deve ser uma string não vazia.
     ## Assertivas de saída:
         - score pode ser 0, 40, 70, 100 ou -1 caso a questão não exista.
+        - Retorna erro HTTP 503 se a fila de inferência estiver cheia.
     """
 
     answer = body.get('answer', '')
-    score = evaluate(question_id, answer)
+    try:
+        score = await _evaluate(question_id, answer)
+    except InferenceQueueFull:
+        raise _queue_full()
     return {'score': score}
 
 
+@app.post('/questions/evaluate')
+async def api_evaluate_batch(body: list[dict[str, str]]) -> list[dict[str, str | int]]:
+    """
+    Endpoint para avaliar várias respostas de uma só vez (ex.: uma turma inteira).
+
+    Args:
+        body (list[dict[str, str]]): Lista de objetos contendo:
+            - question_id (str): identificador da questão.
+            - answer (str): resposta do usuário.
+
+    Returns:
+        (list[dict[str, str | int]]): Lista, na mesma ordem do body, de objetos contendo:
+            - question_id (str): identificador da questão.
+            - score (int): pontuação obtida.
+
+    ## Assertivas de entrada:
+        - Cada question_id deve ser uma string correspondente a um UUID.
+    ## Assertivas de saída:
+        - Cada score pode ser 0, 40, 70, 100 ou -1 caso a questão não exista.
+        - Retorna erro HTTP 503 se a fila de inferência estiver cheia.
+    """
+
+    items = [(item.get('question_id', ''), item.get('answer', '')) for item in body]
+    try:
+        scores = await inference_executor.run(evaluate_batch, items)
+    except InferenceQueueFull:
+        raise _queue_full()
+    return [
+        {'question_id': question_id, 'score': score}
+        for (question_id, _), score in zip(items, scores)
+    ]
+
+
+@app.get('/healthz')
+def api_healthz() -> dict[str, str]:
+    """
+    Endpoint de liveness: responde enquanto o processo estiver de pé, mesmo durante o aquecimento.
+
+    Returns:
+        (dict[str, str]): Objeto contendo status ('ok').
+    """
+
+    return {'status': 'ok'}
+
+
+@app.get('/readyz')
+def api_readyz(response: Response) -> dict[str, object]:
+    """
+    Endpoint de readiness: indica se o modelo e os embeddings já foram aquecidos.
+
+    Returns:
+        (dict[str, object]): Objeto contendo ready, state, error e durations (segundos
+        de cada etapa do aquecimento).
+
+    ## Assertivas de saída:
+        - Retorna 200 quando a aplicação está pronta e 503 caso contrário.
+    """
+
+    status = warmup.status()
+    if not status['ready']:
+        response.status_code = 503
+    return status
+
+
+@app.get('/metrics')
+def api_metrics() -> Response:
+    """
+    Endpoint de métricas no formato de texto do Prometheus: requisições e latência por
+    rota, duração de cada etapa da avaliação, cache de similaridades, fila de inferência,
+    tempo de carga do modelo e tamanho do banco de questões.
+
+    Returns:
+        (Response): Texto no formato de exposição do Prometheus (versão 0.0.4).
+
+    ## Assertivas de saída:
+        - As etapas medidas nos processos de inferência (FLAVIFY_INFERENCE_PROCESSES) não
+          aparecem aqui; a etapa similarity inclui o tempo gasto nesses processos.
+    """
+
+    return Response(content=render_metrics(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.get('/metrics/batching')
+def api_batching_stats() -> dict[str, float | dict[int, int]]:
+    """
+    Endpoint que retorna as métricas do agrupamento de avaliações concorrentes.
+
+    Returns:
+        (dict[str, float | dict[int, int]]): Objeto contendo batches, items,
+        mean_batch_size, max_batch_size e histogram (lotes por tamanho).
+
+    ## Assertivas de saída:
+        - Os valores são zero enquanto nenhum lote tiver sido processado.
+    """
+
+    return batcher.stats()
+
+
+@app.get('/metrics/cache')
+def api_cache_stats() -> dict[str, int | float]:
+    """
+    Endpoint que retorna os contadores do cache de similaridades.
+
+    Returns:
+        (dict[str, int | float]): Objeto contendo size, max_size, hits, misses e hit_rate.
+    """
+
+    return similarity_cache.stats()
+
+
+@app.get('/metrics/cascade')
+def api_cascade_stats() -> dict[str, int | float]:
+    """
+    Endpoint que retorna os contadores da cascata lexical, executada antes do codificador.
+
+    Returns:
+        (dict[str, int | float]): Objeto contendo exact, near_copy e blank (respostas
+        decididas sem o modelo), encoder (respostas enviadas ao modelo) e hit_rate.
+    """
+
+    return cascade.stats()
+
+
+@app.get('/metrics/inference')
+def api_inference_stats() -> dict[str, int]:
+    """
+    Endpoint que retorna o estado da fila de inferência.
+
+    Returns:
+        (dict[str, int]): Objeto contendo pending, rejected, max_pending e max_workers.
+    """
+
+    return inference_executor.stats()
+
+
 @app.delete('/questions/{question_id}')
 def api_delete_question(question_id: str) -> int:
     """
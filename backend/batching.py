@@ -0,0 +1,170 @@
+# batching.py
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Thread, Lock
+from time import monotonic
+import numpy as np
+from numpy import ndarray
+
+import config
+from worker_pool import batch_similarity
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["MicroBatcher", "batcher"]
+
+# Item da fila: (resposta, embeddings das referências, futuro do chamador)
+_Item = tuple[str, ndarray, Future[float]]
+
+
+class MicroBatcher:
+    """
+    Fila que agrupa avaliações concorrentes em lotes, processados por uma thread dedicada.
+
+    Cada lote é fechado quando atinge max_batch_size itens ou quando a janela de
+    window_ms milissegundos, contada a partir do primeiro item, se esgota.
+    """
+
+    def __init__(self, window_ms: float, max_batch_size: int,
+                 similarity_fn: Callable[[list[str], ndarray, list[int] | None], list[float]]):
+        """
+        Args:
+            window_ms (float): Tempo máximo de espera por novos itens, em milissegundos.
+            max_batch_size (int): Quantidade máxima de itens por lote.
+            similarity_fn (Callable): Função que avalia um lote (frases, matriz de referências,
+                referências de cada frase), como worker_pool.batch_similarity.
+
+        ## Assertivas de entrada:
+            - window_ms deve ser maior ou igual a 0 e max_batch_size maior que 0.
+        """
+
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+        self._similarity_fn = similarity_fn
+        self._queue: Queue[_Item | None] = Queue()
+        self._thread: Thread | None = None
+        self._lock = Lock()
+
+        self._batches = 0
+        self._items = 0
+        self._max_seen = 0
+        self._histogram: dict[int, int] = {}
+
+    def submit(self, answer: str, reference: ndarray) -> Future[float]:
+        """
+        Enfileira uma avaliação e retorna o futuro que receberá a similaridade.
+
+        Args:
+            answer (str): Resposta do usuário.
+            reference (ndarray): Embedding do gabarito da questão, ou matriz com um embedding
+                por resposta de referência.
+        Returns:
+            (Future[float]): Futuro resolvido com a similaridade quando o lote for processado.
+        """
+
+        self._start()
+        future: Future[float] = Future()
+        self._queue.put((answer, reference, future))
+        return future
+
+    def stats(self) -> dict[str, float | dict[int, int]]:
+        """
+        Retorna as métricas dos lotes processados até o momento.
+
+        Returns:
+            (dict): Objeto contendo:
+                - batches (int): quantidade de lotes processados.
+                - items (int): quantidade de avaliações processadas.
+                - mean_batch_size (float): tamanho médio dos lotes.
+                - max_batch_size (int): maior lote processado.
+                - histogram (dict[int, int]): quantidade de lotes por tamanho.
+        """
+
+        with self._lock:
+            return {
+                'batches': self._batches,
+                'items': self._items,
+                'mean_batch_size': self._items / self._batches if self._batches else 0.0,
+                'max_batch_size': self._max_seen,
+                'histogram': dict(sorted(self._histogram.items())),
+            }
+
+    def stop(self) -> None:
+        """Encerra a thread de processamento após esvaziar a fila."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _start(self) -> None:
+        """Inicia a thread de processamento na primeira submissão."""
+
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Laço da thread: monta lotes a partir da fila e os processa."""
+
+        running = True
+        while running:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch: list[_Item] = [first]
+            deadline = monotonic() + self.window_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+
+            self._process(batch)
+
+    def _process(self, batch: list[_Item]) -> None:
+        """Avalia um lote e resolve o futuro de cada chamador."""
+
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        references = [np.atleast_2d(reference) for _, reference, _ in batch]
+        counts = [len(reference) for reference in references]
+        try:
+            similarities = self._similarity_fn(
+                [answer for answer, _, _ in batch],
+                np.concatenate(references),
+                None if len(counts) == sum(counts) else counts,
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            size = len(batch)
+            self._batches += 1
+            self._items += size
+            self._max_seen = max(self._max_seen, size)
+            self._histogram[size] = self._histogram.get(size, 0) + 1
+
+        for (_, _, future), similarity in zip(batch, similarities):
+            future.set_result(similarity)
+
+
+batcher: MicroBatcher = MicroBatcher(config.BATCH_WINDOW_MS, config.BATCH_MAX_SIZE, batch_similarity)
+"""Instância compartilhada pelo processo, configurada por config.BATCH_WINDOW_MS e config.BATCH_MAX_SIZE."""
@@ -0,0 +1,118 @@
+# config.py
+
+import os
+
+# Configurações da aplicação, lidas de variáveis de ambiente com valores padrão
+
+MODEL_NAME: str = os.environ.get('FLAVIFY_MODEL_NAME', 'paraphrase-multilingual-MiniLM-L12-v2')
+"""Nome do modelo SentenceTransformer utilizado na avaliação das respostas."""
+
+MODEL_DEVICE: str | None = os.environ.get('FLAVIFY_MODEL_DEVICE') or None
+"""Dispositivo do modelo (ex.: 'cpu', 'cuda'). Se None, a biblioteca escolhe automaticamente."""
+
+BATCH_WINDOW_MS: float = float(os.environ.get('FLAVIFY_BATCH_WINDOW_MS', '0'))
+"""Janela (ms) para agrupar avaliações concorrentes em um lote. Se 0, o agrupamento fica desativado."""
+
+BATCH_MAX_SIZE: int = int(os.environ.get('FLAVIFY_BATCH_MAX_SIZE', '32'))
+"""Tamanho máximo de um lote de avaliações concorrentes."""
+
+INFERENCE_THREADS: int = int(os.environ.get('FLAVIFY_INFERENCE_THREADS', '4'))
+"""Quantidade de threads dedicadas à avaliação de respostas nas rotas assíncronas."""
+
+INFERENCE_MAX_PENDING: int = int(os.environ.get('FLAVIFY_INFERENCE_MAX_PENDING', '64'))
+"""Limite de avaliações em execução ou na fila. Acima dele, a API responde 503."""
+
+INFERENCE_PROCESSES: int = int(os.environ.get('FLAVIFY_INFERENCE_PROCESSES', '0'))
+"""Quantidade de processos de inferência. Se 0, a inferência roda no próprio processo da API."""
+
+WORKER_TORCH_THREADS: int = int(os.environ.get('FLAVIFY_WORKER_TORCH_THREADS', '1'))
+"""Threads do PyTorch em cada processo de inferência (evita disputa de núcleos entre processos)."""
+
+ENCODER_BACKEND: str = os.environ.get('FLAVIFY_ENCODER_BACKEND', 'torch')
+"""Backend do codificador: 'torch', 'onnx' (ONNX Runtime) ou 'onnx-int8' (ONNX quantizado em int8)."""
+
+ONNX_QUANTIZATION: str = os.environ.get('FLAVIFY_ONNX_QUANTIZATION', 'avx2')
+"""Configuração da quantização dinâmica int8: 'arm64', 'avx2', 'avx512' ou 'avx512_vnni'."""
+
+ONNX_EXPORT_DIR: str = os.environ.get('FLAVIFY_ONNX_EXPORT_DIR', 'data/onnx')
+"""Pasta onde os modelos ONNX quantizados são exportados."""
+
+SIMILARITY_CACHE_SIZE: int = int(os.environ.get('FLAVIFY_SIMILARITY_CACHE_SIZE', '10000'))
+"""Quantidade máxima de similaridades (resposta, questão) memorizadas. Se 0, o cache fica desativado."""
+
+STORAGE: str = os.environ.get('FLAVIFY_STORAGE', 'json')
+"""Armazenamento do banco de questões: 'json' (data/questions.json) ou 'sqlite'."""
+
+SQLITE_PATH: str = os.environ.get('FLAVIFY_SQLITE_PATH', 'data/questions.db')
+"""Arquivo do banco SQLite, usado quando STORAGE é 'sqlite'."""
+
+LOG_COMPACT_THRESHOLD: int = int(os.environ.get('FLAVIFY_LOG_COMPACT_THRESHOLD', '1000'))
+"""Linhas do log de alterações (armazenamento JSON) que disparam a compactação em questions.json."""
+
+VECTOR_INDEX: str = os.environ.get('FLAVIFY_VECTOR_INDEX', 'exact')
+"""Índice dos embeddings dos enunciados: 'exact' (matriz NumPy) ou 'hnsw' (aproximado, requer hnswlib)."""
+
+DUPLICATE_THRESHOLD: float = float(os.environ.get('FLAVIFY_DUPLICATE_THRESHOLD', '0.9'))
+"""Similaridade de enunciado a partir da qual uma nova questão é sinalizada como possível duplicata."""
+
+WARMUP: bool = os.environ.get('FLAVIFY_WARMUP', '1') == '1'
+"""
+Se True, a aplicação aquece o modelo e os embeddings em segundo plano após iniciar e só fica pronta
+(/readyz) ao terminar. Se False, o modelo só é carregado no primeiro uso (réplicas que servem apenas o CRUD).
+"""
+
+WARMUP_ROUNDS: int = int(os.environ.get('FLAVIFY_WARMUP_ROUNDS', '3'))
+"""Rodadas de codificações de teste executadas no aquecimento."""
+
+BULK_CHUNK_SIZE: int = int(os.environ.get('FLAVIFY_BULK_CHUNK_SIZE', '500'))
+"""Questões criadas por bloco na importação em lote (uma gravação e um lote de embeddings por bloco)."""
+
+LONG_ANSWER_MODE: str = os.environ.get('FLAVIFY_LONG_ANSWER_MODE', 'off')
+"""
+Avaliação de respostas longas, divididas em trechos que cabem no limite de tokens do modelo:
+'off' (a resposta é truncada pelo modelo), 'max' (melhor trecho), 'mean' (média dos trechos)
+ou 'coverage' (centroide dos trechos).
+"""
+
+LONG_ANSWER_CHUNK_WORDS: int = int(os.environ.get('FLAVIFY_LONG_ANSWER_CHUNK_WORDS', '64'))
+"""Palavras por trecho; respostas com até esse tamanho são avaliadas inteiras."""
+
+LONG_ANSWER_MAX_CHUNKS: int = int(os.environ.get('FLAVIFY_LONG_ANSWER_MAX_CHUNKS', '16'))
+"""Trechos avaliados por resposta; o restante é descartado, limitando a latência."""
+
+SUBMISSIONS_STORAGE: str = os.environ.get('FLAVIFY_SUBMISSIONS_STORAGE', 'json')
+"""Histórico das respostas avaliadas: 'json' (NDJSON), 'sqlite' ou 'off' (desativado)."""
+
+SUBMISSIONS_PATH: str = os.environ.get('FLAVIFY_SUBMISSIONS_PATH', '')
+"""Arquivo do histórico. Se vazio, data/submissions.log ('json') ou data/submissions.db ('sqlite')."""
+
+SUBMISSIONS_FLUSH_MS: float = float(os.environ.get('FLAVIFY_SUBMISSIONS_FLUSH_MS', '200'))
+"""Tempo máximo (ms) que uma submissão espera para ser gravada junto com as seguintes (group commit)."""
+
+SUBMISSIONS_MAX_BATCH: int = int(os.environ.get('FLAVIFY_SUBMISSIONS_MAX_BATCH', '1000'))
+"""Quantidade máxima de submissões gravadas por sincronização em disco."""
+
+STATS_PATH: str = os.environ.get('FLAVIFY_STATS_PATH', 'data/stats.json')
+"""
+Arquivo dos agregados de avaliação por questão, recarregados ao iniciar a aplicação. Cada
+processo grava as suas avaliações ao lado dele (ex.: data/stats.<pid>.json), e os arquivos de
+processos encerrados são incorporados a ele no carregamento.
+"""
+
+STATS_SAVE_SECONDS: float = float(os.environ.get('FLAVIFY_STATS_SAVE_SECONDS', '60'))
+"""Intervalo entre as gravações dos agregados de avaliação. Se 0, eles só são gravados no encerramento."""
+
+CASCADE: bool = os.environ.get('FLAVIFY_CASCADE', '1') == '1'
+"""
+Se True, cópias do gabarito, quase cópias e respostas sem conteúdo são avaliadas por
+comparação lexical, sem chamar o modelo. Contadores em GET /metrics/cascade.
+"""
+
+CASCADE_NEAR_COPY: float = float(os.environ.get('FLAVIFY_CASCADE_NEAR_COPY', '0.9'))
+"""
+Similaridade lexical (1 menos a distância de edição entre as sequências de palavras, dividida
+pelo tamanho da maior) a partir da qual a resposta é tratada como cópia do gabarito.
+"""
+
+CASCADE_MIN_CHARS: int = int(os.environ.get('FLAVIFY_CASCADE_MIN_CHARS', '2'))
+"""Letras ou números abaixo dos quais a resposta recebe 0 sem chamar o modelo."""
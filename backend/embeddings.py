@@ -0,0 +1,353 @@
+# embeddings.py
+
+import os
+import zipfile
+from hashlib import sha1
+from threading import Lock
+import numpy as np
+from numpy import ndarray
+
+from natural_language import model_version
+from worker_pool import encode
+from vector_index import VectorIndex, HnswIndex, create_index
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["get_reference_embeddings", "precompute", "invalidate", "prune", "encode_statement", "index_statements",
+           "similar_statements", "search_statements", "search_questions", "save_embeddings", "load_embeddings"]
+
+_embeddings: dict[tuple[str, str], tuple[str, ndarray]] = {}
+"""
+Cache dos embeddings das respostas de referência (gabarito e alternativas), identificados
+por (question_id, versão do modelo), conforme natural_language.model_version.
+Cada entrada guarda o hash dos textos codificados e uma matriz com um embedding por
+referência, na ordem dos textos.
+"""
+_embeddings_lock: Lock = Lock()
+
+_statement_index: VectorIndex | HnswIndex = create_index()
+"""Índice dos embeddings dos enunciados, usado na detecção de duplicatas e na busca semântica."""
+_answer_index: VectorIndex | HnswIndex = create_index()
+"""Índice dos embeddings dos gabaritos (primeira referência) do modelo configurado, usado na busca semântica."""
+_statement_digests: dict[str, str] = {}
+"""Hash do enunciado indexado de cada questão, para não codificar novamente um texto inalterado."""
+
+
+def _digest(text: str) -> str:
+    """Hash do texto usado para detectar embeddings desatualizados."""
+    return sha1(text.encode('utf-8')).hexdigest()
+
+
+def _digest_all(texts: list[str]) -> str:
+    """Hash de uma lista de referências (igual a _digest(texto) para uma única referência)."""
+    return _digest('\x1f'.join(texts))
+
+
+def _embeddings_path(model_name: str) -> str:
+    """Caminho do arquivo de embeddings de um modelo, ao lado de questions.json."""
+    return f"data/embeddings.{model_name.replace('/', '--')}.npz"
+
+
+def _statements_path(model_name: str) -> str:
+    """Caminho do arquivo de embeddings dos enunciados de um modelo."""
+    return f"data/statements.{model_name.replace('/', '--')}.npz"
+
+
+def _write_npz(path: str, **arrays: ndarray) -> None:
+    """Grava um arquivo .npz de forma atômica (arquivo temporário + rename), como o snapshot das questões."""
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_npz(path: str) -> dict[str, ndarray] | None:
+    """
+    Lê todos os arrays de um arquivo .npz. Retorna None se o arquivo não existir ou não
+    puder ser lido (ex.: gravação interrompida por uma versão antiga), como se não houvesse cache.
+    """
+
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile) as e:
+        print(f"⚠️ Cache de embeddings ilegível ignorado ({path}): {e}")
+        return None
+
+
+def precompute(items: list[tuple[str, list[str]]]) -> None:
+    """
+    Calcula e armazena os embeddings das respostas de referência que ainda não estão em
+    cache, codificando todas em uma única passada do modelo, e adiciona o gabarito de
+    cada questão ao índice de gabaritos.
+
+    Args:
+        items (list[tuple[str, list[str]]]): Pares (question_id, referências), em que as
+            referências são o gabarito seguido das respostas alternativas.
+
+    ## Assertivas de entrada:
+        - Cada lista de referências deve ter ao menos um texto.
+    ## Assertivas de saída:
+        - Todo question_id informado terá uma matriz de embeddings atualizada para o modelo configurado.
+        - Referências cujo embedding já está em cache não são codificadas novamente.
+    """
+
+    model_name = model_version()
+    missing: list[tuple[str, list[str]]] = []
+    for question_id, texts in items:
+        entry = _embeddings.get((question_id, model_name))
+        if entry is None or entry[0] != _digest_all(texts):
+            missing.append((question_id, texts))
+
+    if not missing:
+        return
+
+    matrix = encode([text for _, texts in missing for text in texts])
+    with _embeddings_lock:
+        start = 0
+        for question_id, texts in missing:
+            _embeddings[(question_id, model_name)] = (_digest_all(texts), matrix[start:start + len(texts)])
+            start += len(texts)
+        _answer_index.upsert_many([qid for qid, _ in missing],
+                                  np.stack([_embeddings[(qid, model_name)][1][0] for qid, _ in missing]))
+
+
+def get_reference_embeddings(question_id: str, texts: list[str]) -> ndarray:
+    """
+    Retorna os embeddings das respostas de referência de uma questão, calculando-os se necessário.
+
+    Args:
+        question_id (str): Identificador da questão.
+        texts (list[str]): Referências atuais da questão (gabarito e alternativas).
+    Returns:
+        (ndarray): Matriz com um embedding por referência, na ordem de texts.
+
+    ## Assertivas de saída:
+        - Os embeddings retornados correspondem aos textos informados (nunca a referências antigas).
+    """
+
+    key = (question_id, model_version())
+    entry = _embeddings.get(key)
+    if entry is None or entry[0] != _digest_all(texts):
+        precompute([(question_id, texts)])
+        entry = _embeddings[key]
+    return entry[1]
+
+
+def invalidate(question_id: str) -> None:
+    """
+    Remove do cache os embeddings de uma questão, para todos os modelos, e retira a
+    questão dos índices de enunciados e gabaritos.
+
+    Args:
+        question_id (str): Identificador da questão.
+    """
+
+    with _embeddings_lock:
+        for key in [key for key in _embeddings if key[0] == question_id]:
+            del _embeddings[key]
+        _statement_digests.pop(question_id, None)
+    _statement_index.remove(question_id)
+    _answer_index.remove(question_id)
+
+
+def prune(question_ids: set[str]) -> None:
+    """
+    Descarta os embeddings de questões que não existem mais (ex.: carregados de um
+    arquivo salvo antes de a questão ser removida).
+
+    Args:
+        question_ids (set[str]): Identificadores das questões existentes.
+    """
+
+    with _embeddings_lock:
+        stale = {key[0] for key in _embeddings if key[0] not in question_ids}
+        stale.update(qid for qid in _statement_digests if qid not in question_ids)
+    for question_id in stale:
+        invalidate(question_id)
+
+
+def encode_statement(text: str) -> ndarray:
+    """
+    Codifica um enunciado, para reaproveitar o embedding em search_statements e
+    index_statements (ex.: verificação de duplicatas seguida da criação da questão).
+
+    Args:
+        text (str): Enunciado.
+    Returns:
+        (ndarray): Embedding do enunciado.
+    """
+
+    return encode([text])[0]
+
+
+def index_statements(items: list[tuple[str, str]], matrix: ndarray | None = None) -> None:
+    """
+    Adiciona ou atualiza enunciados no índice de enunciados, codificando em uma única
+    passada do modelo apenas os que mudaram.
+
+    Args:
+        items (list[tuple[str, str]]): Pares (question_id, enunciado).
+        matrix (ndarray | None): Embeddings já calculados dos enunciados, uma linha por
+            item. Se None, os enunciados são codificados aqui.
+
+    ## Assertivas de saída:
+        - Todo question_id informado terá no índice o embedding do enunciado informado.
+    """
+
+    changed = [i for i, (qid, text) in enumerate(items) if _statement_digests.get(qid) != _digest(text)]
+    if not changed:
+        return
+
+    missing = [items[i] for i in changed]
+    matrix = encode([text for _, text in missing]) if matrix is None else np.atleast_2d(matrix)[changed]
+    with _embeddings_lock:
+        _statement_index.upsert_many([qid for qid, _ in missing], matrix)
+        for question_id, text in missing:
+            _statement_digests[question_id] = _digest(text)
+
+
+def similar_statements(question_id: str, k: int) -> list[tuple[str, float]]:
+    """
+    Retorna as questões cujo enunciado é mais similar ao da questão informada.
+
+    Args:
+        question_id (str): Identificador de uma questão já indexada.
+        k (int): Quantidade máxima de questões retornadas.
+    Returns:
+        (list[tuple[str, float]]): Pares (question_id, similaridade) em ordem decrescente,
+        sem a própria questão. Lista vazia se a questão não estiver indexada.
+    """
+
+    vector = _statement_index.get(question_id)
+    if vector is None:
+        return []
+    return _statement_index.search(vector, k, exclude=question_id)
+
+
+def search_statements(text: str, k: int, embedding: ndarray | None = None) -> list[tuple[str, float]]:
+    """
+    Retorna as questões cujo enunciado é mais similar ao texto informado.
+
+    Args:
+        text (str): Texto consultado (ex.: enunciado de uma questão nova).
+        k (int): Quantidade máxima de questões retornadas.
+        embedding (ndarray | None): Embedding já calculado do texto (ver encode_statement).
+    Returns:
+        (list[tuple[str, float]]): Pares (question_id, similaridade) em ordem decrescente.
+    """
+
+    if len(_statement_index) == 0:
+        return []
+    return _statement_index.search(encode([text])[0] if embedding is None else embedding, k)
+
+
+def search_questions(text: str, k: int) -> list[tuple[str, float]]:
+    """
+    Busca semântica: retorna as questões cujo enunciado ou gabarito é mais similar ao
+    texto informado, codificando o texto uma única vez.
+
+    Args:
+        text (str): Texto consultado (ex.: um tema).
+        k (int): Quantidade máxima de questões retornadas.
+    Returns:
+        (list[tuple[str, float]]): Pares (question_id, similaridade) em ordem decrescente,
+        com a maior similaridade entre enunciado e gabarito de cada questão.
+    """
+
+    if len(_statement_index) == 0 and len(_answer_index) == 0:
+        return []
+
+    query = encode([text])[0]
+    best: dict[str, float] = {}
+    for index in (_statement_index, _answer_index):
+        for question_id, similarity in index.search(query, k):
+            if similarity > best.get(question_id, -1.0):
+                best[question_id] = similarity
+    return sorted(best.items(), key=lambda entry: entry[1], reverse=True)[:k]
+
+
+def save_embeddings() -> None:
+    """
+    Salva os embeddings em cache em um arquivo .npz por modelo, na pasta data, junto
+    com o índice de enunciados do modelo configurado.
+
+    ## Assertivas de saída:
+        - Os embeddings de cada modelo serão salvos em data/embeddings.<modelo>.npz.
+        - Os embeddings dos enunciados serão salvos em data/statements.<modelo>.npz.
+        - Cada arquivo é substituído de forma atômica: uma interrupção mantém o arquivo anterior.
+    """
+
+    with _embeddings_lock:
+        by_model: dict[str, list[tuple[str, str, ndarray]]] = {}
+        for (question_id, model_name), (digest, matrix) in _embeddings.items():
+            by_model.setdefault(model_name, []).append((question_id, digest, matrix))
+
+    # As matrizes de todas as questões são concatenadas; counts guarda as linhas de cada uma
+    for model_name, entries in by_model.items():
+        _write_npz(
+            _embeddings_path(model_name),
+            ids=np.array([e[0] for e in entries]),
+            digests=np.array([e[1] for e in entries]),
+            counts=np.array([len(e[2]) for e in entries]),
+            matrix=np.concatenate([e[2] for e in entries]),
+        )
+
+    with _embeddings_lock:
+        ids, matrix = _statement_index.export()
+        digests = [_statement_digests[qid] for qid in ids]
+    if ids:
+        _write_npz(_statements_path(model_version()), ids=np.array(ids), digests=np.array(digests), matrix=matrix)
+    print("✅ Embeddings dos gabaritos salvos")
+
+
+def load_embeddings() -> None:
+    """
+    Carrega os embeddings salvos do modelo configurado, se os arquivos existirem, e
+    preenche os índices de gabaritos e de enunciados sem chamar o modelo.
+
+    ## Assertivas de saída:
+        - O cache será preenchido com os embeddings salvos do modelo configurado.
+        - Embeddings desatualizados são descartados na próxima consulta (pelo hash do texto).
+        - Um arquivo ilegível ou inconsistente é ignorado com um aviso, como se não existisse.
+    """
+
+    model_name = model_version()
+    data = _read_npz(_embeddings_path(model_name))
+    if data is not None:
+        try:
+            ids = [str(question_id) for question_id in data['ids']]
+            matrix = data['matrix']
+            # Arquivos salvos antes das respostas alternativas têm uma linha por questão
+            counts = data['counts'] if 'counts' in data else np.ones(len(ids), dtype=np.int64)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+            entries = {(question_id, model_name): (str(digest), matrix[start:start + count])
+                       for question_id, digest, start, count in zip(ids, data['digests'], starts, counts)}
+            answers = matrix[starts]
+        except (KeyError, ValueError, IndexError) as e:
+            print(f"⚠️ Cache de embeddings dos gabaritos inconsistente ignorado: {e}")
+        else:
+            with _embeddings_lock:
+                _embeddings.update(entries)
+                _answer_index.upsert_many(ids, answers)
+            print("✅ Embeddings dos gabaritos carregados")
+
+    data = _read_npz(_statements_path(model_name))
+    if data is not None:
+        try:
+            ids = [str(question_id) for question_id in data['ids']]
+            digests = [str(digest) for digest in data['digests']]
+            statements = np.atleast_2d(data['matrix'])
+            if not len(ids) == len(digests) == len(statements):
+                raise ValueError(f"{len(ids)} ids, {len(digests)} hashes e {len(statements)} embeddings")
+        except (KeyError, ValueError) as e:
+            print(f"⚠️ Cache de embeddings dos enunciados inconsistente ignorado: {e}")
+        else:
+            with _embeddings_lock:
+                _statement_index.upsert_many(ids, statements)
+                _statement_digests.update(zip(ids, digests))
+            print("✅ Embeddings dos enunciados carregados")
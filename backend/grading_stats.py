@@ -0,0 +1,428 @@
+# grading_stats.py
+
+import json
+import math
+import os
+import re
+import time
+from contextlib import contextmanager
+from threading import Event, Lock, Thread
+from typing import Iterator
+
+import config
+
+try:
+    import fcntl
+except ImportError: # Windows: sem trava entre processos
+    fcntl = None
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["QuestionStats", "GradingStats", "grading_stats", "SCORES", "HISTOGRAM_BINS"]
+
+# Pontuações possíveis de uma avaliação (ver question.similarity_to_score)
+SCORES: tuple[int, ...] = (0, 40, 70, 100)
+
+# Faixas de 0,1 de similaridade no histograma, de [0, 0.1) a [0.9, 1.0]
+HISTOGRAM_BINS: int = 10
+
+
+class QuestionStats:
+    """
+    Agregados de avaliação de uma questão, atualizados em O(1) a cada resposta:
+    contagem por pontuação, média e variância da similaridade (algoritmo de Welford)
+    e histograma da similaridade.
+    """
+
+    def __init__(self):
+        self.attempts = 0
+        self.scores: dict[int, int] = {score: 0 for score in SCORES}
+        self.score_sum = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.histogram: list[int] = [0] * HISTOGRAM_BINS
+        self.last_attempt_at: float | None = None
+
+    def add(self, similarity: float, score: int, timestamp: float) -> None:
+        """
+        Incorpora uma avaliação aos agregados.
+
+        Args:
+            similarity (float): Similaridade obtida.
+            score (int): Pontuação obtida (0, 40, 70 ou 100).
+            timestamp (float): Horário da avaliação (timestamp Unix).
+        """
+
+        self.attempts += 1
+        self.scores[score] = self.scores.get(score, 0) + 1
+        self.score_sum += score
+        delta = similarity - self.mean
+        self.mean += delta / self.attempts
+        self.m2 += delta * (similarity - self.mean)
+        self.histogram[_bin(similarity)] += 1
+        self.last_attempt_at = timestamp
+
+    def merge(self, other: 'QuestionStats') -> None:
+        """Incorpora os agregados de outra questão (fórmula de Chan para a variância)."""
+
+        if other.attempts == 0:
+            return
+        total = self.attempts + other.attempts
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.attempts * other.attempts / total
+        self.mean += delta * other.attempts / total
+        self.attempts = total
+        for score, count in other.scores.items():
+            self.scores[score] = self.scores.get(score, 0) + count
+        self.score_sum += other.score_sum
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        if other.last_attempt_at is not None:
+            self.last_attempt_at = max(self.last_attempt_at or 0.0, other.last_attempt_at)
+
+    def to_dict(self) -> dict[str, object]:
+        """
+        Resume os agregados.
+
+        Returns:
+            (dict[str, object]): Objeto contendo attempts, scores (contagem por pontuação),
+            mean_score, similarity (mean, std e histogram com as contagens de cada faixa
+            de 0,1) e last_attempt_at.
+        """
+
+        return {
+            'attempts': self.attempts,
+            'scores': {str(score): count for score, count in sorted(self.scores.items())},
+            'mean_score': self.score_sum / self.attempts if self.attempts else 0.0,
+            'similarity': {
+                'mean': self.mean,
+                'std': math.sqrt(self.m2 / self.attempts) if self.attempts else 0.0,
+                'histogram': list(self.histogram),
+            },
+            'last_attempt_at': self.last_attempt_at,
+        }
+
+    def to_state(self) -> dict[str, object]:
+        """Estado completo, para persistência em JSON (ver from_state)."""
+
+        return {
+            'attempts': self.attempts,
+            'scores': {str(score): count for score, count in self.scores.items()},
+            'score_sum': self.score_sum,
+            'mean': self.mean,
+            'm2': self.m2,
+            'histogram': self.histogram,
+            'last_attempt_at': self.last_attempt_at,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> 'QuestionStats':
+        """Reconstrói os agregados a partir de to_state."""
+
+        stats = cls()
+        stats.attempts = state['attempts']
+        stats.scores.update({int(score): count for score, count in state['scores'].items()})
+        stats.score_sum = state['score_sum']
+        stats.mean = state['mean']
+        stats.m2 = state['m2']
+        stats.histogram = list(state['histogram'])
+        stats.last_attempt_at = state['last_attempt_at']
+        return stats
+
+
+def _bin(similarity: float) -> int:
+    """Faixa do histograma de uma similaridade (valores fora de [0, 1] vão para as pontas)."""
+    return min(max(int(similarity * HISTOGRAM_BINS), 0), HISTOGRAM_BINS - 1)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Verifica se um processo existe (fora de POSIX, considera que sim)."""
+
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Trava exclusiva entre processos sobre path (sem efeito onde fcntl não existe)."""
+
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read(path: str, worker: bool) -> tuple[dict[str, QuestionStats], list[str]]:
+    """
+    Lê um arquivo de agregados.
+
+    Args:
+        path (str): Arquivo consolidado ({question_id: estado}) ou de um processo
+            ({'questions': {question_id: estado}, 'forgotten': [question_id]}).
+        worker (bool): Se path é o arquivo de um processo.
+    Returns:
+        (tuple[dict[str, QuestionStats], list[str]]): Agregados por questão e questões
+        removidas (vazios se o arquivo não existir ou estiver corrompido).
+    """
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        questions, forgotten = (state['questions'], list(state['forgotten'])) if worker else (state, [])
+        return {question_id: QuestionStats.from_state(s) for question_id, s in questions.items()}, forgotten
+    except FileNotFoundError:
+        return {}, []
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        print(f"⚠️ Falha ao carregar as estatísticas de avaliação de {path}: {e}")
+        return {}, []
+
+
+def _apply(target: dict[str, QuestionStats], stats: dict[str, QuestionStats], forgotten: list[str]) -> None:
+    """Aplica a target as remoções e os agregados salvos por um processo."""
+
+    for question_id in forgotten:
+        target.pop(question_id, None)
+    for question_id, question_stats in stats.items():
+        target.setdefault(question_id, QuestionStats()).merge(question_stats)
+
+
+class GradingStats:
+    """
+    Estatísticas de avaliação por questão, mantidas em memória e salvas periodicamente
+    por uma thread dedicada (e no encerramento da aplicação). Ao iniciar, os agregados
+    são recarregados dos arquivos, sem reprocessar o histórico de submissões.
+
+    Cada processo (ex.: cada worker do uvicorn) grava apenas as avaliações que recebeu
+    desde que iniciou, em um arquivo próprio ao lado de path (stats.<pid>.json). Ao
+    carregar, os arquivos de processos já encerrados são incorporados a path e
+    removidos, e os dos processos ativos são somados aos agregados, sem contagem dupla.
+    """
+
+    def __init__(self, path: str, save_seconds: float):
+        """
+        Args:
+            path (str): Arquivo JSON dos agregados consolidados.
+            save_seconds (float): Intervalo entre as gravações periódicas (0 grava apenas no encerramento).
+        """
+
+        self.path = path
+        self.save_seconds = save_seconds
+        self._base: dict[str, QuestionStats] = {}
+        self._own: dict[str, QuestionStats] = {}
+        self._forgotten: set[str] = set()
+        self._lock = Lock()
+        self._dirty = False
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+        root, extension = os.path.splitext(os.path.basename(path))
+        self._worker_file = re.compile(rf'{re.escape(root)}\.(\d+){re.escape(extension)}')
+
+    def worker_path(self, pid: int) -> str:
+        """Arquivo com as avaliações recebidas pelo processo pid (ex.: data/stats.1234.json)."""
+
+        root, extension = os.path.splitext(self.path)
+        return f"{root}.{pid}{extension}"
+
+    def record(self, question_id: str, similarity: float, score: int) -> None:
+        """
+        Incorpora uma avaliação às estatísticas da questão, em O(1).
+
+        Args:
+            question_id (str): Identificador da questão.
+            similarity (float): Similaridade obtida.
+            score (int): Pontuação obtida.
+        """
+
+        timestamp = time.time()
+        with self._lock:
+            stats = self._own.get(question_id)
+            if stats is None:
+                stats = self._own[question_id] = QuestionStats()
+            stats.add(float(similarity), score, timestamp)
+            self._dirty = True
+
+    def _combined(self, question_id: str) -> QuestionStats | None:
+        """Agregados carregados somados aos deste processo (chamado com self._lock)."""
+
+        base, own = self._base.get(question_id), self._own.get(question_id)
+        if base is None or own is None:
+            return base or own
+        stats = QuestionStats()
+        stats.merge(base)
+        stats.merge(own)
+        return stats
+
+    def get(self, question_id: str) -> dict[str, object]:
+        """
+        Retorna as estatísticas de uma questão.
+
+        Args:
+            question_id (str): Identificador da questão.
+        Returns:
+            (dict[str, object]): Ver QuestionStats.to_dict (zerado se ainda não houver avaliações).
+        """
+
+        with self._lock:
+            stats = self._combined(question_id) or QuestionStats()
+            return stats.to_dict()
+
+    def summary(self, question_ids: list[str], k: int = 5) -> dict[str, object]:
+        """
+        Resume as estatísticas de todo o banco, combinando os agregados das questões.
+
+        Args:
+            question_ids (list[str]): Questões existentes no banco.
+            k (int): Quantidade de questões listadas em hardest.
+        Returns:
+            (dict[str, object]): Agregados de todas as avaliações (ver QuestionStats.to_dict),
+            mais questions (questões no banco), answered (questões com avaliações) e hardest
+            (até k questões com menor pontuação média, com question_id, attempts e mean_score).
+        """
+
+        total = QuestionStats()
+        answered: list[tuple[float, int, str]] = []
+        with self._lock:
+            for question_id in question_ids:
+                stats = self._combined(question_id)
+                if stats is None or stats.attempts == 0:
+                    continue
+                total.merge(stats)
+                answered.append((stats.score_sum / stats.attempts, stats.attempts, question_id))
+
+        answered.sort(key=lambda item: (item[0], -item[1]))
+        summary = total.to_dict()
+        summary['questions'] = len(question_ids)
+        summary['answered'] = len(answered)
+        summary['hardest'] = [
+            {'question_id': question_id, 'attempts': attempts, 'mean_score': mean_score}
+            for mean_score, attempts, question_id in answered[:k]
+        ]
+        return summary
+
+    def forget(self, question_id: str) -> None:
+        """Descarta as estatísticas de uma questão (ex.: questão removida)."""
+
+        with self._lock:
+            self._base.pop(question_id, None)
+            self._own.pop(question_id, None)
+            self._forgotten.add(question_id)
+            self._dirty = True
+
+    def load(self) -> None:
+        """
+        Carrega os agregados salvos: path, mais os arquivos de cada processo.
+
+        ## Assertivas de saída:
+            - Os arquivos de processos encerrados (e um arquivo deste PID, que só pode ser
+              de uma execução anterior) são incorporados a path e removidos.
+            - Arquivos inexistentes contam como vazios; corrompidos são ignorados com um aviso.
+        """
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pid = os.getpid()
+
+        with _file_lock(self.path + '.lock'):
+            consolidated, _ = _read(self.path, worker=False)
+            stale: list[str] = []
+            live: list[tuple[dict[str, QuestionStats], list[str]]] = []
+            for name in sorted(os.listdir(directory or '.')):
+                match = self._worker_file.fullmatch(name)
+                if match is None:
+                    continue
+                worker_path = os.path.join(directory, name)
+                worker_pid = int(match.group(1))
+                if worker_pid == pid or not _pid_alive(worker_pid):
+                    _apply(consolidated, *_read(worker_path, worker=True))
+                    stale.append(worker_path)
+                else:
+                    live.append(_read(worker_path, worker=True))
+
+            if stale:
+                try:
+                    self._write(self.path, {question_id: stats.to_state() for question_id, stats in consolidated.items()})
+                    for worker_path in stale:
+                        os.remove(worker_path)
+                except OSError as e:
+                    print(f"⚠️ Falha ao consolidar as estatísticas de avaliação: {e}")
+
+        for stats, forgotten in live:
+            _apply(consolidated, stats, forgotten)
+        with self._lock:
+            self._base = consolidated
+            self._own = {}
+            self._forgotten = set()
+            self._dirty = False
+
+    @staticmethod
+    def _write(path: str, state: dict) -> None:
+        """Grava um arquivo de agregados de forma atômica."""
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def save(self) -> None:
+        """Grava as avaliações deste processo no seu arquivo (ver worker_path), se houver alterações."""
+
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {
+                'questions': {question_id: stats.to_state() for question_id, stats in self._own.items()},
+                'forgotten': sorted(self._forgotten),
+            }
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            self._write(self.worker_path(os.getpid()), state)
+        except OSError as e:
+            print(f"⚠️ Falha ao salvar as estatísticas de avaliação: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def start(self) -> None:
+        """Carrega os agregados e inicia a gravação periódica (chamado no lifespan da aplicação)."""
+
+        self.load()
+        if self.save_seconds > 0 and self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="grading-stats", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Encerra a gravação periódica e grava os agregados."""
+
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        self.save()
+
+    def _run(self) -> None:
+        """Laço da thread: grava os agregados a cada save_seconds segundos."""
+
+        while not self._stop.wait(self.save_seconds):
+            self.save()
+
+
+grading_stats: GradingStats = GradingStats(config.STATS_PATH, config.STATS_SAVE_SECONDS)
+"""Instância compartilhada pelo processo, configurada por config.STATS_PATH e config.STATS_SAVE_SECONDS."""
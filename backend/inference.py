@@ -0,0 +1,159 @@
+# inference.py
+
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from threading import BoundedSemaphore, Lock
+from typing import Any, TypeVar
+
+import config
+from metrics import STAGE_SECONDS
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["InferenceQueueFull", "InferenceExecutor", "executor"]
+
+T = TypeVar('T')
+
+
+class InferenceQueueFull(Exception):
+    """Levantada quando a fila de inferência atingiu o limite de avaliações pendentes."""
+
+
+class InferenceExecutor:
+    """
+    Pool de threads dedicado à inferência, separado do threadpool padrão do Starlette,
+    com limite de tarefas pendentes (backpressure).
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        """
+        Args:
+            max_workers (int): Quantidade de threads que executam inferências em paralelo.
+            max_pending (int): Quantidade máxima de tarefas em execução ou aguardando.
+
+        ## Assertivas de entrada:
+            - max_workers e max_pending devem ser maiores que 0.
+        """
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._slots = BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._rejected = 0
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = Lock()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Executa fn(*args) no pool de inferência sem bloquear o event loop.
+
+        Args:
+            fn (Callable): Função a ser executada.
+            *args: Argumentos repassados a fn.
+        Returns:
+            (T): Valor retornado por fn.
+
+        ## Assertivas de saída:
+            - Levanta InferenceQueueFull, sem executar fn, se já houver max_pending
+              tarefas pendentes.
+            - A vaga só é liberada quando a tarefa termina no pool, mesmo se quem a
+              aguarda for cancelado antes (ex.: cliente desconectado).
+        """
+
+        self._acquire()
+        try:
+            future = self._get_pool().submit(partial(self._call, time.perf_counter(), fn, *args))
+        except BaseException:
+            self._release()
+            raise
+        # Liberada no futuro do pool, e não num finally da corrotina: cancelar a espera
+        # não interrompe a thread, que continua ocupando a vaga até terminar
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def wait(self, submit: Callable[[], Future[T]]) -> T:
+        """
+        Aguarda um futuro resolvido fora do pool (ex.: o lote do micro-batching) sem ocupar
+        nenhuma thread, contando-o entre as tarefas pendentes enquanto não for resolvido.
+
+        Args:
+            submit (Callable[[], Future[T]]): Função que enfileira o trabalho e retorna o futuro.
+        Returns:
+            (T): Resultado do futuro.
+
+        ## Assertivas de saída:
+            - Levanta InferenceQueueFull, sem chamar submit, se já houver max_pending
+              tarefas pendentes.
+        """
+
+        self._acquire()
+        try:
+            future = submit()
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _acquire(self) -> None:
+        """Ocupa uma vaga de tarefa pendente ou levanta InferenceQueueFull."""
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise InferenceQueueFull()
+        with self._lock:
+            self._pending += 1
+
+    def _release(self, _: object = None) -> None:
+        """Libera uma vaga ocupada por _acquire (também usada como callback de futuros)."""
+
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    @staticmethod
+    def _call(submitted: float, fn: Callable[..., T], *args: Any) -> T:
+        """Registra o tempo de espera na fila (etapa queue) e executa fn."""
+
+        STAGE_SECONDS.observe(time.perf_counter() - submitted, 'queue')
+        return fn(*args)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Retorna o estado atual da fila de inferência.
+
+        Returns:
+            (dict[str, int]): Objeto contendo pending, rejected, max_pending e max_workers.
+        """
+
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'rejected': self._rejected,
+                'max_pending': self.max_pending,
+                'max_workers': self.max_workers,
+            }
+
+    def shutdown(self) -> None:
+        """Encerra o pool, aguardando as tarefas em andamento."""
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Cria o pool de threads na primeira utilização."""
+
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._pool
+
+
+executor: InferenceExecutor = InferenceExecutor(config.INFERENCE_THREADS, config.INFERENCE_MAX_PENDING)
+"""Instância compartilhada pelo processo, configurada por config.INFERENCE_THREADS e config.INFERENCE_MAX_PENDING."""
@@ -0,0 +1,189 @@
+# lexical.py
+
+import re
+import unicodedata
+from threading import Lock
+
+import config
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["LexicalCascade", "normalize_text", "lexical_similarity", "cascade"]
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+# Palavras de negação (já normalizadas). Uma quase cópia que acrescente ou remova alguma
+# delas pode ter o sentido oposto ao do gabarito, então vai para o codificador.
+# 't' vem das contrações do inglês ("isn't" vira "isn t").
+_NEGATIONS: frozenset[str] = frozenset({
+    'nao', 'nunca', 'nem', 'jamais', 'nenhum', 'nenhuma', 'ninguem', 'nada', 'sem',
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'nor', 'without', 't',
+})
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza um texto para comparação lexical: sem acentos, em minúsculas, com
+    pontuação trocada por espaços e espaços colapsados.
+
+    Args:
+        text (str): Texto original.
+    Returns:
+        (str): Texto normalizado (vazio se não houver letras nem números).
+    """
+
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(_NON_WORD.sub(' ', stripped.casefold()).split())
+
+
+def _edit_distance(a: list[str], b: list[str], limit: int) -> int:
+    """
+    Distância de Levenshtein entre duas sequências de palavras, calculada apenas na faixa
+    |i - j| <= limit da tabela (O(len · limit) em vez de O(len(a) · len(b))).
+
+    Returns:
+        (int): A distância, se não passar de limit; senão, limit + 1.
+    """
+
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    outside = limit + 1
+    previous = [j if j <= limit else outside for j in range(len(b) + 1)]
+    for i, word in enumerate(a, 1):
+        current = [outside] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != b[j - 1]))
+        if min(current) > limit:
+            return outside
+        previous = current
+    return min(previous[-1], outside)
+
+
+def lexical_similarity(answer: str, reference: str, threshold: float = 0.0) -> float:
+    """
+    Similaridade lexical entre dois textos normalizados: 1 menos a distância de edição
+    entre as sequências de palavras, dividida pelo tamanho da maior. Respeita a ordem das
+    palavras: trocar duas palavras de lugar conta como duas substituições.
+
+    Args:
+        answer (str): Resposta normalizada (ver normalize_text).
+        reference (str): Referência normalizada.
+        threshold (float): Menor similaridade de interesse. Abaixo dela o cálculo é
+            interrompido e o resultado é 0 (ver LexicalCascade.check).
+    Returns:
+        (float): Similaridade entre 0 e 1 (1 para textos iguais), ou 0 se for menor que threshold.
+    """
+
+    if answer == reference:
+        return 1.0
+    if not answer or not reference:
+        return 0.0
+    a_words, r_words = answer.split(), reference.split()
+    longest = max(len(a_words), len(r_words))
+    # A distância é ao menos a diferença de tamanho: textos desproporcionais nem entram na tabela
+    if min(len(a_words), len(r_words)) / longest < threshold:
+        return 0.0
+    limit = int((1 - threshold) * longest + 1e-9)
+    distance = _edit_distance(a_words, r_words, limit)
+    return 0.0 if distance > limit else 1 - distance / longest
+
+
+def _negations(normalized: str) -> list[str]:
+    """Palavras de negação do texto normalizado, na ordem em que aparecem."""
+    return [word for word in normalized.split() if word in _NEGATIONS]
+
+
+class LexicalCascade:
+    """
+    Primeira etapa da avaliação, executada antes do codificador: decide sem o modelo as
+    respostas cujo resultado não depende dele, com contadores de cada desfecho.
+
+    - Resposta sem conteúdo (nenhuma letra ou número): similaridade 0.
+    - Cópia do gabarito (ou de uma resposta alternativa) após a normalização: similaridade 1.
+    - Resposta curta (menos de min_chars letras ou números): similaridade 0.
+    - Quase cópia (mesmas palavras na mesma ordem, com similaridade lexical a partir de
+      near_copy_threshold, e as mesmas negações da referência): a similaridade lexical,
+      sempre acima da faixa de 100 pontos.
+
+    As demais vão para o codificador. Pouca sobreposição de palavras não indica uma
+    resposta errada (paráfrases), então a cascata nunca reprova uma resposta com conteúdo.
+    Referências vazias após a normalização são ignoradas.
+    """
+
+    def __init__(self, enabled: bool, near_copy_threshold: float, min_chars: int):
+        """
+        Args:
+            enabled (bool): Se False, todas as respostas vão para o codificador.
+            near_copy_threshold (float): Similaridade lexical a partir da qual a resposta é
+                tratada como cópia do gabarito.
+            min_chars (int): Letras ou números necessários para a resposta ir ao codificador.
+
+        ## Assertivas de entrada:
+            - near_copy_threshold deve ser maior que 0.70 (faixa de 100 pontos).
+        """
+
+        self.enabled = enabled
+        self.near_copy_threshold = near_copy_threshold
+        self.min_chars = min_chars
+        self._lock = Lock()
+        self._counts: dict[str, int] = {'exact': 0, 'near_copy': 0, 'blank': 0, 'encoder': 0}
+
+    def check(self, answer: str, references: list[str]) -> float | None:
+        """
+        Tenta avaliar a resposta apenas com comparações lexicais.
+
+        Args:
+            answer (str): Resposta do usuário.
+            references (list[str]): Gabarito e respostas alternativas da questão.
+        Returns:
+            (float | None): Similaridade decidida pela cascata, ou None se a resposta
+            precisar do codificador.
+        """
+
+        if not self.enabled:
+            return None
+
+        normalized = normalize_text(answer)
+        normalized_references = [r for r in map(normalize_text, references) if r]
+        if not normalized:
+            outcome, similarity = 'blank', 0.0
+        elif normalized in normalized_references:
+            outcome, similarity = 'exact', 1.0
+        elif len(normalized.replace(' ', '')) < self.min_chars:
+            outcome, similarity = 'blank', 0.0
+        else:
+            negations = _negations(normalized)
+            best = max((lexical_similarity(normalized, reference, self.near_copy_threshold)
+                        for reference in normalized_references
+                        if _negations(reference) == negations), default=0.0)
+            if best >= self.near_copy_threshold:
+                outcome, similarity = 'near_copy', best
+            else:
+                outcome, similarity = 'encoder', None
+
+        with self._lock:
+            self._counts[outcome] += 1
+        return similarity
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Retorna os contadores da cascata.
+
+        Returns:
+            (dict[str, int | float]): Objeto contendo:
+                - exact, near_copy, blank (int): respostas decididas em cada etapa.
+                - encoder (int): respostas enviadas ao codificador.
+                - hit_rate (float): fração das respostas decididas sem o codificador.
+        """
+
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        hits = total - counts['encoder']
+        return {**counts, 'hit_rate': hits / total if total else 0.0}
+
+
+cascade: LexicalCascade = LexicalCascade(config.CASCADE, config.CASCADE_NEAR_COPY, config.CASCADE_MIN_CHARS)
+"""Instância compartilhada pelo processo, configurada pelas variáveis config.CASCADE*."""
@@ -0,0 +1,249 @@
+# metrics.py
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["Counter", "Histogram", "register_gauge", "render", "MetricsMiddleware",
+           "HTTP_REQUESTS", "HTTP_LATENCY", "STAGE_SECONDS", "MODEL_LOAD_SECONDS"]
+
+# Limites (segundos) dos histogramas de latência, de 0,5 ms a 10 s
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_Labels = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: _Labels, extra: str = '') -> str:
+    """Formata os rótulos no padrão do Prometheus: {nome="valor",...}."""
+
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Counter:
+    """Contador monotônico com rótulos, no formato counter do Prometheus."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        """
+        Args:
+            name (str): Nome da métrica.
+            help (str): Descrição exibida em # HELP.
+            labelnames (tuple[str, ...]): Nomes dos rótulos.
+        """
+
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[_Labels, float] = {}
+        self._lock = Lock()
+        _registry.append(self)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Incrementa o contador dos rótulos informados (na ordem de labelnames)."""
+
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Retorna o valor atual do contador dos rótulos informados."""
+        return self._values.get(labels, 0.0)
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(items):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Histograma com rótulos e limites fixos, no formato histogram do Prometheus.
+    Cada observação custa uma busca binária e um incremento, sob um lock.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Args:
+            name (str): Nome da métrica.
+            help (str): Descrição exibida em # HELP.
+            labelnames (tuple[str, ...]): Nomes dos rótulos.
+            buckets (tuple[float, ...]): Limites superiores das faixas, em ordem crescente.
+        """
+
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Por rótulos: [contagem por faixa (não acumulada, +Inf no fim), soma, total]
+        self._series: dict[_Labels, list[Any]] = {}
+        self._lock = Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Registra uma observação para os rótulos informados (na ordem de labelnames)."""
+
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Mede a duração do bloco e a registra no histograma."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        """Retorna a quantidade de observações dos rótulos informados."""
+
+        series = self._series.get(labels)
+        return 0 if series is None else series[2]
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            items = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total, count in sorted(items, key=lambda item: item[0]):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class _Gauge:
+    """Métrica lida no momento da coleta, a partir de uma função."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float | dict[_Labels, float]],
+                 labelnames: tuple[str, ...] = (), kind: str = 'gauge'):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labelnames = labelnames
+        self.kind = kind
+
+    def collect(self) -> list[str]:
+        value = self.fn()
+        values = value if isinstance(value, dict) else {(): value}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, v in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}")
+        return lines
+
+
+_registry: list[Counter | Histogram | _Gauge] = []
+
+
+def register_gauge(name: str, help: str, fn: Callable[[], float | dict[_Labels, float]],
+                   labelnames: tuple[str, ...] = (), kind: str = 'gauge') -> None:
+    """
+    Registra uma métrica calculada no momento da coleta (ex.: tamanho do banco de questões).
+
+    Args:
+        name (str): Nome da métrica.
+        help (str): Descrição exibida em # HELP.
+        fn (Callable): Função que retorna o valor, ou um dicionário {rótulos: valor}.
+        labelnames (tuple[str, ...]): Nomes dos rótulos, se fn retornar um dicionário.
+        kind (str): Tipo exibido em # TYPE ('gauge' ou 'counter', para contadores mantidos
+            por outro módulo).
+
+    ## Assertivas de saída:
+        - Registrar de novo um nome substitui a métrica anterior.
+    """
+
+    _registry[:] = [metric for metric in _registry if metric.name != name]
+    _registry.append(_Gauge(name, help, fn, labelnames, kind))
+
+
+def render() -> str:
+    """
+    Retorna todas as métricas registradas no formato de texto do Prometheus.
+
+    ## Assertivas de saída:
+        - Uma métrica cuja função falhar é omitida, sem impedir as demais.
+    """
+
+    lines: list[str] = []
+    for metric in list(_registry):
+        try:
+            lines.extend(metric.collect())
+        except Exception as e:
+            print(f"⚠️ Falha ao coletar a métrica {metric.name}: {e}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que conta as requisições e mede a latência de cada rota, usando o
+    caminho da rota (ex.: /questions/{question_id}) como rótulo, e não a URL concreta.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            HTTP_LATENCY.observe(time.perf_counter() - start, scope['method'], path)
+            HTTP_REQUESTS.inc(scope['method'], path, str(status[0]))
+
+
+HTTP_REQUESTS: Counter = Counter(
+    'flavify_http_requests_total', "Requisições HTTP atendidas.", ('method', 'route', 'status'))
+HTTP_LATENCY: Histogram = Histogram(
+    'flavify_http_request_duration_seconds', "Latência das requisições HTTP.", ('method', 'route'))
+STAGE_SECONDS: Histogram = Histogram(
+    'flavify_stage_duration_seconds',
+    "Duração de cada etapa da avaliação (queue, lexical, cache, reference, tokenize, forward, cosine, similarity).",
+    ('stage',))
+MODEL_LOAD_SECONDS: dict[str, float] = {}
+"""Tempo de carga de cada modelo (por versão), preenchido por natural_language.get_model."""
+
+register_gauge('flavify_model_load_seconds', "Tempo de carga do modelo.",
+               lambda: {(name,): seconds for name, seconds in MODEL_LOAD_SECONDS.items()}, ('model',))
@@ -1,34 +1,419 @@
 # natural_language.py
 
-from torch import Tensor
-from sentence_transformers import SentenceTransformer, util
+import os
+import re
+import time
+from threading import Lock, local
+from typing import TYPE_CHECKING, Any
+import numpy as np
+from numpy import ndarray
+
+import config
+from metrics import STAGE_SECONDS, MODEL_LOAD_SECONDS
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer, util
 
 # Encapsulamento dos atributos e disponibilização apenas das funções de acesso
-__all__ = ["sentence_similarity"]
+__all__ = ["sentence_similarity", "batch_sentence_similarity", "encode", "get_model",
+           "model_version", "export_onnx_int8", "split_answer", "LONG_ANSWER_MODES"]
+
+BACKENDS: tuple[str, ...] = ("torch", "onnx", "onnx-int8")
+LONG_ANSWER_MODES: tuple[str, ...] = ("off", "max", "mean", "coverage")
+
+# Fim de frase: pontuação seguida de espaço, ou quebra de linha
+_SENTENCE_END = re.compile(r'(?<=[.!?;:])\s+|\n+')
+
+# Registro dos modelos já carregados no processo, identificados por (nome, dispositivo, backend)
+_models: dict[tuple[str, str | None, str], 'SentenceTransformer'] = {}
+_models_lock: Lock = Lock()
+
+# Nomes de sentence_transformers importados apenas no primeiro uso do modelo. Importar
+# a biblioteca carrega o torch, o que leva segundos e centenas de MB; processos que só
+# servem o CRUD de questões nunca pagam esse custo.
+_LAZY_NAMES: tuple[str, ...] = ("SentenceTransformer", "util")
+
+
+def _import_nlp() -> None:
+    """Importa sentence_transformers (e o torch) na primeira chamada."""
+
+    if all(name in globals() for name in _LAZY_NAMES):
+        return
+    import sentence_transformers
+    # setdefault preserva substituições já feitas (ex.: mocks dos testes)
+    globals().setdefault("SentenceTransformer", sentence_transformers.SentenceTransformer)
+    globals().setdefault("util", sentence_transformers.util)
+
+
+# Tempo gasto na tokenização durante a chamada a encode em andamento, por thread
+_tokenize_time = local()
+
+
+def _instrument(model: 'SentenceTransformer') -> 'SentenceTransformer':
+    """
+    Envolve a etapa de tokenização do modelo com um cronômetro, para separar o tempo de
+    tokenização do tempo da passada do modelo nas métricas de _encode.
+    """
+
+    name = 'preprocess' if hasattr(model, 'preprocess') else 'tokenize'
+    original = getattr(model, name)
+
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _tokenize_time.seconds = getattr(_tokenize_time, 'seconds', 0.0) + time.perf_counter() - start
+
+    setattr(model, name, timed)
+    return model
+
+
+def _encode(model: 'SentenceTransformer', sentences: str | list[str], **kwargs: Any) -> ndarray:
+    """Chama model.encode registrando as etapas tokenize e forward em metrics.STAGE_SECONDS."""
+
+    _tokenize_time.seconds = 0.0
+    start = time.perf_counter()
+    embeddings = model.encode(sentences, **kwargs) # pyright: ignore[reportUnknownMemberType]
+    elapsed = time.perf_counter() - start
+    tokenize = min(_tokenize_time.seconds, elapsed)
+    STAGE_SECONDS.observe(tokenize, 'tokenize')
+    STAGE_SECONDS.observe(elapsed - tokenize, 'forward')
+    return embeddings
+
+
+def __getattr__(name: str) -> Any:
+    """Permite acessar natural_language.SentenceTransformer e natural_language.util sob demanda."""
+
+    if name in _LAZY_NAMES:
+        _import_nlp()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def model_version(model_name: str | None = None, backend: str | None = None) -> str:
+    """
+    Identifica o modelo e o backend usados para gerar embeddings, para que caches de
+    embeddings e de similaridades não misturem resultados de codificadores diferentes.
+
+    Args:
+        model_name (str | None): Nome do modelo. Se None, usa config.MODEL_NAME.
+        backend (str | None): Backend do codificador. Se None, usa config.ENCODER_BACKEND.
+    Returns:
+        (str): O nome do modelo, seguido de '@backend' quando o backend não é torch.
+    """
+
+    model_name = model_name or config.MODEL_NAME
+    backend = backend or config.ENCODER_BACKEND
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def export_onnx_int8(model_name: str, device: str | None = None) -> str:
+    """
+    Exporta o modelo para ONNX e aplica quantização dinâmica int8, salvando o resultado
+    em config.ONNX_EXPORT_DIR. Requer os pacotes optimum e onnxruntime.
+
+    Args:
+        model_name (str): Nome do modelo a ser exportado.
+        device (str | None): Dispositivo usado durante a exportação.
+    Returns:
+        (str): Pasta do modelo exportado.
+
+    ## Assertivas de saída:
+        - A pasta retornada contém o modelo ONNX e a variante onnx/model_qint8_<config>.onnx.
+        - Se a variante quantizada já existir, nada é exportado novamente.
+    """
+
+    _import_nlp()
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    export_dir = os.path.join(config.ONNX_EXPORT_DIR, model_name.replace('/', '--'))
+    file_name = f"onnx/model_qint8_{config.ONNX_QUANTIZATION}.onnx"
+    if os.path.exists(os.path.join(export_dir, file_name)):
+        return export_dir
+
+    kwargs = {} if device is None else {'device': device}
+    model = SentenceTransformer(model_name, backend="onnx", **kwargs)
+    model.save_pretrained(export_dir)
+    export_dynamic_quantized_onnx_model(model, config.ONNX_QUANTIZATION, export_dir) # pyright: ignore[reportArgumentType]
+    print(f"✅ Modelo {model_name} exportado para ONNX int8 em {export_dir}")
+    return export_dir
+
+
+def _load_model(model_name: str, device: str | None, backend: str) -> 'SentenceTransformer':
+    """Carrega o modelo com o backend solicitado."""
+
+    _import_nlp()
+    kwargs = {} if device is None else {'device': device}
+    if backend == "torch":
+        return SentenceTransformer(model_name, **kwargs)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx", **kwargs)
+    if backend == "onnx-int8":
+        export_dir = export_onnx_int8(model_name, device)
+        file_name = f"onnx/model_qint8_{config.ONNX_QUANTIZATION}.onnx"
+        return SentenceTransformer(export_dir, backend="onnx", model_kwargs={'file_name': file_name}, **kwargs)
+    raise ValueError(f"Backend de codificador desconhecido: {backend} (opções: {', '.join(BACKENDS)})")
+
+
+def get_model(model_name: str | None = None, device: str | None = None,
+              backend: str | None = None) -> 'SentenceTransformer':
+    """
+    Retorna o modelo SentenceTransformer solicitado, carregando-o apenas na primeira
+    chamada do processo. As chamadas seguintes reutilizam a mesma instância.
+
+    Args:
+        model_name (str | None): Nome do modelo. Se None, usa config.MODEL_NAME.
+        device (str | None): Dispositivo do modelo. Se None, usa config.MODEL_DEVICE.
+        backend (str | None): Backend do codificador ('torch', 'onnx' ou 'onnx-int8').
+            Se None, usa config.ENCODER_BACKEND.
+    Returns:
+        (SentenceTransformer): Instância compartilhada do modelo. A biblioteca
+        sentence_transformers só é importada quando o primeiro modelo é carregado.
+
+    ## Assertivas de entrada:
+        - model_name, se informado, deve ser o nome de um modelo válido.
+        - backend deve ser um dos valores de BACKENDS.
+    ## Assertivas de saída:
+        - Cada combinação (modelo, dispositivo, backend) é carregada no máximo uma vez
+          por processo, mesmo com chamadas concorrentes.
+    """
+
+    model_name = model_name or config.MODEL_NAME
+    device = device or config.MODEL_DEVICE
+    backend = backend or config.ENCODER_BACKEND
+    key = (model_name, device, backend)
+
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _models_lock:
+        # Outra thread pode ter carregado o modelo enquanto esperávamos o lock
+        model = _models.get(key)
+        if model is None:
+            start = time.perf_counter()
+            model = _instrument(_load_model(model_name, device, backend))
+            _models[key] = model
+            MODEL_LOAD_SECONDS[model_version(model_name, backend)] = time.perf_counter() - start
+            print(f"✅ Modelo {model_version(model_name, backend)} carregado")
+    return model
 
-def sentence_similarity(sentence1: str, sentence2: str) -> float:
+
+def encode(sentences: list[str]) -> ndarray:
+    """
+    Calcula os embeddings de várias frases em uma única passada do modelo.
+
+    Args:
+        sentences (list[str]): Frases a serem codificadas.
+    Returns:
+        (ndarray): Matriz com um embedding por linha, na mesma ordem das frases.
+
+    ## Assertivas de saída:
+        - A matriz possui len(sentences) linhas.
+    """
+
+    model: 'SentenceTransformer' = get_model()
+    return _encode(model, sentences)
+
+
+def split_answer(text: str, chunk_words: int | None = None, max_chunks: int | None = None) -> list[str]:
+    """
+    Divide uma resposta longa em trechos que cabem no limite de tokens do modelo,
+    agrupando frases inteiras em janelas de até chunk_words palavras. Uma frase maior
+    que a janela é dividida em janelas consecutivas.
+
+    Args:
+        text (str): Resposta a ser dividida.
+        chunk_words (int | None): Palavras por trecho. Se None, usa config.LONG_ANSWER_CHUNK_WORDS.
+        max_chunks (int | None): Quantidade máxima de trechos. Se None, usa
+            config.LONG_ANSWER_MAX_CHUNKS.
+    Returns:
+        (list[str]): Trechos na ordem do texto. Uma resposta curta retorna [text].
+
+    ## Assertivas de entrada:
+        - chunk_words e max_chunks devem ser maiores que 0.
+    ## Assertivas de saída:
+        - Cada trecho tem no máximo chunk_words palavras (exceto [text], se curta).
+        - Trechos além de max_chunks são descartados, limitando o custo da avaliação.
+    """
+
+    chunk_words = chunk_words or config.LONG_ANSWER_CHUNK_WORDS
+    max_chunks = max_chunks or config.LONG_ANSWER_MAX_CHUNKS
+    if len(text.split()) <= chunk_words:
+        return [text]
+
+    chunks: list[str] = []
+    current: list[str] = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        words = sentence.split()
+        if current and len(current) + len(words) > chunk_words:
+            chunks.append(' '.join(current))
+            current = []
+        while len(words) > chunk_words:
+            chunks.append(' '.join(words[:chunk_words]))
+            words = words[chunk_words:]
+        current.extend(words)
+        if len(chunks) >= max_chunks:
+            break
+    if current:
+        chunks.append(' '.join(current))
+    return chunks[:max_chunks]
+
+
+def _aggregate(chunks: ndarray, references: ndarray, mode: str) -> float:
+    """
+    Combina as similaridades entre os trechos de uma resposta e as suas referências.
+
+    Args:
+        chunks (ndarray): Embeddings dos trechos, um por linha.
+        references (ndarray): Embeddings das referências, um por linha.
+        mode (str): 'max' (melhor trecho), 'mean' (média dos trechos) ou 'coverage'
+            (centroide dos trechos, que reúne o conteúdo espalhado pela resposta).
+    Returns:
+        (float): Similaridade com a referência mais próxima, entre 0 e 1.
+    """
+
+    chunks = np.atleast_2d(chunks).astype(np.float32, copy=False)
+    references = np.atleast_2d(references).astype(np.float32, copy=False)
+    chunks = chunks / np.maximum(np.linalg.norm(chunks, axis=1, keepdims=True), 1e-12)
+    references = references / np.maximum(np.linalg.norm(references, axis=1, keepdims=True), 1e-12)
+
+    if mode == 'coverage':
+        centroid = chunks.sum(axis=0)
+        centroid /= max(float(np.linalg.norm(centroid)), 1e-12)
+        similarity = float((references @ centroid).max())
+    else:
+        scores = chunks @ references.T
+        similarity = float(scores.max() if mode == 'max' else scores.mean(axis=0).max())
+    return max(similarity, 0.0)
+
+
+def _long_answer_mode() -> str | None:
+    """
+    Modo de agregação das respostas longas, ou None se o modo está desativado.
+
+    ## Assertivas de saída:
+        - Levanta ValueError se config.LONG_ANSWER_MODE não estiver em LONG_ANSWER_MODES.
+    """
+
+    mode = config.LONG_ANSWER_MODE
+    if mode not in LONG_ANSWER_MODES:
+        raise ValueError(f"Modo de respostas longas desconhecido: {mode} (opções: {', '.join(LONG_ANSWER_MODES)})")
+    return None if mode == 'off' else mode
+
+
+def sentence_similarity(sentence1: str, sentence2: str | list[str], embedding2: ndarray | None = None) -> float:
     """
     Avalia a similaridade entre duas frases utilizando NLP.
 
     Args:
         sentence1 (str): Primeira frase.
-        sentence2 (str): Segunda frase.
+        sentence2 (str | list[str]): Segunda frase, ou lista de frases de referência
+            (ex.: gabarito e respostas alternativas).
+        embedding2 (ndarray | None): Embedding já calculado de sentence2 (uma linha por
+            referência, se for uma lista). Se informado, sentence2 não é codificada novamente.
 
     Returns:
-        (float): Valor que indica o grau de similaridade entre as frases.
+        (float): Valor que indica o grau de similaridade entre as frases. Com várias
+        referências, a maior similaridade entre elas.
 
     ## Assertivas de entrada
         - Os parâmetros sentence1 e sentence2 não podem ser strings vazias.
+        - embedding2, se informado, deve ter sido gerado pelo modelo configurado.
     ## Assertivas de saída
         - O grau de similaridade está entre 0 e 1.
+        - Com config.LONG_ANSWER_MODE ativo, uma sentence1 longa é dividida em trechos
+          (split_answer), codificados em um único lote e combinados conforme o modo.
     """
 
-    model: SentenceTransformer = SentenceTransformer("paraphrase-multilingual-MiniLM-L12-v2")
+    model: 'SentenceTransformer' = get_model()
+
+    mode = _long_answer_mode()
+    chunks = split_answer(sentence1) if mode is not None else [sentence1]
+    if mode is not None and len(chunks) > 1:
+        references: ndarray = embedding2 if embedding2 is not None else _encode(model, sentence2)
+        chunk_embeddings: ndarray = _encode(model, chunks, batch_size=len(chunks))
+        with STAGE_SECONDS.time('cosine'):
+            return _aggregate(chunk_embeddings, references, mode)
 
-    emb1: Tensor = model.encode(sentence1, convert_to_tensor=True) # pyright: ignore[reportUnknownMemberType]
-    emb2: Tensor = model.encode(sentence2, convert_to_tensor=True) # pyright: ignore[reportUnknownMemberType]
+    emb1: ndarray = _encode(model, sentence1)
+    emb2: ndarray = embedding2 if embedding2 is not None else _encode(model, sentence2)
 
-    similarity: float = util.cos_sim(emb1, emb2).item() # pyright: ignore[reportUnknownMemberType]
+    _import_nlp()
+    with STAGE_SECONDS.time('cosine'):
+        scores = util.cos_sim(emb1, emb2) # pyright: ignore[reportUnknownMemberType]
+        # Várias referências: um único produto matriz-vetor, do qual vale o maior cosseno
+        if isinstance(emb2, np.ndarray) and emb2.ndim == 2 and len(emb2) > 1:
+            scores = scores.max()
+        similarity: float = scores.item()
     similarity = max(similarity, 0)
-    
+
     return similarity
+
+
+def batch_sentence_similarity(sentences: list[str], references: ndarray, counts: list[int] | None = None) -> list[float]:
+    """
+    Avalia a similaridade de várias frases, cada uma com suas próprias referências,
+    codificando todas as frases em um único lote e calculando os cossenos de uma só vez.
+
+    Args:
+        sentences (list[str]): Frases a serem avaliadas.
+        references (ndarray): Matriz de embeddings das referências, agrupadas por frase.
+        counts (list[int] | None): Quantidade de linhas de references de cada frase, na
+            ordem das frases. Se None, cada frase tem exatamente uma linha.
+
+    Returns:
+        (list[float]): Maior similaridade de cada frase com as suas referências.
+
+    ## Assertivas de entrada
+        - references deve ter sum(counts) linhas (ou len(sentences), sem counts).
+        - Cada valor de counts deve ser maior que 0.
+    ## Assertivas de saída
+        - Cada similaridade está entre 0 e 1, na mesma ordem das frases.
+        - Com config.LONG_ANSWER_MODE ativo, os trechos das frases longas são codificados
+          no mesmo lote das demais frases.
+    """
+
+    if not sentences:
+        return []
+
+    model: 'SentenceTransformer' = get_model()
+
+    mode = _long_answer_mode()
+    if mode is not None:
+        chunk_lists = [split_answer(sentence) for sentence in sentences]
+        if any(len(chunks) > 1 for chunks in chunk_lists):
+            return _batch_chunked_similarity(model, chunk_lists, references, counts, mode)
+
+    answers: ndarray = _encode(model, sentences, batch_size=len(sentences))
+
+    _import_nlp()
+    with STAGE_SECONDS.time('cosine'):
+        if counts is None or len(references) == len(sentences):
+            similarities = util.pairwise_cos_sim(answers, references).clamp(min=0) # pyright: ignore[reportUnknownMemberType]
+            return similarities.tolist()
+        # Repete cada resposta para as suas referências e toma o máximo de cada grupo
+        pairwise = util.pairwise_cos_sim(np.repeat(answers, counts, axis=0), references).numpy() # pyright: ignore[reportUnknownMemberType]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return np.maximum(np.maximum.reduceat(pairwise, starts), 0).tolist()
+
+
+def _batch_chunked_similarity(model: 'SentenceTransformer', chunk_lists: list[list[str]], references: ndarray,
+                              counts: list[int] | None, mode: str) -> list[float]:
+    """Avalia um lote com respostas longas: todos os trechos em uma passada do modelo, agregados por resposta."""
+
+    flat = [chunk for chunks in chunk_lists for chunk in chunks]
+    embeddings: ndarray = _encode(model, flat, batch_size=len(flat))
+    counts = counts or [1] * len(chunk_lists)
+
+    similarities: list[float] = []
+    with STAGE_SECONDS.time('cosine'):
+        row = 0
+        reference_row = 0
+        for chunks, count in zip(chunk_lists, counts):
+            similarities.append(_aggregate(embeddings[row:row + len(chunks)],
+                                           references[reference_row:reference_row + count], mode))
+            row += len(chunks)
+            reference_row += count
+    return similarities
@@ -1,26 +1,199 @@
 # question.py
 
-import json
+import numpy as np
+from bisect import bisect_right
+from collections.abc import Iterator
+from threading import Lock, RLock
+from typing import Any
 from uuid import uuid4
 from natural_language import sentence_similarity
+from worker_pool import batch_similarity
+from batching import batcher
+from similarity_cache import similarity_cache
+from submissions import submissions
+from grading_stats import grading_stats
+from lexical import cascade
+from storage import QuestionStore, JsonStore, open_store
+from metrics import STAGE_SECONDS
+import embeddings
+import config
 
 # Encapsulamento dos atributos e disponibilização apenas das funções de acesso
-__all__ = ["evaluate", "get_statement", "get_correct_answer", "create_question", 
-           "get_all_questions", "update_question", "delete_question"]
+__all__ = ["evaluate", "evaluate_batch", "similarity_to_score", "get_statement", "get_correct_answer", "create_question", 
+           "create_questions", "get_all_questions", "list_questions", "iter_questions", "get_version", "update_question", "delete_question", "get_similar_questions",
+           "find_duplicates", "search_questions", "precompute_embeddings", "get_reference_answers",
+           "get_question_stats", "get_bank_stats", "encode_statement", "ensure_embeddings", "QUESTION_FIELDS",
+           "prepare_evaluation", "finish_evaluation"]
 
-questions: dict[str, dict[str, str]] = {}
+QUESTION_FIELDS: tuple[str, ...] = ('question_id', 'statement', 'correct_answer', 'alternative_answers')
+
+questions: dict[str, dict[str, Any]] = {}
 """
 Formato de um dicionário de questão:
     question_id: str
     statement: str
     correct_answer: str
+    alternative_answers: list[str] (opcional) - outras formulações aceitas como corretas
+"""
+
+_store: QuestionStore = JsonStore()
+"""Armazenamento persistente das questões, definido por load_questions_from_json."""
+
+# Índice de ordem de criação usado na paginação: cada questão recebe um número de
+# sequência crescente, que nunca é reutilizado e serve de cursor. Questões removidas
+# permanecem no índice até a próxima reconstrução.
+_order_ids: list[str] = []
+_order_seqs: list[int] = []
+_order_live: int = 0
+_next_seq: int = 0
+
+_version: int = 0
+"""Versão do banco de questões, incrementada a cada alteração."""
+
+_embeddings_loaded: bool = False
+"""
+Indica se os embeddings do banco já foram carregados (precompute_embeddings). Até lá,
+o CRUD não chama o modelo, e o primeiro uso de NLP carrega tudo de uma vez.
 """
+_embeddings_lock: Lock = Lock()
+
+_questions_lock: RLock = RLock()
+"""
+Serializa as alterações do dicionário de questões (CRUD e recarga do armazenamento) com o
+retrato do banco tirado por precompute_embeddings, que roda na thread do aquecimento.
+"""
+
+_pending_embeddings: set[str] | None = None
+"""
+Questões criadas, alteradas ou removidas enquanto precompute_embeddings calcula o banco
+(None fora dele). São reindexadas ao final, antes de _embeddings_loaded virar True.
+"""
+
+
+def _embeddings_ready(*question_ids: str) -> bool:
+    """
+    Indica se o CRUD deve atualizar os embeddings das questões na hora. Se ainda não,
+    registra as questões para precompute_embeddings. Deve ser chamada com _questions_lock.
+    """
+
+    if not _embeddings_loaded and _pending_embeddings is not None:
+        _pending_embeddings.update(question_ids)
+    return _embeddings_loaded
+
+
+def _bump_version() -> None:
+    """Registra uma alteração no banco de questões."""
+    global _version
+    _version += 1
+
+
+def _index_append(question_id: str) -> None:
+    """Registra uma nova questão no fim do índice de ordem."""
+    global _order_live, _next_seq
+    _order_ids.append(question_id)
+    _order_seqs.append(_next_seq)
+    _next_seq += 1
+    _order_live += 1
+
+
+def _index_remove() -> None:
+    """Contabiliza uma remoção e reconstrói o índice se ele tiver muitas entradas mortas."""
+    global _order_live
+    _order_live -= 1
+    if len(_order_ids) > 2 * _order_live + 64:
+        _rebuild_order_index()
+
+
+def _rebuild_order_index() -> None:
+    """
+    Reconstrói o índice de ordem a partir do dicionário de questões, mantendo o número
+    de sequência das questões que já estavam indexadas (cursores continuam válidos).
+    """
+    global _order_ids, _order_seqs, _order_live
+
+    ids: list[str] = []
+    seqs: list[int] = []
+    indexed: set[str] = set()
+    for question_id, seq in zip(_order_ids, _order_seqs):
+        if question_id in questions and question_id not in indexed:
+            ids.append(question_id)
+            seqs.append(seq)
+            indexed.add(question_id)
+    # Troca as listas de uma vez; quem já estava iterando continua com as antigas
+    _order_ids, _order_seqs, _order_live = ids, seqs, len(ids)
+    for question_id in questions:
+        if question_id not in indexed:
+            _index_append(question_id)
+    _bump_version()
+
+
+def _ensure_order_index() -> None:
+    """Reconstrói o índice se o dicionário de questões foi alterado por fora das funções do módulo."""
+    if _order_live != len(questions):
+        _rebuild_order_index()
+
+
+def _sync_from_store() -> None:
+    """
+    Recarrega o dicionário de questões se outro processo alterou o armazenamento
+    (ex.: vários workers compartilhando o mesmo banco SQLite).
+    """
+
+    if not _store.has_external_changes():
+        return
+
+    with _questions_lock:
+        fresh = {q['question_id']: q for q in _store.load_all()}
+        removed = questions.keys() - fresh.keys()
+        for question_id in removed:
+            embeddings.invalidate(question_id)
+        questions.clear()
+        questions.update(fresh)
+        similarity_cache.clear()
+        _rebuild_order_index()
+        loaded = _embeddings_ready(*fresh, *removed)
+    if loaded:
+        embeddings.index_statements([(q['question_id'], q['statement']) for q in fresh.values()])
+
+
+def ensure_embeddings() -> None:
+    """
+    Carrega os embeddings do banco (e o modelo) no primeiro uso de NLP do processo. O
+    aquecimento e as primeiras requisições compartilham a mesma trava, então o banco é
+    codificado uma única vez mesmo que uma avaliação chegue durante o aquecimento.
+    """
+
+    if _embeddings_loaded:
+        return
+    with _embeddings_lock:
+        if not _embeddings_loaded:
+            precompute_embeddings()
+
+
+def _references(question: dict[str, Any]) -> list[str]:
+    """Respostas de referência de uma questão: o gabarito seguido das alternativas."""
+    return [question['correct_answer'], *question.get('alternative_answers', ())]
+
+
+def _project(question: dict[str, Any], fields: list[str] | None) -> dict[str, Any]:
+    """Retorna apenas os campos pedidos da questão (alternative_answers ausente vira lista vazia)."""
+    if fields is None:
+        return question
+    return {field: question.get(field, []) for field in fields}
 
 
 def evaluate(question_id: str, answer: str) -> int:
     """
     Avalia a resposta dada à questão, chamando a função sentence_similarity do
-    módulo natural_language.
+    módulo natural_language. Se a questão tiver respostas alternativas, a resposta é
+    codificada uma única vez e recebe a maior similaridade entre todas as referências.
+    Se config.BATCH_WINDOW_MS for maior que 0, a avaliação é agrupada com outras
+    chamadas concorrentes pelo módulo batching. Se config.INFERENCE_PROCESSES for maior
+    que 0, a inferência roda no pool de processos. Cópias do gabarito e respostas sem
+    conteúdo são decididas pela cascata lexical (módulo lexical), e respostas repetidas
+    são atendidas pelo cache de similaridades, ambos sem chamar o modelo. A submissão é enfileirada no
+    histórico (módulo submissions), gravado em segundo plano, e incorporada às
+    estatísticas da questão (módulo grading_stats).
 
     Args:
         question_id (str): Identificador da questão.
@@ -36,12 +209,144 @@ def evaluate(question_id: str, answer: str) -> int:
         - Caso a questão não seja encontrada, retorna um código de erro (-1).
     """
 
+    prepared = prepare_evaluation(question_id, answer)
+    if isinstance(prepared, int):
+        return prepared
+    texts, references, generation = prepared
+
+    # A etapa similarity inclui a espera pelo lote e a comunicação com os processos de inferência
+    with STAGE_SECONDS.time('similarity'):
+        if config.BATCH_WINDOW_MS > 0:
+            similarity = batcher.submit(answer, references).result()
+        elif config.INFERENCE_PROCESSES > 0:
+            similarity = batch_similarity([answer], references, [len(references)])[0]
+        else:
+            similarity = sentence_similarity(answer, texts, references)
+
+    return finish_evaluation(question_id, answer, similarity, generation)
+
+
+def prepare_evaluation(question_id: str, answer: str) -> int | tuple[list[str], np.ndarray, int]:
+    """
+    Etapas de evaluate anteriores ao cálculo da similaridade: cascata lexical, cache de
+    similaridades e embeddings das referências. Separada para que a rota assíncrona
+    aguarde o lote do micro-batching sem ocupar uma thread (ver finish_evaluation).
+
+    Args:
+        question_id (str): Identificador da questão.
+        answer (str): Resposta dada pelo usuário.
+    Returns:
+        (int | tuple[list[str], np.ndarray, int]): A pontuação, se a resposta foi decidida
+        sem o modelo (ou -1 se a questão não existir); senão, as referências, os seus
+        embeddings e a geração do cache de similaridades, para finish_evaluation.
+    """
+
+    _sync_from_store()
     if question_id not in questions:
         print(f"⚠️ Questão {question_id} não encontrada")
         return -1
 
-    question = questions[question_id]
-    similarity = sentence_similarity(answer, question['correct_answer'])
+    # Lida antes do gabarito: se a questão mudar durante o cálculo, o resultado não é memorizado
+    generation = similarity_cache.generation(question_id)
+    texts = _references(questions[question_id])
+    with STAGE_SECONDS.time('lexical'):
+        similarity = cascade.check(answer, texts)
+    if similarity is not None:
+        return _graded(question_id, answer, similarity)
+    ensure_embeddings()
+
+    with STAGE_SECONDS.time('cache'):
+        similarity = similarity_cache.get(question_id, answer)
+    if similarity is not None:
+        return _graded(question_id, answer, similarity)
+
+    with STAGE_SECONDS.time('reference'):
+        references = embeddings.get_reference_embeddings(question_id, texts)
+    return texts, references, generation
+
+
+def finish_evaluation(question_id: str, answer: str, similarity: float, generation: int) -> int:
+    """
+    Última etapa de evaluate: memoriza a similaridade calculada e a converte em pontuação,
+    registrando a avaliação. Não chama o modelo nem faz E/S (pode rodar no event loop).
+
+    Args:
+        question_id (str): Identificador da questão.
+        answer (str): Resposta dada pelo usuário.
+        similarity (float): Similaridade calculada.
+        generation (int): Geração do cache retornada por prepare_evaluation.
+    Returns:
+        (int): Pontuação obtida (0, 40, 70 ou 100).
+    """
+
+    similarity_cache.put(question_id, answer, similarity, generation)
+    return _graded(question_id, answer, similarity)
+
+
+def evaluate_batch(items: list[tuple[str, str]]) -> list[int]:
+    """
+    Avalia várias respostas de uma só vez, codificando em um único lote do modelo
+    todas as que não forem decididas pela cascata lexical nem estiverem no cache de
+    similaridades.
+
+    Args:
+        items (list[tuple[str, str]]): Pares (question_id, resposta) a serem avaliados.
+    Returns:
+        (list[int]): Pontuação de cada resposta, na mesma ordem de items.
+
+    ## Assertivas de entrada:
+        - Cada question_id deve ser uma string correspondente a um UUID.
+    ## Assertivas de saída:
+        - Cada pontuação pode ser 0, 40, 70, 100 ou -1 caso a questão não exista.
+    """
+
+    _sync_from_store()
+    scores: list[int] = [-1] * len(items)
+    found: list[int] = []
+    for i, (question_id, answer) in enumerate(items):
+        if question_id not in questions:
+            print(f"⚠️ Questão {question_id} não encontrada")
+            continue
+        similarity = cascade.check(answer, _references(questions[question_id]))
+        if similarity is None:
+            similarity = similarity_cache.get(question_id, answer)
+        if similarity is None:
+            found.append(i)
+        else:
+            scores[i] = _graded(question_id, answer, similarity)
+
+    if not found:
+        return scores
+
+    ensure_embeddings()
+    generations = [similarity_cache.generation(items[i][0]) for i in found]
+    references = [(items[i][0], _references(questions[items[i][0]])) for i in found]
+    with STAGE_SECONDS.time('reference'):
+        embeddings.precompute(references)
+        matrices = [embeddings.get_reference_embeddings(qid, texts) for qid, texts in references]
+        counts = [len(matrix) for matrix in matrices]
+
+    with STAGE_SECONDS.time('similarity'):
+        similarities = batch_similarity([items[i][1] for i in found], np.concatenate(matrices),
+                                        None if len(counts) == sum(counts) else counts)
+    for i, generation, similarity in zip(found, generations, similarities):
+        similarity_cache.put(items[i][0], items[i][1], similarity, generation)
+        scores[i] = _graded(items[i][0], items[i][1], similarity)
+    return scores
+
+
+def similarity_to_score(similarity: float) -> int:
+    """
+    Converte a similaridade entre resposta e gabarito em pontuação.
+
+    Args:
+        similarity (float): Similaridade entre 0 e 1.
+    Returns:
+        (int): Pontuação correspondente (0, 40, 70 ou 100).
+
+    ## Assertivas de saída:
+        - Os limites das faixas são 0.20, 0.40 e 0.70.
+    """
 
     if similarity < 0.20:
         return 0
@@ -52,6 +357,15 @@ def evaluate(question_id: str, answer: str) -> int:
     return 100
 
 
+def _graded(question_id: str, answer: str, similarity: float) -> int:
+    """Converte a similaridade em pontuação e registra a avaliação no histórico e nas estatísticas."""
+
+    score = similarity_to_score(similarity)
+    submissions.record(question_id, answer, similarity, score)
+    grading_stats.record(question_id, similarity, score)
+    return score
+
+
 def get_statement(question_id: str) -> str:
     """
     Retorna o enunciado da questão referenciada.
@@ -66,6 +380,7 @@ def get_statement(question_id: str) -> str:
     ## Assertivas de saída:
         - A string de saída não estará vazia.
     """
+    _sync_from_store()
     question = questions[question_id]
     return question['statement']
 
@@ -84,17 +399,40 @@ def get_correct_answer(question_id: str) -> str:
     ## Assertivas de saída:
         - A string de saída não estará vazia.
     """
+    _sync_from_store()
     question = questions[question_id]
     return question['correct_answer']
 
 
-def create_question(statement: str, correct_answer: str) -> int:
+def get_reference_answers(question_id: str) -> list[str]:
+    """
+    Retorna as respostas de referência da questão: o gabarito seguido das alternativas.
+
+    Args:
+        question_id (str): Identificador da questão.
+    Returns:
+        (list[str]): Referências usadas na avaliação, com o gabarito na primeira posição.
+
+    ## Assertivas de entrada:
+        - O parâmetro question_id deve ser uma string única, correspondente a um UUID.
+    ## Assertivas de saída:
+        - Uma questão sem respostas alternativas retorna apenas [gabarito].
+    """
+    _sync_from_store()
+    return _references(questions[question_id])
+
+
+def create_question(statement: str, correct_answer: str, alternative_answers: list[str] | None = None,
+                    statement_embedding: np.ndarray | None = None) -> int:
     """
     Cria uma nova questão e a adiciona ao dicionário de questões.
 
     Args:
         statement (str): Enunciado da questão.
         correct_answer (str): Gabarito da questão.
+        alternative_answers (list[str] | None): Outras formulações aceitas como corretas.
+        statement_embedding (np.ndarray | None): Embedding do enunciado já calculado (ver
+            encode_statement), para não codificá-lo novamente no índice de enunciados.
     Returns:
         (int): Um inteiro indicando o status da operação.
 
@@ -105,16 +443,88 @@ def create_question(statement: str, correct_answer: str) -> int:
     """
     
     question_id: str = str(uuid4())
-    questions[question_id] = {
+    question: dict[str, Any] = {
         'question_id': question_id,
         'statement': statement,
         'correct_answer': correct_answer
     }
+    if alternative_answers:
+        question['alternative_answers'] = list(alternative_answers)
+    with _questions_lock:
+        questions[question_id] = question
+        _store.upsert(question)
+        _index_append(question_id)
+        _bump_version()
+        loaded = _embeddings_ready(question_id)
+    if loaded:
+        embeddings.precompute([(question_id, _references(question))])
+        embeddings.index_statements([(question_id, statement)], statement_embedding)
 
     print(f"✅ Questão {question_id} criada com sucesso")
     return 1
 
 
+def create_questions(items: list[dict[str, Any]]) -> list[str | None]:
+    """
+    Cria várias questões de uma vez (ex.: importação em lote), com uma única gravação
+    no armazenamento e um único lote de embeddings.
+
+    Args:
+        items (list[dict[str, Any]]): Questões com os campos statement e correct_answer e,
+            opcionalmente, alternative_answers e question_id (para preservar os
+            identificadores de uma exportação).
+    Returns:
+        (list[str | None]): Identificador de cada questão criada, na ordem de items, ou
+        None para os itens ignorados.
+
+    ## Assertivas de entrada:
+        - Os campos statement e correct_answer não devem ser strings vazias.
+    ## Assertivas de saída:
+        - Um item cujo question_id já existe no banco (ou se repete em items) é ignorado
+          com um aviso, sem sobrescrever a questão existente.
+    """
+
+    _sync_from_store()
+    created: list[dict[str, Any]] = []
+    ids: list[str | None] = []
+    reused_ids = False
+    with _questions_lock:
+        for item in items:
+            question_id = item.get('question_id') or str(uuid4())
+            # Verificado sob a trava: uma criação concorrente com o mesmo id não é sobrescrita
+            if question_id in questions:
+                print(f"⚠️ Questão {question_id} já existe e foi ignorada")
+                ids.append(None)
+                continue
+            reused_ids = reused_ids or 'question_id' in item
+            questions[question_id] = {
+                'question_id': question_id,
+                'statement': item['statement'],
+                'correct_answer': item['correct_answer']
+            }
+            if item.get('alternative_answers'):
+                questions[question_id]['alternative_answers'] = list(item['alternative_answers'])
+            created.append(questions[question_id])
+            ids.append(question_id)
+            _index_append(question_id)
+        if not created:
+            return ids
+        # Um identificador informado pode ser o de uma questão removida que ainda ocupa o
+        # índice de ordem; a reconstrução elimina a entrada repetida
+        if reused_ids and len(_order_ids) > _order_live:
+            _rebuild_order_index()
+
+        _store.upsert_many(created)
+        _bump_version()
+        loaded = _embeddings_ready(*(q['question_id'] for q in created))
+    if loaded:
+        embeddings.precompute([(q['question_id'], _references(q)) for q in created])
+        embeddings.index_statements([(q['question_id'], q['statement']) for q in created])
+
+    print(f"✅ {len(created)} questões criadas com sucesso")
+    return ids
+
+
 def get_all_questions() -> dict[str, dict[str, str]]:
     """
     Retorna todas as questões cadastradas no dicionário de questões.
@@ -127,10 +537,120 @@ def get_all_questions() -> dict[str, dict[str, str]]:
         - Cada questão é um dicionário contendo os campos question_id, statement e correct_answer, todos strings.
         - O question_id da questão será igual à chave que a identifica.
     """
+    _sync_from_store()
     return questions.copy()
 
 
-def update_question(question_id: str, new_statement: str, new_correct_answer: str) -> int:
+def list_questions(limit: int | None = None, cursor: str | None = None, text: str | None = None,
+                   fields: list[str] | None = None) -> tuple[dict[str, dict[str, str]], str | None]:
+    """
+    Retorna uma página de questões, na ordem de criação, sem copiar o dicionário inteiro.
+
+    Args:
+        limit (int | None): Quantidade máxima de questões na página. Se None, retorna
+            todas a partir do cursor.
+        cursor (str | None): Cursor retornado pela página anterior. Se None, começa do início.
+        text (str | None): Texto que deve aparecer no enunciado (sem diferenciar maiúsculas).
+        fields (list[str] | None): Campos de cada questão a serem retornados. Se None,
+            retorna todos.
+    Returns:
+        (tuple[dict[str, dict[str, str]], str | None]): As questões da página, identificadas
+        por question_id, e o cursor da próxima página (None se esta for a última).
+
+    ## Assertivas de entrada:
+        - limit, se informado, deve ser maior que 0.
+        - fields deve conter apenas valores de QUESTION_FIELDS.
+    ## Assertivas de saída:
+        - Levanta ValueError se o cursor ou algum campo for inválido.
+        - Percorrer todas as páginas retorna cada questão exatamente uma vez.
+    """
+
+    if fields is not None:
+        invalid = [field for field in fields if field not in QUESTION_FIELDS]
+        if invalid:
+            raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+    try:
+        after = None if cursor is None else int(cursor)
+    except ValueError:
+        raise ValueError(f"Cursor inválido: {cursor}")
+
+    _sync_from_store()
+    _ensure_order_index()
+    ids, seqs = _order_ids, _order_seqs
+    start = 0 if after is None else bisect_right(seqs, after)
+    needle = text.casefold() if text else None
+
+    page: dict[str, dict[str, str]] = {}
+    last_seq: int | None = None
+    for i in range(start, len(ids)):
+        question = questions.get(ids[i])
+        if question is None:
+            continue
+        if needle is not None and needle not in question['statement'].casefold():
+            continue
+        if limit is not None and len(page) == limit:
+            return page, str(last_seq)
+        page[ids[i]] = _project(question, fields)
+        last_seq = seqs[i]
+    return page, None
+
+
+def iter_questions(fields: list[str] | None = None) -> Iterator[dict[str, str]]:
+    """
+    Percorre as questões na ordem de criação, uma a uma, sem copiar o banco
+    (ex.: exportação em streaming).
+
+    Args:
+        fields (list[str] | None): Campos de cada questão a serem retornados. Se None,
+            retorna todos.
+    Returns:
+        (Iterator[dict[str, str]]): Questões do banco.
+
+    ## Assertivas de entrada:
+        - fields deve conter apenas valores de QUESTION_FIELDS.
+    ## Assertivas de saída:
+        - Levanta ValueError se algum campo for inválido.
+        - Questões removidas durante a iteração não são retornadas.
+    """
+
+    if fields is not None:
+        invalid = [field for field in fields if field not in QUESTION_FIELDS]
+        if invalid:
+            raise ValueError(f"Campos inválidos: {', '.join(invalid)}")
+
+    _sync_from_store()
+    _ensure_order_index()
+    # A reconstrução do índice troca as listas; a iteração continua com as atuais
+    return _iter_ids(_order_ids, fields)
+
+
+def _iter_ids(ids: list[str], fields: list[str] | None) -> Iterator[dict[str, str]]:
+    for question_id in ids:
+        question = questions.get(question_id)
+        if question is None:
+            continue
+        yield _project(question, fields)
+
+
+def get_version() -> int:
+    """
+    Retorna a versão atual do banco de questões, usada para validar respostas em cache.
+
+    Returns:
+        (int): Número que cresce a cada criação, atualização ou remoção de questão.
+
+    ## Assertivas de saída:
+        - Se o banco não mudou, a versão retornada é a mesma da chamada anterior.
+        - Alterações feitas por outro processo ou diretamente no dicionário também mudam a versão.
+    """
+
+    _sync_from_store()
+    _ensure_order_index()
+    return _version
+
+
+def update_question(question_id: str, new_statement: str, new_correct_answer: str,
+                    new_alternative_answers: list[str] | None = None) -> int:
     """
     Atualiza os dados de uma questão existente no dicionário de questões.
 
@@ -138,6 +658,8 @@ def update_question(question_id: str, new_statement: str, new_correct_answer: st
         question_id (str): Identificador da questão a ser atualizada.
         new_statement (str): Novo enunciado da questão.
         new_correct_answer (str): Novo gabarito da questão.
+        new_alternative_answers (list[str] | None): Novas respostas alternativas (lista
+            vazia remove todas). Se None, as alternativas atuais são mantidas.
     Returns:
         (int): Valor indicando o status da operação. Retorna 1 em caso de sucesso e 0
         em caso de falha (por exemplo, se a questão não for encontrada).
@@ -147,14 +669,42 @@ def update_question(question_id: str, new_statement: str, new_correct_answer: st
         - Os parâmetros new_statement e new_correct_answer não devem ser strings vazias.
     ## Assertivas de saída:
         - Retorna 1 em caso de sucesso e 0 em caso de falha.
+        - Uma atualização que não muda enunciado nem referências não grava a questão
+          nem recalcula embeddings.
     """
 
-    if question_id not in questions:
-        print(f"⚠️ Questão {question_id} não encontrada")
-        return 0
-    
-    questions[question_id]['statement'] = new_statement
-    questions[question_id]['correct_answer'] = new_correct_answer
+    _sync_from_store()
+    with _questions_lock:
+        if question_id not in questions:
+            print(f"⚠️ Questão {question_id} não encontrada")
+            return 0
+
+        question = questions[question_id]
+        old_statement, old_references = question['statement'], _references(question)
+        question['statement'] = new_statement
+        question['correct_answer'] = new_correct_answer
+        if new_alternative_answers is not None:
+            question.pop('alternative_answers', None)
+            if new_alternative_answers:
+                question['alternative_answers'] = list(new_alternative_answers)
+
+        # Só recalcula os embeddings e descarta as similaridades do que de fato mudou
+        references = _references(question)
+        statement_changed = new_statement != old_statement
+        references_changed = references != old_references
+        if not statement_changed and not references_changed:
+            print(f"✅ Questão {question_id} sem alterações")
+            return 1
+        _store.upsert(question)
+        _bump_version()
+        loaded = _embeddings_ready(question_id)
+    if loaded:
+        if references_changed:
+            embeddings.precompute([(question_id, references)])
+        if statement_changed:
+            embeddings.index_statements([(question_id, new_statement)])
+    if references_changed:
+        similarity_cache.invalidate(question_id)
 
     print(f"✅ Questão {question_id} atualizada com sucesso")
     return 1
@@ -176,42 +726,238 @@ def delete_question(question_id: str) -> int:
         - Retorna 1 em caso de sucesso e 0 em caso de falha.
     """
 
-    if question_id not in questions:
-        print(f"⚠️ Questão {question_id} não encontrada")
-        return 0
-    
-    del questions[question_id]
+    _sync_from_store()
+    with _questions_lock:
+        if question_id not in questions:
+            print(f"⚠️ Questão {question_id} não encontrada")
+            return 0
+
+        del questions[question_id]
+        _store.delete(question_id)
+        _index_remove()
+        _bump_version()
+        embeddings.invalidate(question_id)
+        _embeddings_ready(question_id)
+    similarity_cache.invalidate(question_id)
+    grading_stats.forget(question_id)
 
     print(f"✅ Questão {question_id} removida com sucesso")
     return 1
 
 
+def get_question_stats(question_id: str) -> dict[str, object] | None:
+    """
+    Retorna as estatísticas de avaliação de uma questão, mantidas incrementalmente
+    pelo módulo grading_stats (sem reprocessar o histórico de submissões).
+
+    Args:
+        question_id (str): Identificador da questão.
+    Returns:
+        (dict[str, object] | None): Objeto contendo question_id, attempts, scores (contagem
+        por pontuação), mean_score, similarity (mean, std, histogram) e last_attempt_at,
+        ou None se a questão não existir.
+    """
+
+    _sync_from_store()
+    if question_id not in questions:
+        return None
+    return {'question_id': question_id, **grading_stats.get(question_id)}
+
+
+def get_bank_stats(k: int = 5) -> dict[str, object]:
+    """
+    Retorna as estatísticas de avaliação de todo o banco de questões.
+
+    Args:
+        k (int): Quantidade de questões listadas em hardest.
+    Returns:
+        (dict[str, object]): Agregados de todas as avaliações das questões existentes,
+        mais questions, answered e hardest (ver GradingStats.summary).
+    """
+
+    _sync_from_store()
+    return grading_stats.summary(list(questions), k)
+
+
+def get_similar_questions(question_id: str, k: int = 5) -> list[dict[str, str | float]] | None:
+    """
+    Retorna as questões cujo enunciado é mais parecido com o da questão informada,
+    consultando o índice de enunciados do módulo embeddings.
+
+    Args:
+        question_id (str): Identificador da questão.
+        k (int): Quantidade máxima de questões retornadas.
+    Returns:
+        (list[dict[str, str | float]] | None): Questões com os campos question_id, statement
+        e similarity, em ordem decrescente de similaridade, ou None se a questão não existir.
+
+    ## Assertivas de entrada:
+        - k deve ser maior que 0.
+    ## Assertivas de saída:
+        - A própria questão não aparece no resultado.
+    """
+
+    _sync_from_store()
+    if question_id not in questions:
+        print(f"⚠️ Questão {question_id} não encontrada")
+        return None
+
+    ensure_embeddings()
+    return [
+        {'question_id': qid, 'statement': questions[qid]['statement'], 'similarity': similarity}
+        for qid, similarity in embeddings.similar_statements(question_id, k)
+        if qid in questions
+    ]
+
+
+def encode_statement(statement: str) -> np.ndarray | None:
+    """
+    Codifica um enunciado uma única vez, para uso em find_duplicates e create_question.
+
+    Args:
+        statement (str): Enunciado de uma questão prestes a ser criada.
+    Returns:
+        (np.ndarray | None): Embedding do enunciado, ou None se os embeddings ainda não
+        estiverem carregados (o CRUD nunca espera pelo modelo).
+    """
+
+    if not statement or not _embeddings_loaded:
+        return None
+    return embeddings.encode_statement(statement)
+
+
+def find_duplicates(statement: str, threshold: float | None = None, k: int = 5,
+                    embedding: np.ndarray | None = None) -> list[str] | None:
+    """
+    Procura questões cadastradas cujo enunciado é quase igual ao informado. A verificação
+    é feita apenas se os embeddings já estiverem carregados, para que o CRUD nunca
+    espere pelo modelo; caso contrário, retorna None para que a omissão seja informada.
+
+    Args:
+        statement (str): Enunciado de uma questão (ex.: uma questão prestes a ser criada).
+        threshold (float | None): Similaridade mínima. Se None, usa config.DUPLICATE_THRESHOLD.
+        k (int): Quantidade máxima de questões retornadas.
+        embedding (np.ndarray | None): Embedding do enunciado já calculado (ver encode_statement).
+    Returns:
+        (list[str] | None): Identificadores das possíveis duplicatas, da mais para a menos
+        similar, ou None se a verificação não foi feita (embeddings ainda não carregados).
+    """
+
+    if not statement:
+        return []
+    if not _embeddings_loaded:
+        return None
+    threshold = config.DUPLICATE_THRESHOLD if threshold is None else threshold
+    _sync_from_store()
+    return [
+        qid for qid, similarity in embeddings.search_statements(statement, k, embedding)
+        if similarity >= threshold and qid in questions
+    ]
+
+
+def search_questions(text: str, k: int = 10) -> list[dict[str, str | float]]:
+    """
+    Busca semântica no banco de questões: codifica o texto com o mesmo modelo da
+    avaliação e retorna as questões cujo enunciado ou gabarito é mais parecido.
+
+    Args:
+        text (str): Texto consultado (ex.: um tema).
+        k (int): Quantidade máxima de questões retornadas.
+    Returns:
+        (list[dict[str, str | float]]): Questões com os campos question_id, statement e
+        similarity, em ordem decrescente de similaridade.
+
+    ## Assertivas de entrada:
+        - text não deve ser uma string vazia e k deve ser maior que 0.
+    """
+
+    _sync_from_store()
+    ensure_embeddings()
+    return [
+        {'question_id': qid, 'statement': questions[qid]['statement'], 'similarity': similarity}
+        for qid, similarity in embeddings.search_questions(text, k)
+        if qid in questions
+    ]
+
+
 def save_questions_to_json():
     """
-    Salva o dicionário de questões no arquivo questions.json.
+    Salva o dicionário de questões no armazenamento configurado, junto com os
+    embeddings dos gabaritos e dos enunciados. No armazenamento JSON, reescreve o arquivo questions.json;
+    no SQLite, as questões já foram gravadas a cada alteração.
 
     ## Assertivas de saída:
-        - As questões do dicionário serão salvas no arquivo questions.json.
+        - As questões do dicionário estarão salvas no armazenamento configurado.
+        - Os embeddings dos gabaritos e dos enunciados serão salvos na pasta data, se
+          tiverem sido carregados neste processo.
     """
-    question_list = list(questions.values())
-    with open('data/questions.json', 'w', encoding='utf-8') as f:
-        json.dump(question_list, f, indent=4, ensure_ascii=False)
-    print("✅ Questões salvas em questions.json")
+    _store.snapshot(list(questions.values()))
+    if _embeddings_loaded:
+        embeddings.save_embeddings()
 
 
-def load_questions_from_json():
+def load_questions_from_json(precompute: bool = True):
+    """
+    Abre o armazenamento configurado em config.STORAGE (arquivo questions.json com o
+    log de alterações reaplicado, ou banco SQLite), preenche o dicionário de questões com os seus dados e calcula os
+    embeddings dos gabaritos e dos enunciados que não estiverem salvos.
+
+    Args:
+        precompute (bool): Se False, os embeddings não são calculados aqui e devem ser
+            calculados depois com precompute_embeddings (ex.: no aquecimento em segundo plano).
+
+    ## Assertivas de saída:
+        - O dicionário questions será preenchido com as questões armazenadas (se existirem).
+        - As alterações seguintes serão gravadas no armazenamento aberto.
+        - Todas as questões carregadas terão o embedding do gabarito em cache e o enunciado indexado.
     """
-    Preenche o dicionário de questões com os dados do arquivo questions.json.
+    global _store
+    _store.close()
+    _store = open_store()
+
+    question_list = _store.load_all()
+    if not question_list:
+        return
+    with _questions_lock:
+        for question in question_list:
+            question_id = question['question_id']
+            questions[question_id] = question
+        _rebuild_order_index()
+    print("✅ Questões carregadas com sucesso")
+
+    if precompute:
+        precompute_embeddings()
+
+
+def precompute_embeddings():
+    """
+    Carrega os embeddings salvos e calcula os que faltarem para as questões carregadas.
+
+    O banco é calculado a partir de um retrato, tirado sob _questions_lock: o CRUD continua
+    durante o cálculo, e as questões alteradas nesse meio tempo são reindexadas ao final.
 
     ## Assertivas de saída:
-        - O dicionário questions será preenchido com os dados do arquivo questions.json (se existir).
+        - Todas as questões terão o embedding do gabarito em cache e o enunciado indexado,
+          inclusive as criadas ou atualizadas durante o cálculo.
+        - Criações e atualizações seguintes passam a atualizar os embeddings na hora.
     """
+    global _embeddings_loaded, _pending_embeddings
+    with _questions_lock:
+        snapshot = [dict(q) for q in questions.values()]
+        _pending_embeddings = set()
     try:
-        with open('data/questions.json', 'r', encoding='utf-8') as f:
-            question_list = json.load(f)
-            for question in question_list:
-                question_id = question['question_id']
-                questions[question_id] = question
-            print("✅ Questões carregadas com sucesso")
-    except FileNotFoundError:
-        print("⚠️ Falha ao carregar as questões: questions.json não encontrado")
\ No newline at end of file
+        embeddings.load_embeddings()
+        embeddings.prune({q['question_id'] for q in snapshot})
+        embeddings.precompute([(q['question_id'], _references(q)) for q in snapshot])
+        embeddings.index_statements([(q['question_id'], q['statement']) for q in snapshot])
+
+        with _questions_lock:
+            changed = [questions[qid] for qid in _pending_embeddings if qid in questions]
+            for question_id in _pending_embeddings - questions.keys():
+                embeddings.invalidate(question_id)
+            if changed:
+                embeddings.precompute([(q['question_id'], _references(q)) for q in changed])
+                embeddings.index_statements([(q['question_id'], q['statement']) for q in changed])
+            _embeddings_loaded = True
+    finally:
+        _pending_embeddings = None
@@ -0,0 +1,173 @@
+# similarity_cache.py
+
+import unicodedata
+from collections import OrderedDict
+from threading import Lock
+
+import config
+from natural_language import model_version
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["SimilarityCache", "normalize_answer", "similarity_cache"]
+
+# Chave do cache: (question_id, resposta normalizada, versão do modelo)
+_Key = tuple[str, str, str]
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    Normaliza uma resposta para uso como chave do cache: forma Unicode NFC, sem
+    espaços nas pontas e com espaços internos colapsados. Maiúsculas são mantidas,
+    pois o modelo diferencia maiúsculas de minúsculas.
+
+    Args:
+        answer (str): Resposta do usuário.
+    Returns:
+        (str): Resposta normalizada.
+    """
+
+    return ' '.join(unicodedata.normalize('NFC', answer).split())
+
+
+class SimilarityCache:
+    """
+    Cache LRU de similaridades, identificadas por questão, resposta normalizada e
+    versão do modelo, com contadores de acertos e falhas.
+
+    Cada questão tem uma geração, incrementada por invalidate. Quem calcula uma
+    similaridade lê a geração antes de ler o gabarito e a informa em put: se a questão
+    for alterada no meio do cálculo, o resultado (feito com o gabarito antigo) é descartado.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Args:
+            max_size (int): Quantidade máxima de entradas. Se 0, nada é armazenado.
+
+        ## Assertivas de entrada:
+            - max_size deve ser maior ou igual a 0.
+        """
+
+        self.max_size = max_size
+        self._entries: OrderedDict[_Key, float] = OrderedDict()
+        self._by_question: dict[str, set[_Key]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, question_id: str, answer: str) -> float | None:
+        """
+        Retorna a similaridade memorizada para a resposta, se existir.
+
+        Args:
+            question_id (str): Identificador da questão.
+            answer (str): Resposta do usuário.
+        Returns:
+            (float | None): Similaridade memorizada, ou None em caso de falha.
+        """
+
+        key = (question_id, normalize_answer(answer), model_version())
+        with self._lock:
+            similarity = self._entries.get(key)
+            if similarity is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return similarity
+
+    def generation(self, question_id: str) -> int:
+        """
+        Retorna a geração atual da questão, a ser lida antes do gabarito e repassada a put.
+
+        Args:
+            question_id (str): Identificador da questão.
+        Returns:
+            (int): Quantidade de invalidações da questão até o momento.
+        """
+
+        with self._lock:
+            return self._generations.get(question_id, 0)
+
+    def put(self, question_id: str, answer: str, similarity: float, generation: int) -> None:
+        """
+        Memoriza a similaridade de uma resposta, descartando a entrada usada há mais tempo
+        se o cache estiver cheio.
+
+        Args:
+            question_id (str): Identificador da questão.
+            answer (str): Resposta do usuário.
+            similarity (float): Similaridade calculada.
+            generation (int): Geração da questão lida antes do gabarito (ver generation).
+
+        ## Assertivas de saída:
+            - Se a questão foi invalidada depois de generation, nada é memorizado.
+        """
+
+        if self.max_size <= 0:
+            return
+
+        key = (question_id, normalize_answer(answer), model_version())
+        with self._lock:
+            if self._generations.get(question_id, 0) != generation:
+                return
+            self._entries[key] = similarity
+            self._entries.move_to_end(key)
+            self._by_question.setdefault(question_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                old_key, _ = self._entries.popitem(last=False)
+                self._discard_index(old_key)
+
+    def invalidate(self, question_id: str) -> None:
+        """
+        Remove todas as similaridades memorizadas de uma questão.
+
+        Args:
+            question_id (str): Identificador da questão.
+        """
+
+        with self._lock:
+            self._generations[question_id] = self._generations.get(question_id, 0) + 1
+            for key in self._by_question.pop(question_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas e zera os contadores."""
+
+        with self._lock:
+            self._entries.clear()
+            self._by_question.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            (dict[str, int | float]): Objeto contendo size, max_size, hits, misses e hit_rate.
+        """
+
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0,
+            }
+
+    def _discard_index(self, key: _Key) -> None:
+        """Remove a chave do índice por questão."""
+
+        keys = self._by_question.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_question[key[0]]
+
+
+similarity_cache: SimilarityCache = SimilarityCache(config.SIMILARITY_CACHE_SIZE)
+"""Instância compartilhada pelo processo, com tamanho definido por config.SIMILARITY_CACHE_SIZE."""
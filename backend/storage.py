@@ -0,0 +1,441 @@
+# storage.py
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from threading import Lock, Thread
+from typing import IO
+
+import config
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["QuestionStore", "JsonStore", "SqliteStore", "open_store", "QUESTIONS_PATH", "QUESTIONS_LOG_PATH"]
+
+QUESTIONS_PATH: str = 'data/questions.json'
+QUESTIONS_LOG_PATH: str = 'data/questions.log'
+
+
+class QuestionStore(ABC):
+    """
+    Interface de armazenamento persistente do banco de questões. O dicionário
+    question.questions continua sendo a cópia em memória; cada alteração feita por
+    question.py é repassada ao armazenamento por upsert e delete, que toda
+    implementação precisa definir.
+    """
+
+    @abstractmethod
+    def load_all(self) -> list[dict[str, str]]:
+        """Retorna todas as questões armazenadas, na ordem de criação."""
+
+    @abstractmethod
+    def upsert(self, question: dict[str, str]) -> None:
+        """Grava uma questão nova ou atualizada."""
+
+    def upsert_many(self, question_list: list[dict[str, str]]) -> None:
+        """Grava várias questões de uma vez (ex.: importação em lote)."""
+        for question in question_list:
+            self.upsert(question)
+
+    @abstractmethod
+    def delete(self, question_id: str) -> None:
+        """Remove uma questão."""
+
+    def snapshot(self, question_list: list[dict[str, str]]) -> None:
+        """Grava o banco completo (chamado no encerramento da aplicação)."""
+
+    def has_external_changes(self) -> bool:
+        """Indica se outro processo alterou o banco desde a última leitura."""
+        return False
+
+    def close(self) -> None:
+        """Libera os recursos do armazenamento."""
+
+
+class JsonStore(QuestionStore):
+    """
+    Armazenamento em um arquivo JSON (snapshot) mais um log de alterações.
+
+    Com log_path informado, cada alteração é anexada ao log (uma linha JSON por alteração)
+    e sincronizada em disco com fsync, em O(1). Ao carregar, o log é reaplicado sobre o
+    snapshot. Quando o log passa de compact_threshold linhas, ele é rotacionado e
+    incorporado a um novo snapshot em segundo plano.
+    """
+
+    def __init__(self, path: str = QUESTIONS_PATH, log_path: str | None = None,
+                 compact_threshold: int = 1000):
+        """
+        Args:
+            path (str): Caminho do arquivo JSON (snapshot).
+            log_path (str | None): Caminho do log de alterações. Se None, as alterações
+                só são gravadas no snapshot.
+            compact_threshold (int): Quantidade de linhas do log que dispara a compactação.
+        """
+        self.path = path
+        self.log_path = log_path
+        self.compact_threshold = compact_threshold
+        self._log: IO[str] | None = None
+        self._log_lines = 0
+        self._lock = Lock()
+        self._compaction: Thread | None = None
+
+    def load_all(self) -> list[dict[str, str]]:
+        """
+        Lê as questões do snapshot JSON e reaplica o log de alterações, se existir.
+
+        Returns:
+            (list[dict[str, str]]): Questões armazenadas, ou lista vazia se não houver nenhuma.
+
+        ## Assertivas de saída:
+            - Levanta json.JSONDecodeError se o snapshot estiver corrompido.
+            - Uma última linha incompleta no log (gravação interrompida) é ignorada.
+        """
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                question_list = json.load(f)
+        except FileNotFoundError:
+            question_list = []
+            if not self._has_log():
+                print("⚠️ Falha ao carregar as questões: questions.json não encontrado")
+                return []
+
+        if not self._has_log():
+            return question_list
+
+        by_id = {q['question_id']: q for q in question_list}
+        # Um log rotacionado ainda existente indica uma compactação interrompida
+        for path in (self._rotated_path(), self.log_path):
+            if path is not None and os.path.exists(path):
+                _replay(path, by_id)
+        return list(by_id.values())
+
+    def upsert(self, question: dict[str, str]) -> None:
+        self._append({'op': 'upsert', 'question': question})
+
+    def upsert_many(self, question_list: list[dict[str, str]]) -> None:
+        """Anexa todas as questões ao log com uma única sincronização em disco."""
+        self._append(*({'op': 'upsert', 'question': question} for question in question_list))
+
+    def delete(self, question_id: str) -> None:
+        self._append({'op': 'delete', 'question_id': question_id})
+
+    def snapshot(self, question_list: list[dict[str, str]]) -> None:
+        """
+        Grava o banco completo no arquivo JSON e, em seguida, descarta o log de alterações,
+        já incorporado ao snapshot.
+        """
+
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+
+        with self._lock:
+            self._write_snapshot(question_list)
+            if self.log_path is not None:
+                if self._log is not None:
+                    self._log.close()
+                    self._log = None
+                for path in (self._rotated_path(), self.log_path):
+                    if path is not None and os.path.exists(path):
+                        os.remove(path)
+                self._log_lines = 0
+        print("✅ Questões salvas em questions.json")
+
+    def close(self) -> None:
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _has_log(self) -> bool:
+        """Indica se existe log de alterações (atual ou rotacionado) a reaplicar."""
+        if self.log_path is None:
+            return False
+        return os.path.exists(self.log_path) or os.path.exists(self._rotated_path() or '')
+
+    def _rotated_path(self) -> str | None:
+        return None if self.log_path is None else self.log_path + '.1'
+
+    def _append(self, *entries: dict[str, object]) -> None:
+        """Anexa as alterações ao log e as sincroniza em disco (um único fsync)."""
+
+        if self.log_path is None:
+            return
+
+        lines = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+        if not lines:
+            return
+        with self._lock:
+            if self._log is None:
+                # Uma linha incompleta de uma queda anterior não pode receber a próxima alteração
+                _truncate_partial_line(self.log_path)
+                self._log_lines = _count_lines(self.log_path)
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            self._log.write(lines)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log_lines += len(entries)
+
+            if self._log_lines >= self.compact_threshold and self._compaction is None:
+                self._rotate()
+
+    def _rotate(self) -> None:
+        """
+        Move o log atual para o log rotacionado e inicia a compactação em segundo plano.
+        Deve ser chamado com self._lock adquirido.
+        """
+
+        assert self._log is not None and self.log_path is not None
+        rotated = self._rotated_path()
+        assert rotated is not None
+        if os.path.exists(rotated):
+            # Sobra de uma compactação interrompida ou que falhou: precisa ser incorporada
+            # ao snapshot antes de ser substituída pelo log atual
+            try:
+                self._merge_into_snapshot(rotated)
+            except Exception as e:
+                print(f"⚠️ Falha ao compactar o log rotacionado pendente: {e}")
+                return
+        self._log.close()
+        os.replace(self.log_path, rotated)
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+        self._log_lines = 0
+        self._compaction = Thread(target=self._compact, name="questions-log-compaction", daemon=True)
+        self._compaction.start()
+
+    def _compact(self) -> None:
+        """Incorpora o log rotacionado a um novo snapshot e o remove."""
+
+        rotated = self._rotated_path()
+        assert rotated is not None
+        try:
+            self._merge_into_snapshot(rotated)
+        except Exception as e:
+            # O log rotacionado é mantido e incorporado na próxima rotação
+            print(f"⚠️ Falha ao compactar o log de alterações: {e}")
+        finally:
+            self._compaction = None
+
+    def _merge_into_snapshot(self, rotated: str) -> None:
+        """Reaplica um log rotacionado sobre o snapshot, grava o resultado e remove o log."""
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                by_id = {q['question_id']: q for q in json.load(f)}
+        except FileNotFoundError:
+            by_id = {}
+        _replay(rotated, by_id)
+        self._write_snapshot(list(by_id.values()))
+        os.remove(rotated)
+        print("✅ Log de alterações compactado em questions.json")
+
+    def _write_snapshot(self, question_list: list[dict[str, str]]) -> None:
+        """Grava o snapshot de forma atômica (arquivo temporário + rename)."""
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(question_list, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def _replay(path: str, by_id: dict[str, dict[str, str]]) -> None:
+    """
+    Reaplica as alterações de um log sobre o dicionário de questões.
+
+    ## Assertivas de saída:
+        - Uma última linha inválida (gravação interrompida antes do fsync) é ignorada.
+        - Uma linha inválida no meio do log é ignorada com um aviso, e as seguintes são reaplicadas.
+    """
+
+    invalid: int | None = None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for number, line in enumerate(f, 1):
+            if invalid is not None:
+                print(f"⚠️ Linha {invalid} inválida ignorada em {path}")
+                invalid = None
+            try:
+                entry = json.loads(line)
+                if entry['op'] == 'upsert':
+                    question = entry['question']
+                    by_id[question['question_id']] = question
+                elif entry['op'] == 'delete':
+                    by_id.pop(entry['question_id'], None)
+            except (json.JSONDecodeError, KeyError, TypeError):
+                invalid = number
+
+
+def _truncate_partial_line(path: str) -> None:
+    """Remove do fim do arquivo uma linha sem '\\n' final, deixada por uma gravação interrompida."""
+
+    try:
+        f = open(path, 'rb+')
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - 4096, 0)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            f.truncate(position)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _count_lines(path: str) -> int:
+    """Conta as linhas de um arquivo (0 se ele não existir)."""
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+class SqliteStore(QuestionStore):
+    """
+    Armazenamento em SQLite (modo WAL), com a tabela indexada por question_id.
+    Cada alteração é gravada imediatamente em sua própria transação. As respostas
+    alternativas ficam em uma coluna com a lista em JSON (NULL se não houver).
+    """
+
+    _CREATE = (
+        "CREATE TABLE IF NOT EXISTS questions ("
+        " question_id TEXT PRIMARY KEY,"
+        " statement TEXT NOT NULL,"
+        " correct_answer TEXT NOT NULL,"
+        " alternative_answers TEXT)"
+    )
+    _SELECT_ALL = "SELECT question_id, statement, correct_answer, alternative_answers FROM questions ORDER BY rowid"
+    _UPSERT = (
+        "INSERT INTO questions (question_id, statement, correct_answer, alternative_answers) VALUES (?, ?, ?, ?)"
+        " ON CONFLICT(question_id) DO UPDATE SET"
+        " statement = excluded.statement, correct_answer = excluded.correct_answer,"
+        " alternative_answers = excluded.alternative_answers"
+    )
+    _DELETE = "DELETE FROM questions WHERE question_id = ?"
+    _COUNT = "SELECT COUNT(*) FROM questions"
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Caminho do arquivo do banco.
+
+        ## Assertivas de saída:
+            - O arquivo e a tabela questions são criados se não existirem.
+        """
+
+        self.path = path
+        self._lock = Lock()
+        # A conexão é compartilhada pelas threads da API e protegida por self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(self._CREATE)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(questions)")}
+        if 'alternative_answers' not in columns:
+            # Bancos criados antes das respostas alternativas
+            self._conn.execute("ALTER TABLE questions ADD COLUMN alternative_answers TEXT")
+        self._data_version = self._read_data_version()
+
+    def load_all(self) -> list[dict[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(self._SELECT_ALL).fetchall()
+            self._data_version = self._read_data_version()
+        question_list = []
+        for question_id, statement, correct_answer, alternative_answers in rows:
+            question = {'question_id': question_id, 'statement': statement, 'correct_answer': correct_answer}
+            if alternative_answers is not None:
+                question['alternative_answers'] = json.loads(alternative_answers)
+            question_list.append(question)
+        return question_list
+
+    def upsert(self, question: dict[str, str]) -> None:
+        with self._lock:
+            self._conn.execute(self._UPSERT, _row(question))
+
+    def delete(self, question_id: str) -> None:
+        with self._lock:
+            self._conn.execute(self._DELETE, (question_id,))
+
+    def upsert_many(self, question_list: list[dict[str, str]]) -> None:
+        self.insert_many(question_list)
+
+    def insert_many(self, question_list: list[dict[str, str]]) -> None:
+        """
+        Grava várias questões em uma única transação (ex.: importação do questions.json).
+
+        Args:
+            question_list (list[dict[str, str]]): Questões a serem gravadas.
+        """
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(self._UPSERT, [_row(q) for q in question_list])
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def count(self) -> int:
+        """Retorna a quantidade de questões armazenadas."""
+
+        with self._lock:
+            return self._conn.execute(self._COUNT).fetchone()[0]
+
+    def has_external_changes(self) -> bool:
+        # data_version muda apenas quando outra conexão confirma uma transação
+        with self._lock:
+            return self._read_data_version() != self._data_version
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _row(question: dict[str, str]) -> tuple[str, str, str, str | None]:
+    """Valores de uma questão na ordem das colunas da tabela questions."""
+    alternatives = question.get('alternative_answers')
+    return (question['question_id'], question['statement'], question['correct_answer'],
+            json.dumps(alternatives, ensure_ascii=False) if alternatives else None)
+
+
+def open_store() -> QuestionStore:
+    """
+    Abre o armazenamento configurado em config.STORAGE.
+
+    Returns:
+        (QuestionStore): JsonStore ou SqliteStore.
+
+    ## Assertivas de saída:
+        - Com 'json', as alterações são gravadas no log data/questions.log.
+        - Com 'sqlite', um banco vazio é preenchido com o conteúdo de questions.json (se existir).
+        - Levanta ValueError se config.STORAGE não for 'json' nem 'sqlite'.
+    """
+
+    if config.STORAGE == 'json':
+        return JsonStore(QUESTIONS_PATH, QUESTIONS_LOG_PATH, config.LOG_COMPACT_THRESHOLD)
+    if config.STORAGE == 'sqlite':
+        store = SqliteStore(config.SQLITE_PATH)
+        if store.count() == 0 and os.path.exists(QUESTIONS_PATH):
+            store.insert_many(JsonStore(QUESTIONS_PATH, QUESTIONS_LOG_PATH).load_all())
+            print(f"✅ Questões de questions.json importadas para {config.SQLITE_PATH}")
+        return store
+    raise ValueError(f"Armazenamento desconhecido: {config.STORAGE} (opções: json, sqlite)")
@@ -0,0 +1,337 @@
+# submissions.py
+
+import json
+import os
+import sqlite3
+import time
+from queue import Queue, Empty, Full
+from threading import Event, Lock, Thread
+from typing import IO
+
+import config
+from natural_language import model_version
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["SubmissionLog", "submissions"]
+
+# Item da fila: submissão a gravar, Event de um flush() aguardando ou None (encerramento)
+_Item = dict[str, object] | Event | None
+
+# Espera máxima do encerramento pela thread gravadora, em segundos
+_STOP_TIMEOUT: float = 30.0
+
+# Intervalo entre as verificações de que a thread gravadora continua ativa, em segundos
+_ALIVE_POLL: float = 0.1
+
+
+class SubmissionLog:
+    """
+    Histórico das respostas avaliadas, gravado por uma thread dedicada com group commit.
+
+    record apenas enfileira a submissão (sem E/S no caminho da avaliação). A thread
+    gravadora junta as submissões que chegarem em até flush_ms milissegundos, ou até
+    max_batch_size delas, e as grava com uma única sincronização em disco: um fsync no
+    arquivo NDJSON ('json') ou uma transação no SQLite ('sqlite').
+    """
+
+    _CREATE = (
+        "CREATE TABLE IF NOT EXISTS submissions ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " question_id TEXT NOT NULL,"
+        " answer TEXT NOT NULL,"
+        " similarity REAL NOT NULL,"
+        " score INTEGER NOT NULL,"
+        " model TEXT NOT NULL,"
+        " created_at REAL NOT NULL)"
+    )
+    _CREATE_INDEX = "CREATE INDEX IF NOT EXISTS submissions_question_id ON submissions (question_id)"
+    _INSERT = (
+        "INSERT INTO submissions (question_id, answer, similarity, score, model, created_at)"
+        " VALUES (:question_id, :answer, :similarity, :score, :model, :created_at)"
+    )
+
+    def __init__(self, storage: str, path: str, flush_ms: float, max_batch_size: int,
+                 max_pending: int = 100_000):
+        """
+        Args:
+            storage (str): 'json' (NDJSON, uma submissão por linha), 'sqlite' ou 'off'.
+            path (str): Arquivo do histórico.
+            flush_ms (float): Tempo máximo que uma submissão espera pela gravação, em milissegundos.
+            max_batch_size (int): Quantidade máxima de submissões por gravação.
+            max_pending (int): Submissões aguardando gravação; acima disso, as novas são descartadas.
+
+        ## Assertivas de entrada:
+            - flush_ms deve ser maior ou igual a 0 e max_batch_size maior que 0.
+        """
+
+        self.storage = storage
+        self.path = path
+        self.flush_ms = flush_ms
+        self.max_batch_size = max_batch_size
+        self._queue: Queue[_Item] = Queue(max_pending)
+        self._thread: Thread | None = None
+        self._failed = False
+        self._lock = Lock()
+
+        self._written = 0
+        self._flushes = 0
+        self._dropped = 0
+        self._errors = 0
+
+    def start(self) -> None:
+        """
+        Inicia a thread gravadora (chamado no lifespan da aplicação).
+
+        ## Assertivas de saída:
+            - Levanta ValueError se storage não for 'json', 'sqlite' nem 'off'.
+            - Com 'off', nada é iniciado e record não grava nada.
+        """
+
+        if self.storage not in ('json', 'sqlite', 'off'):
+            raise ValueError(f"Armazenamento de submissões desconhecido: {self.storage} (opções: json, sqlite, off)")
+        if self.storage == 'off':
+            return
+        with self._lock:
+            if self._thread is None:
+                self._failed = False
+                self._thread = Thread(target=self._run, name="submission-log", daemon=True)
+                self._thread.start()
+
+    def _alive(self) -> Thread | None:
+        """Thread gravadora, se estiver em execução (None se parada ou encerrada por falha)."""
+        thread = self._thread
+        return thread if thread is not None and thread.is_alive() else None
+
+    def record(self, question_id: str, answer: str, similarity: float, score: int) -> None:
+        """
+        Enfileira uma resposta avaliada para gravação. Não bloqueia: se a thread gravadora
+        não estiver ativa, ou se a fila estiver cheia, a submissão é descartada.
+
+        Args:
+            question_id (str): Identificador da questão.
+            answer (str): Resposta do usuário.
+            similarity (float): Similaridade obtida.
+            score (int): Pontuação obtida.
+        """
+
+        if self._alive() is None:
+            return
+        try:
+            self._queue.put_nowait({
+                'question_id': question_id,
+                'answer': answer,
+                'similarity': float(similarity),
+                'score': score,
+                'model': model_version(),
+                'created_at': time.time(),
+            })
+        except Full:
+            with self._lock:
+                self._dropped += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Aguarda a gravação de todas as submissões enfileiradas até o momento.
+
+        Args:
+            timeout (float | None): Tempo máximo de espera, em segundos.
+        Returns:
+            (bool): True se as submissões foram gravadas (ou se a thread não tiver sido
+            iniciada); False se o tempo acabar ou se a thread gravadora tiver parado por falha.
+        """
+
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def wait_slice() -> float:
+            # Esperas curtas: se a thread gravadora parar por falha, flush não fica preso
+            return _ALIVE_POLL if deadline is None else min(_ALIVE_POLL, deadline - time.monotonic())
+
+        done = Event()
+        while True:
+            wait = wait_slice()
+            if self._alive() is None or wait <= 0:
+                return False
+            try:
+                self._queue.put(done, timeout=wait)
+                break
+            except Full:
+                continue
+        while not done.wait(max(wait_slice(), 0)):
+            if self._alive() is None or wait_slice() <= 0:
+                break
+        return done.is_set() and not self._failed
+
+    def stats(self) -> dict[str, int]:
+        """
+        Retorna os contadores do histórico.
+
+        Returns:
+            (dict[str, int]): Objeto contendo:
+                - written (int): submissões gravadas.
+                - flushes (int): gravações (sincronizações em disco) realizadas.
+                - pending (int): submissões aguardando gravação.
+                - dropped (int): submissões descartadas com a fila cheia.
+                - errors (int): submissões perdidas por falha na gravação.
+        """
+
+        with self._lock:
+            return {
+                'written': self._written,
+                'flushes': self._flushes,
+                'pending': self._queue.qsize(),
+                'dropped': self._dropped,
+                'errors': self._errors,
+            }
+
+    def stop(self) -> None:
+        """
+        Grava as submissões pendentes e encerra a thread gravadora.
+
+        ## Assertivas de saída:
+            - Retorna em até _STOP_TIMEOUT segundos, mesmo se a thread gravadora tiver parado
+              por falha ou não conseguir esvaziar a fila.
+        """
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=_STOP_TIMEOUT)
+        except Full:
+            print(f"⚠️ Fila de submissões cheia no encerramento; gravação de {self.path} interrompida")
+            return
+        thread.join(_STOP_TIMEOUT)
+        if thread.is_alive():
+            print(f"⚠️ A gravação de submissões em {self.path} não terminou em {_STOP_TIMEOUT:.0f} s")
+
+    def _run(self) -> None:
+        """Laço da thread: junta as submissões da fila e as grava em lotes."""
+
+        conn: sqlite3.Connection | None = None
+        log: IO[str] | None = None
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if self.storage == 'sqlite':
+                # A conexão pertence à thread gravadora; nenhuma outra thread a usa
+                conn = sqlite3.connect(self.path, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=FULL")
+                conn.execute(self._CREATE)
+                conn.execute(self._CREATE_INDEX)
+            else:
+                log = open(self.path, 'a', encoding='utf-8')
+        except Exception as e:
+            # A thread termina (record passa a descartar) e ninguém fica esperando por ela
+            print(f"⚠️ Falha ao abrir o histórico de submissões em {self.path}: {e}")
+            self._failed = True
+            if conn is not None:
+                conn.close()
+            self._discard_pending()
+            return
+
+        try:
+            running = True
+            while running:
+                first = self._queue.get()
+                batch: list[dict[str, object]] = []
+                waiters: list[Event] = []
+                deadline = time.monotonic() + self.flush_ms / 1000
+                item = first
+                while True:
+                    if item is None:
+                        running = False
+                        break
+                    if isinstance(item, Event):
+                        # Um flush() só precisa esperar o que já estava na fila
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.max_batch_size:
+                        break
+                    timeout = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                    except Empty:
+                        break
+
+                if batch:
+                    self._write(batch, conn, log)
+                for waiter in waiters:
+                    waiter.set()
+
+            # Submissões enfileiradas durante o encerramento
+            remaining = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    break
+                if isinstance(item, dict):
+                    remaining.append(item)
+                elif isinstance(item, Event):
+                    item.set()
+            if remaining:
+                self._write(remaining, conn, log)
+        finally:
+            if conn is not None:
+                conn.close()
+            if log is not None:
+                log.close()
+
+    def _discard_pending(self) -> None:
+        """Esvazia a fila após uma falha da thread gravadora, liberando os flush() em espera."""
+
+        discarded = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if isinstance(item, dict):
+                discarded += 1
+            elif isinstance(item, Event):
+                item.set()
+        with self._lock:
+            self._errors += discarded
+
+    def _write(self, batch: list[dict[str, object]], conn: sqlite3.Connection | None, log: IO[str] | None) -> None:
+        """Grava um lote de submissões com uma única sincronização em disco."""
+
+        try:
+            if conn is not None:
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(self._INSERT, batch)
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            elif log is not None:
+                log.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in batch))
+                log.flush()
+                os.fsync(log.fileno())
+        except Exception as e:
+            print(f"⚠️ Falha ao gravar {len(batch)} submissões em {self.path}: {e}")
+            with self._lock:
+                self._errors += len(batch)
+            return
+
+        with self._lock:
+            self._written += len(batch)
+            self._flushes += 1
+
+
+def _default_path() -> str:
+    if config.SUBMISSIONS_PATH:
+        return config.SUBMISSIONS_PATH
+    return 'data/submissions.db' if config.SUBMISSIONS_STORAGE == 'sqlite' else 'data/submissions.log'
+
+
+submissions: SubmissionLog = SubmissionLog(config.SUBMISSIONS_STORAGE, _default_path(),
+                                           config.SUBMISSIONS_FLUSH_MS, config.SUBMISSIONS_MAX_BATCH)
+"""Instância compartilhada pelo processo, configurada pelas variáveis config.SUBMISSIONS_*."""
@@ -1,6 +1,7 @@
 #test_app.py
 
 import unittest
+import json
 from unittest.mock import patch, Mock
 from fastapi.testclient import TestClient
 from typing import Any
@@ -11,6 +12,9 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import app
+from inference import InferenceQueueFull
+from warmup import Warmup
+from grading_stats import GradingStats
 import question 
 
 client = TestClient(app)
@@ -21,6 +25,17 @@ class TestApp(unittest.TestCase):
         """Limpa o banco de dados em memória antes de cada teste."""
         question.questions.clear()
 
+        # Evita carregar o modelo de IA ao criar ou atualizar questões
+        patcher = patch('question.embeddings')
+        self.mock_embeddings = patcher.start()
+        self.mock_embeddings.search_statements.return_value = []
+        self.addCleanup(patcher.stop)
+
+        # Como se o processo já tivesse carregado os embeddings do banco (aquecimento)
+        patcher = patch('question._embeddings_loaded', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     # ==========================================
     # 1. TESTES DE AUTENTICAÇÃO (ADMIN)
     # ==========================================
@@ -83,6 +98,118 @@ class TestApp(unittest.TestCase):
         self.assertEqual(q['statement'], "")
         self.assertEqual(q['correct_answer'], "")
 
+    def test_create_question_alternative_answers(self):
+        """Respostas alternativas são aceitas como lista; texto no lugar da lista é rejeitado."""
+        payload = {"statement": "P", "correct_answer": "R", "alternative_answers": ["R2", "R3"]}
+        self.assertEqual(client.post("/questions", json=payload).status_code, 200)
+        q = list(question.questions.values())[0]
+        self.assertEqual(q['alternative_answers'], ["R2", "R3"])
+
+        payload = {"statement": "P", "correct_answer": "R", "alternative_answers": "R2"}
+        self.assertEqual(client.post("/questions", json=payload).status_code, 422)
+        payload = {"statement": ["P"], "correct_answer": "R"}
+        self.assertEqual(client.post("/questions", json=payload).status_code, 422)
+
+    def test_alternative_answers_blank_rejected(self):
+        """Alternativas vazias são rejeitadas na criação e na atualização, como na importação em lote."""
+        for alternatives in (["R2", ""], ["   "]):
+            payload = {"statement": "P", "correct_answer": "R", "alternative_answers": alternatives}
+            self.assertEqual(client.post("/questions", json=payload).status_code, 422)
+        self.assertEqual(len(question.questions), 0)
+
+        question.create_question("P", "R", ["R2"])
+        q_id = list(question.questions.keys())[0]
+        payload = {"statement": "P", "correct_answer": "R", "alternative_answers": [""]}
+        self.assertEqual(client.put(f"/questions/{q_id}", json=payload).status_code, 422)
+        self.assertEqual(question.questions[q_id]['alternative_answers'], ["R2"])
+
+    def test_bulk_create_ndjson(self):
+        """Importação em lote: linhas inválidas são relatadas sem interromper as demais."""
+        body = "\n".join([
+            json.dumps({"statement": "Q1", "correct_answer": "A1"}),
+            "",
+            "{não é json",
+            json.dumps({"statement": "Q2"}),
+            json.dumps(["lista"]),
+            json.dumps({"question_id": "fixo", "statement": "Q3", "correct_answer": "A3"}),
+            json.dumps({"question_id": "fixo", "statement": "Q4", "correct_answer": "A4"}),
+        ]) + "\n"
+        response = client.post("/questions/bulk", content=body.encode('utf-8'),
+                               headers={"Content-Type": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['failed'], 4)
+        self.assertEqual([e['line'] for e in result['errors']], [3, 4, 5, 7])
+        self.assertIn("fixo", question.questions)
+
+    def test_bulk_create_concurrent_id(self):
+        """Um id criado por outra requisição entre a leitura e a criação é relatado na linha, sem sobrescrever."""
+        body = "\n".join([
+            json.dumps({"question_id": "fixo", "statement": "Importada", "correct_answer": "A"}),
+            json.dumps({"statement": "Q2", "correct_answer": "B"}),
+        ]) + "\n"
+
+        def create_concurrently(items):
+            question.create_questions([{"question_id": "fixo", "statement": "Concorrente", "correct_answer": "C"}])
+            return question.create_questions(items)
+
+        with patch('app.create_questions', side_effect=create_concurrently):
+            result = client.post("/questions/bulk", content=body.encode('utf-8')).json()
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(result['errors'], [{'line': 1, 'error': "Questão fixo já existe."}])
+        self.assertEqual(question.questions["fixo"]['statement'], "Concorrente")
+
+    @patch('config.BULK_CHUNK_SIZE', 2)
+    def test_bulk_create_chunks(self):
+        """As questões são criadas em blocos de config.BULK_CHUNK_SIZE, lidos em streaming."""
+        def chunks():
+            for i in range(5):
+                line = json.dumps({"statement": f"Q{i}", "correct_answer": "A"}) + "\n"
+                # Divide cada linha em dois pedaços para exercitar a remontagem
+                yield line[:5].encode('utf-8')
+                yield line[5:].encode('utf-8')
+
+        with patch('app.create_questions', side_effect=question.create_questions) as mock_create:
+            response = client.post("/questions/bulk", content=chunks())
+        self.assertEqual(response.json()['created'], 5)
+        self.assertEqual([len(c.args[0]) for c in mock_create.call_args_list], [2, 2, 1])
+
+    def test_bulk_create_long_line_small_chunks(self):
+        """Uma linha longa em muitos pedaços pequenos e várias linhas num só pedaço são remontadas."""
+        long_line = json.dumps({"statement": "Q" * 5000, "correct_answer": "A"}) + "\n"
+        short_lines = "".join(json.dumps({"statement": f"C{i}", "correct_answer": "A"}) + "\n" for i in range(3))
+
+        def chunks():
+            for i in range(0, len(long_line), 7):
+                yield long_line[i:i + 7].encode('utf-8')
+            yield short_lines.encode('utf-8')
+            yield json.dumps({"statement": "Fim", "correct_answer": "A"}).encode('utf-8') # Sem \n final
+
+        result = client.post("/questions/bulk", content=chunks()).json()
+        self.assertEqual(result['created'], 5)
+        self.assertEqual(result['failed'], 0)
+        statements = [q['statement'] for q in question.questions.values()]
+        self.assertEqual(statements, ["Q" * 5000, "C0", "C1", "C2", "Fim"])
+
+    def test_export_roundtrip(self):
+        """A exportação gera NDJSON na ordem de criação, que pode ser reimportado."""
+        for i in range(3):
+            client.post("/questions", json={"statement": f"Q{i}", "correct_answer": f"A{i}"})
+        response = client.get("/questions/export")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['content-type'].startswith("application/x-ndjson"))
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(rows, list(question.questions.values()))
+
+        question.questions.clear()
+        result = client.post("/questions/bulk", content=response.content).json()
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(list(question.questions.values()), rows)
+
+        self.assertEqual(client.get("/questions/export?fields=senha").status_code, 400)
+
     # ==========================================
     # 3. TESTES DE LEITURA (GET /questions)
     # ==========================================
@@ -94,6 +221,148 @@ class TestApp(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()), 1)
 
+    def test_get_questions_paginated(self):
+        """Paginação por cursor no cabeçalho X-Next-Cursor."""
+        for i in range(3):
+            question.create_question(f"Q{i}", f"A{i}")
+
+        response = client.get("/questions", params={"limit": 2})
+        self.assertEqual(len(response.json()), 2)
+        cursor = response.headers["X-Next-Cursor"]
+
+        response = client.get("/questions", params={"limit": 2, "cursor": cursor})
+        self.assertEqual(len(response.json()), 1)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_get_questions_fields(self):
+        """Projeção para a página dos alunos (sem gabarito)."""
+        question.create_question("Q", "A")
+        response = client.get("/questions", params={"fields": "question_id,statement"})
+        item = list(response.json().values())[0]
+        self.assertEqual(set(item.keys()), {"question_id", "statement"})
+
+    def test_get_questions_invalid_params(self):
+        """Parâmetros inválidos."""
+        self.assertEqual(client.get("/questions", params={"cursor": "x"}).status_code, 400)
+        self.assertEqual(client.get("/questions", params={"fields": "senha"}).status_code, 400)
+        self.assertEqual(client.get("/questions", params={"limit": 0}).status_code, 422)
+
+    def test_get_questions_etag_not_modified(self):
+        """If-None-Match com o ETag atual responde 304 sem corpo."""
+        question.create_question("Q", "A")
+        etag = client.get("/questions").headers["ETag"]
+
+        response = client.get("/questions", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_get_questions_not_modified_skips_listing(self):
+        """A revalidação responde 304 sem montar a página nem ocupar o cache de respostas."""
+        question.create_question("Q", "A")
+        etag = client.get("/questions").headers["ETag"]
+
+        with patch('app.list_questions') as mock_list, patch.dict('app._listing_cache', clear=True) as listing_cache:
+            response = client.get("/questions", params={"q": "nova consulta"}, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["ETag"], etag)
+            mock_list.assert_not_called()
+            self.assertEqual(len(listing_cache), 0)
+
+    def test_get_questions_etag_changes(self):
+        """Criar, atualizar ou remover questões muda o ETag."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        etags = [client.get("/questions").headers["ETag"]]
+
+        question.update_question(q_id, "Novo", "Novo")
+        etags.append(client.get("/questions").headers["ETag"])
+        question.delete_question(q_id)
+        etags.append(client.get("/questions").headers["ETag"])
+
+        self.assertEqual(len(set(etags)), 3)
+        response = client.get("/questions", headers={"If-None-Match": etags[0]})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_questions_serialization_cached(self):
+        """Leituras repetidas da mesma versão não recalculam a resposta."""
+        question.create_question("Q", "A")
+        with patch('app.list_questions', wraps=question.list_questions) as mock_list:
+            first = client.get("/questions", params={"fields": "statement"})
+            second = client.get("/questions", params={"fields": "statement"})
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(mock_list.call_count, 1)
+
+    def test_create_question_duplicate_header(self):
+        """Questões quase iguais são informadas no cabeçalho, sem impedir a criação."""
+        client.post("/questions", json={"statement": "Q1", "correct_answer": "A"})
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.search_statements.return_value = [(q_id, 0.97)]
+        response = client.post("/questions", json={"statement": "Q1.", "correct_answer": "A"})
+        self.assertEqual(response.json(), 1)
+        self.assertEqual(response.headers["X-Duplicate-Of"], q_id)
+        # O enunciado é codificado uma vez e o embedding é usado na busca e no índice
+        self.mock_embeddings.encode_statement.assert_called_with("Q1.")
+        embedding = self.mock_embeddings.encode_statement.return_value
+        self.assertIs(self.mock_embeddings.search_statements.call_args.args[2], embedding)
+        self.assertIs(self.mock_embeddings.index_statements.call_args.args[1], embedding)
+        self.assertEqual(len(question.questions), 2)
+
+    def test_create_question_duplicate_check_skipped(self):
+        """Sem embeddings carregados, a omissão da verificação de duplicatas é informada."""
+        with patch('question._embeddings_loaded', False):
+            response = client.post("/questions", json={"statement": "Q1", "correct_answer": "A"})
+        self.assertEqual(response.json(), 1)
+        self.assertEqual(response.headers["X-Duplicate-Check"], "skipped")
+        self.mock_embeddings.search_statements.assert_not_called()
+        self.assertNotIn("X-Duplicate-Check", client.post("/questions", json={"statement": "Q2", "correct_answer": "A"}).headers)
+
+    def test_similar_questions(self):
+        """A rota de similares retorna a lista do índice ou 404."""
+        client.post("/questions", json={"statement": "Q1", "correct_answer": "A"})
+        client.post("/questions", json={"statement": "Q2", "correct_answer": "A"})
+        q1, q2 = list(question.questions.keys())
+        self.mock_embeddings.similar_statements.return_value = [(q2, 0.6)]
+        response = client.get(f"/questions/{q1}/similar?k=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{"question_id": q2, "statement": "Q2", "similarity": 0.6}])
+        self.assertEqual(client.get("/questions/fake_id/similar").status_code, 404)
+        self.assertEqual(client.get(f"/questions/{q1}/similar?k=0").status_code, 422)
+
+    def test_search_questions(self):
+        """A busca semântica retorna a lista do índice e exige o texto buscado."""
+        client.post("/questions", json={"statement": "Fotossíntese", "correct_answer": "Luz"})
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.search_questions.return_value = [(q_id, 0.8)]
+        response = client.get("/questions/search?q=plantas&k=3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{"question_id": q_id, "statement": "Fotossíntese", "similarity": 0.8}])
+        self.assertEqual(client.get("/questions/search").status_code, 422)
+
+    def test_question_stats(self):
+        """As estatísticas de uma questão e do banco refletem as avaliações registradas, ou 404."""
+        stats = GradingStats(os.path.join('inexistente', 'stats.json'), 0)
+        client.post("/questions", json={"statement": "Q1", "correct_answer": "A"})
+        client.post("/questions", json={"statement": "Q2", "correct_answer": "A"})
+        q1, q2 = list(question.questions.keys())
+        stats.record(q1, 0.9, 100)
+        stats.record(q1, 0.5, 70)
+        stats.record(q2, 0.1, 0)
+
+        with patch('question.grading_stats', stats):
+            response = client.get(f"/questions/{q1}/stats")
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(body["question_id"], q1)
+            self.assertEqual(body["attempts"], 2)
+            self.assertEqual(body["scores"], {"0": 0, "40": 0, "70": 1, "100": 1})
+            self.assertAlmostEqual(body["similarity"]["mean"], 0.7)
+            self.assertEqual(client.get("/questions/fake_id/stats").status_code, 404)
+
+            summary = client.get("/questions/stats?k=1").json()
+            self.assertEqual(summary["attempts"], 3)
+            self.assertEqual(summary["questions"], 2)
+            self.assertEqual(summary["hardest"], [{"question_id": q2, "attempts": 1, "mean_score": 0.0}])
+
     # ==========================================
     # 4. TESTES DE UPDATE (PUT /questions/{id})
     # ==========================================
@@ -176,6 +445,109 @@ class TestApp(unittest.TestCase):
         response = client.post("/questions/evaluate/id_falso", json={"answer": "resp"})
         self.assertEqual(response.json(), {'score': -1})
 
+    @patch('app.evaluate_batch')
+    def test_evaluate_batch_route(self, mock_evaluate_batch: Mock):
+        """Avaliação em lote de várias respostas."""
+        mock_evaluate_batch.return_value = [100, -1]
+        payload = [
+            {"question_id": "q1", "answer": "r1"},
+            {"question_id": "id_falso", "answer": "r2"},
+        ]
+        response = client.post("/questions/evaluate", json=payload)
+        self.assertEqual(response.status_code, 200)
+        mock_evaluate_batch.assert_called_with([("q1", "r1"), ("id_falso", "r2")])
+        self.assertEqual(response.json(), [
+            {"question_id": "q1", "score": 100},
+            {"question_id": "id_falso", "score": -1},
+        ])
+
+    def test_evaluate_batch_invalid_body(self):
+        """O lote deve ser uma lista."""
+        response = client.post("/questions/evaluate", json={"answer": "r"})
+        self.assertEqual(response.status_code, 422)
+
+    @patch('app.inference_executor.run', side_effect=InferenceQueueFull)
+    def test_evaluate_queue_full(self, mock_run: Mock):
+        """Fila de inferência cheia deve responder 503."""
+        response = client.post("/questions/evaluate/qualquer_id", json={"answer": "resp"})
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+        response = client.post("/questions/evaluate", json=[{"question_id": "q", "answer": "r"}])
+        self.assertEqual(response.status_code, 503)
+
+    @patch('app.config.BATCH_WINDOW_MS', 5)
+    @patch('app.evaluate')
+    @patch('app.finish_evaluation', return_value=70)
+    @patch('app.batcher')
+    @patch('app.prepare_evaluation')
+    def test_evaluate_micro_batching(self, mock_prepare: Mock, mock_batcher: Mock,
+                                     mock_finish: Mock, mock_evaluate: Mock):
+        """Com micro-batching, a rota aguarda o lote no event loop, fora do pool de inferência."""
+        from concurrent.futures import Future
+        references = Mock()
+        mock_prepare.return_value = (["gabarito"], references, 3)
+        done: Future[float] = Future()
+        done.set_result(0.8)
+        mock_batcher.submit.return_value = done
+
+        response = client.post("/questions/evaluate/q1", json={"answer": "resp"})
+        self.assertEqual(response.json(), {'score': 70})
+        mock_batcher.submit.assert_called_once_with("resp", references)
+        mock_finish.assert_called_once_with("q1", "resp", 0.8, 3)
+        mock_evaluate.assert_not_called()
+
+        # Decidida antes do modelo (cascata, cache ou questão inexistente): sem lote
+        mock_prepare.return_value = -1
+        response = client.post("/questions/evaluate/id_falso", json={"answer": "resp"})
+        self.assertEqual(response.json(), {'score': -1})
+        mock_batcher.submit.assert_called_once()
+
+    def test_healthz(self):
+        """A liveness responde mesmo antes do aquecimento."""
+        response = client.get("/healthz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_readyz(self):
+        """A readiness responde 503 durante o aquecimento e 200 ao final."""
+        with patch('app.warmup', Warmup(1)) as warmup:
+            response = client.get("/readyz")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.json()["state"], "pending")
+            warmup.mark_ready()
+            response = client.get("/readyz")
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()["ready"])
+
+    def test_prometheus_metrics(self):
+        """O endpoint /metrics exporta requisições por rota, etapas e tamanho do banco."""
+        client.post("/questions", json={"statement": "Q", "correct_answer": "A"})
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('flavify_http_requests_total{method="POST",route="/questions",status="200"}', response.text)
+        self.assertIn("flavify_questions 1", response.text)
+        self.assertIn("flavify_similarity_cache_hit_rate", response.text)
+
+    def test_cache_stats(self):
+        """Contadores do cache de similaridades."""
+        response = client.get("/metrics/cache")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hit_rate", response.json())
+
+    def test_inference_stats(self):
+        """Estado da fila de inferência."""
+        response = client.get("/metrics/inference")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("pending", response.json())
+
+    def test_batching_stats(self):
+        """Métricas do agrupamento de avaliações."""
+        response = client.get("/metrics/batching")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("mean_batch_size", response.json())
+
     # ==========================================
     # 7. NOVOS TESTES: VALIDAÇÃO E PROTOCOLO (GAP FILLERS)
     # ==========================================
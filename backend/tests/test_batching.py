@@ -0,0 +1,106 @@
+# test_batching.py
+
+import unittest
+from unittest.mock import Mock
+from threading import Barrier, Thread
+import sys
+import os
+import numpy as np
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batching import MicroBatcher
+
+def fake_similarity(answers: list[str], references: np.ndarray, counts: list[int] | None = None) -> list[float]:
+    """Similaridade falsa: o maior primeiro valor dos embeddings das referências de cada resposta."""
+    counts = counts or [1] * len(answers)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return [float(references[start:start + count, 0].max()) for start, count in zip(starts, counts)]
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def make_batcher(self, window_ms: float, max_batch_size: int, fn=fake_similarity) -> MicroBatcher:
+        batcher = MicroBatcher(window_ms, max_batch_size, fn)
+        self.addCleanup(batcher.stop)
+        return batcher
+
+    # ==========================================
+    # 1. TESTES DE RESULTADO
+    # ==========================================
+
+    def test_single_submit(self):
+        """Uma submissão isolada é resolvida após a janela."""
+        batcher = self.make_batcher(1, 8)
+        future = batcher.submit("resposta", np.array([0.5, 0.0]))
+        self.assertEqual(future.result(timeout=5), 0.5)
+
+    def test_results_routed_to_callers(self):
+        """Cada chamador recebe a similaridade do seu próprio item."""
+        batcher = self.make_batcher(50, 64)
+        futures = [batcher.submit(f"r{i}", np.array([i / 10, 0.0])) for i in range(10)]
+        self.assertEqual([f.result(timeout=5) for f in futures], [i / 10 for i in range(10)])
+
+    def test_multiple_references(self):
+        """Itens com várias referências entram no mesmo lote, com a contagem de cada um."""
+        fn = Mock(side_effect=fake_similarity)
+        batcher = self.make_batcher(50, 64, fn)
+        single = batcher.submit("r1", np.array([0.3, 0.0]))
+        multi = batcher.submit("r2", np.array([[0.2, 0.0], [0.9, 0.0], [0.4, 0.0]]))
+        self.assertEqual((single.result(timeout=5), multi.result(timeout=5)), (0.3, 0.9))
+        self.assertEqual(fn.call_args.args[2], [1, 3])
+        self.assertEqual(fn.call_args.args[1].shape, (4, 2))
+
+    def test_exception_propagates(self):
+        """Falhas do modelo são repassadas a todos os chamadores do lote."""
+        batcher = self.make_batcher(1, 8, Mock(side_effect=RuntimeError("falha")))
+        future = batcher.submit("r", np.zeros(2))
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=5)
+
+    # ==========================================
+    # 2. TESTES DE AGRUPAMENTO E MÉTRICAS
+    # ==========================================
+
+    def test_concurrent_submits_are_batched(self):
+        """Submissões concorrentes dentro da janela formam um único lote."""
+        fn = Mock(side_effect=fake_similarity)
+        batcher = self.make_batcher(200, 64, fn)
+        barrier = Barrier(8)
+        results: list[float] = []
+
+        def worker(i: int):
+            barrier.wait()
+            results.append(batcher.submit(f"r{i}", np.array([1.0, 0.0])).result(timeout=5))
+
+        threads = [Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [1.0] * 8)
+        self.assertEqual(fn.call_count, 1)
+        stats = batcher.stats()
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(stats['max_batch_size'], 8)
+        self.assertEqual(stats['histogram'], {8: 1})
+
+    def test_max_batch_size(self):
+        """Nenhum lote ultrapassa o tamanho máximo."""
+        batcher = self.make_batcher(100, 3)
+        futures = [batcher.submit("r", np.zeros(2)) for _ in range(7)]
+        for f in futures:
+            f.result(timeout=5)
+        stats = batcher.stats()
+        self.assertEqual(stats['items'], 7)
+        self.assertLessEqual(stats['max_batch_size'], 3)
+
+    def test_stats_empty(self):
+        """Sem lotes processados, as métricas são zero."""
+        stats = self.make_batcher(1, 8).stats()
+        self.assertEqual(stats['batches'], 0)
+        self.assertEqual(stats['mean_batch_size'], 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
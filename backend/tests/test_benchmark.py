@@ -0,0 +1,86 @@
+# test_benchmark.py
+
+import unittest
+import time
+import sys
+import os
+
+# Adiciona as pastas backend e backend/tools ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+
+import benchmark
+
+BANK = [
+    {"question_id": "1", "statement": "E1", "correct_answer": "um dois tres quatro"},
+    {"question_id": "2", "statement": "E2", "correct_answer": "cinco seis"},
+]
+
+def result(scenario: str, p95: float, throughput: float) -> dict[str, object]:
+    return {'scenario': scenario, 'concurrency': 1, 'latency_ms': {'p95': p95}, 'throughput': throughput}
+
+class TestBenchmark(unittest.TestCase):
+
+    # ==========================================
+    # 1. TESTES DO CORPUS
+    # ==========================================
+
+    def test_build_bank_replicates(self):
+        """Um banco maior que o arquivo replica as questões com ids únicos."""
+        bank = benchmark.build_bank(BANK, 5)
+        self.assertEqual(len(bank), 5)
+        self.assertEqual(len({q['question_id'] for q in bank}), 5)
+        self.assertEqual(bank[2]['statement'], "E1 (1)")
+        self.assertEqual(benchmark.build_bank(BANK, None), BANK)
+
+    def test_build_corpus_deterministic(self):
+        """A mesma semente gera o mesmo corpus, com respostas únicas."""
+        corpus = benchmark.build_corpus(BANK, 50, seed=7)
+        self.assertEqual(corpus, benchmark.build_corpus(BANK, 50, seed=7))
+        self.assertNotEqual(corpus, benchmark.build_corpus(BANK, 50, seed=8))
+        self.assertEqual(len({answer for _, answer in corpus}), 50)
+        self.assertTrue(all(qid in ("1", "2") for qid, _ in corpus))
+
+    # ==========================================
+    # 2. TESTES DAS ESTATÍSTICAS
+    # ==========================================
+
+    def test_percentile(self):
+        """Percentis por interpolação linear."""
+        samples = [float(i) for i in range(1, 101)]
+        self.assertAlmostEqual(benchmark.percentile(samples, 50), 50.5)
+        self.assertAlmostEqual(benchmark.percentile(samples, 99), 99.01)
+        self.assertEqual(benchmark.percentile([], 95), 0.0)
+
+    def test_run_scenario_counts_errors(self):
+        """Erros são contados e ficam fora das latências."""
+        def call(request: list[tuple[str, str]]) -> None:
+            if request[0][1] == "erro":
+                raise RuntimeError()
+        report = benchmark.run_scenario('x', call, [[("1", "ok")], [("1", "erro")], [("1", "ok")]], 2)
+        self.assertEqual(report['errors'], 1)
+        self.assertEqual(report['answers'], 3)
+        self.assertGreater(report['throughput'], 0) # pyright: ignore[reportOperatorIssue]
+
+    @unittest.skipUnless(benchmark.current_rss_mb() is not None, "requer /proc/self/statm")
+    def test_peak_rss_per_scenario(self):
+        """O pico de memória é medido em cada cenário, e não o pico de toda a vida do processo."""
+        def allocate(request: list[tuple[str, str]]) -> None:
+            block = bytearray(200 * 1024 * 1024)
+            block[::4096] = b'x' * len(block[::4096])
+            time.sleep(0.1)  # tempo para o amostrador registrar o pico
+            del block
+        heavy = benchmark.run_scenario('pesado', allocate, [[("1", "ok")]], 1)
+        light = benchmark.run_scenario('leve', lambda request: None, [[("1", "ok")]], 1)
+        self.assertLess(light['peak_rss_mb'], heavy['peak_rss_mb'] - 100) # pyright: ignore[reportOperatorIssue]
+
+    def test_compare_detects_regressions(self):
+        """p95 maior ou vazão menor além do limite são regressões."""
+        baseline = {'scenarios': [result('evaluate', 10.0, 100.0), result('route', 10.0, 100.0)]}
+        current = {'scenarios': [result('evaluate', 10.5, 98.0), result('route', 15.0, 50.0)]}
+        regressions = benchmark.compare(baseline, current, 0.10)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith("route x1") for r in regressions))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# test_check_encoder_accuracy.py
+
+import unittest
+import sys
+import os
+
+# Adiciona as pastas backend e backend/tools ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+
+import check_encoder_accuracy
+
+class TestCheckEncoderAccuracy(unittest.TestCase):
+
+    def test_build_pairs(self):
+        """Cada questão gera quatro pares com o seu gabarito."""
+        question_list = [
+            {"question_id": "1", "statement": "E1", "correct_answer": "um dois tres quatro"},
+            {"question_id": "2", "statement": "E2", "correct_answer": "cinco"},
+        ]
+        pairs = check_encoder_accuracy.build_pairs(question_list)
+        self.assertEqual(len(pairs), 8)
+        self.assertEqual(pairs[0], ("um dois tres quatro", "um dois tres quatro"))
+        self.assertEqual(pairs[1], ("um dois", "um dois tres quatro"))
+        self.assertEqual(pairs[3], ("cinco", "um dois tres quatro"))
+
+    def test_compare_same_grades(self):
+        """Pequenas diferenças dentro da mesma faixa não contam como divergência."""
+        report = check_encoder_accuracy.compare([0.10, 0.50, 0.90], [0.11, 0.49, 0.88])
+        self.assertEqual(report['grade_mismatches'], [])
+        self.assertAlmostEqual(report['max_abs_diff'], 0.02) # type: ignore
+
+    def test_compare_grade_boundary(self):
+        """Uma similaridade que cruza um limite de faixa é reportada."""
+        report = check_encoder_accuracy.compare([0.69, 0.30], [0.71, 0.30])
+        self.assertEqual(report['grade_mismatches'], [0])
+
+if __name__ == "__main__":
+    unittest.main()
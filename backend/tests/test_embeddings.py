@@ -0,0 +1,258 @@
+# test_embeddings.py
+
+import unittest
+from unittest.mock import patch, Mock
+import tempfile
+import sys
+import os
+import numpy as np
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import embeddings
+from vector_index import VectorIndex
+
+def fake_encode(sentences: list[str]) -> np.ndarray:
+    """Embedding determinístico: o tamanho do texto em todas as dimensões."""
+    return np.array([[float(len(s))] * 4 for s in sentences], dtype=np.float32)
+
+class TestEmbeddings(unittest.TestCase):
+
+    def setUp(self):
+        """Esvazia o cache e substitui o modelo por um codificador falso."""
+        embeddings._embeddings.clear()
+        embeddings._statement_digests.clear()
+        for patcher in (patch('embeddings.encode', side_effect=fake_encode),
+                        patch('embeddings._statement_index', VectorIndex()),
+                        patch('embeddings._answer_index', VectorIndex())):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.mock_encode = embeddings.encode
+
+    # ==========================================
+    # 1. TESTES DE CACHE
+    # ==========================================
+
+    def test_precompute_batches_missing(self):
+        """Os gabaritos ausentes são codificados em uma única chamada."""
+        embeddings.precompute([("1", ["a"]), ("2", ["bb"]), ("3", ["ccc"])])
+        self.mock_encode.assert_called_once_with(["a", "bb", "ccc"])
+
+    def test_precompute_skips_cached(self):
+        """Gabaritos já em cache não são codificados novamente."""
+        embeddings.precompute([("1", ["a"])])
+        embeddings.precompute([("1", ["a"]), ("2", ["bb"])])
+        self.mock_encode.assert_called_with(["bb"])
+        self.assertEqual(self.mock_encode.call_count, 2)
+
+    def test_get_reference_embeddings_cached(self):
+        """Consultas repetidas não chamam o modelo."""
+        embeddings.precompute([("1", ["abc"])])
+        emb = embeddings.get_reference_embeddings("1", ["abc"])
+        self.assertEqual(emb.shape, (1, 4))
+        self.assertEqual(emb[0][0], 3.0)
+        self.mock_encode.assert_called_once()
+
+    def test_get_reference_embeddings_stale_text(self):
+        """Se o gabarito mudou, o embedding é recalculado."""
+        embeddings.precompute([("1", ["abc"])])
+        emb = embeddings.get_reference_embeddings("1", ["abcdef"])
+        self.assertEqual(emb[0][0], 6.0)
+
+    def test_multiple_references(self):
+        """As referências de todas as questões são codificadas em uma chamada, uma matriz por questão."""
+        embeddings.precompute([("1", ["a", "bb", "ccc"]), ("2", ["dddd"])])
+        self.mock_encode.assert_called_once_with(["a", "bb", "ccc", "dddd"])
+        self.assertEqual(embeddings.get_reference_embeddings("1", ["a", "bb", "ccc"])[:, 0].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(embeddings.get_reference_embeddings("2", ["dddd"]).shape, (1, 4))
+        # Acrescentar uma alternativa recodifica as referências da questão
+        embeddings.get_reference_embeddings("2", ["dddd", "e"])
+        self.mock_encode.assert_called_with(["dddd", "e"])
+
+    def test_invalidate(self):
+        """A invalidação remove o embedding da questão."""
+        embeddings.precompute([("1", ["a"]), ("2", ["b"])])
+        embeddings.invalidate("1")
+        self.assertNotIn(("1", embeddings.model_version()), embeddings._embeddings)
+        self.assertIn(("2", embeddings.model_version()), embeddings._embeddings)
+
+    def test_keyed_by_model(self):
+        """Embeddings de modelos diferentes não se misturam."""
+        embeddings.precompute([("1", ["a"])])
+        with patch('natural_language.config.MODEL_NAME', 'outro-modelo'):
+            embeddings.get_reference_embeddings("1", ["a"])
+        self.assertEqual(self.mock_encode.call_count, 2)
+
+    # ==========================================
+    # 2. TESTES DO ÍNDICE DE ENUNCIADOS
+    # ==========================================
+
+    def test_index_statements_skips_unchanged(self):
+        """Enunciados inalterados não são codificados novamente."""
+        embeddings.index_statements([("1", "a"), ("2", "bb")])
+        embeddings.index_statements([("1", "a"), ("2", "ccc")])
+        self.assertEqual(self.mock_encode.call_count, 2)
+        self.mock_encode.assert_called_with(["ccc"])
+
+    def test_statement_encoded_once(self):
+        """Um embedding já calculado é reaproveitado na busca e no índice, sem nova codificação."""
+        embeddings.index_statements([("1", "a")])
+        self.mock_encode.reset_mock()
+
+        embedding = embeddings.encode_statement("bb")
+        embeddings.search_statements("bb", 5, embedding)
+        embeddings.index_statements([("2", "bb")], embedding)
+
+        self.mock_encode.assert_called_once_with(["bb"])
+        self.assertEqual(embeddings.similar_statements("1", 5)[0][0], "2")
+
+    def test_similar_and_search_statements(self):
+        """A busca por questão exclui a própria questão; a busca por texto codifica o texto."""
+        with patch('embeddings.encode', side_effect=lambda s: np.eye(3, dtype=np.float32)[[len(t) - 1 for t in s]]):
+            embeddings.index_statements([("1", "a"), ("2", "b"), ("3", "ccc")])
+            self.assertEqual(embeddings.similar_statements("1", 5)[0], ("2", 1.0))
+            self.assertEqual([qid for qid, _ in embeddings.similar_statements("1", 5)], ["2", "3"])
+            self.assertEqual(embeddings.search_statements("zzz", 1), [("3", 1.0)])
+        self.assertEqual(embeddings.similar_statements("inexistente", 5), [])
+
+    def test_invalidate_removes_statement(self):
+        """A invalidação também retira o enunciado do índice."""
+        embeddings.index_statements([("1", "a"), ("2", "b")])
+        embeddings.invalidate("1")
+        self.assertEqual(embeddings.similar_statements("1", 5), [])
+        self.assertEqual([qid for qid, _ in embeddings.search_statements("a", 5)], ["2"])
+
+    def test_search_questions_statements_and_answers(self):
+        """A busca combina enunciados e gabaritos, com a maior similaridade de cada questão."""
+        one_hot = lambda s: np.eye(3, dtype=np.float32)[[len(t) - 1 for t in s]]
+        with patch('embeddings.encode', side_effect=one_hot) as mock_encode:
+            embeddings.index_statements([("1", "a"), ("2", "bb")])
+            embeddings.precompute([("1", ["bb"]), ("2", ["ccc"])])
+            mock_encode.reset_mock()
+            result = embeddings.search_questions("zz", 2)
+            mock_encode.assert_called_once_with(["zz"])
+        self.assertEqual(sorted(result), [("1", 1.0), ("2", 1.0)])
+        with patch('embeddings.encode', side_effect=one_hot):
+            self.assertEqual(embeddings.search_questions("zzz", 1), [("2", 1.0)])
+
+    def test_prune(self):
+        """Embeddings de questões inexistentes são descartados de todos os índices."""
+        embeddings.precompute([("1", ["a"]), ("2", ["b"])])
+        embeddings.index_statements([("1", "a"), ("2", "b")])
+        embeddings.prune({"2"})
+        self.assertEqual([qid for qid, _ in embeddings.search_questions("a", 5)], ["2"])
+        self.assertNotIn(("1", embeddings.model_version()), embeddings._embeddings)
+
+    # ==========================================
+    # 3. TESTES DE PERSISTÊNCIA
+    # ==========================================
+
+    def test_save_and_load(self):
+        """Embeddings salvos são recarregados sem chamar o modelo."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                os.mkdir('data')
+                embeddings.precompute([("1", ["abc"]), ("2", ["de"])])
+                embeddings.save_embeddings()
+
+                embeddings._embeddings.clear()
+                self.mock_encode.reset_mock()
+                embeddings.load_embeddings()
+
+                emb = embeddings.get_reference_embeddings("2", ["de"])
+                self.assertEqual(emb[0][0], 2.0)
+                self.mock_encode.assert_not_called()
+            finally:
+                os.chdir(cwd)
+
+    def test_save_and_load_indexes(self):
+        """Os índices de enunciados e gabaritos são recarregados sem chamar o modelo."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                os.mkdir('data')
+                embeddings.precompute([("1", ["abc"])])
+                embeddings.index_statements([("1", "q"), ("2", "qq")])
+                embeddings.save_embeddings()
+
+                embeddings._embeddings.clear()
+                embeddings._statement_digests.clear()
+                with patch('embeddings._statement_index', VectorIndex()), \
+                     patch('embeddings._answer_index', VectorIndex()):
+                    embeddings.load_embeddings()
+                    self.mock_encode.reset_mock()
+                    embeddings.index_statements([("1", "q"), ("2", "qq")])
+                    self.mock_encode.assert_not_called()
+                    self.assertEqual(len(embeddings._statement_index), 2)
+                    self.assertIn("1", embeddings._answer_index)
+            finally:
+                os.chdir(cwd)
+
+    def test_save_is_atomic(self):
+        """Uma gravação interrompida mantém o arquivo anterior e não deixa temporários."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                os.mkdir('data')
+                embeddings.precompute([("1", ["abc"])])
+                embeddings.save_embeddings()
+                path = embeddings._embeddings_path(embeddings.model_version())
+                with open(path, 'rb') as f:
+                    saved = f.read()
+
+                embeddings.precompute([("2", ["de"])])
+                with patch('embeddings.np.savez', side_effect=OSError("disco cheio")):
+                    with self.assertRaises(OSError):
+                        embeddings.save_embeddings()
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), saved)
+                self.assertEqual(set(os.listdir('data')), {os.path.basename(path),
+                                                           os.path.basename(path) + '.tmp'})
+
+                embeddings.save_embeddings()
+                self.assertEqual(os.listdir('data'), [os.path.basename(path)])
+            finally:
+                os.chdir(cwd)
+
+    def test_load_corrupted_file(self):
+        """Um cache truncado ou ilegível é tratado como ausente, sem impedir o carregamento."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                os.mkdir('data')
+                embeddings.precompute([("1", ["abc"])])
+                embeddings.index_statements([("1", "q")])
+                embeddings.save_embeddings()
+                path = embeddings._embeddings_path(embeddings.model_version())
+                with open(path, 'r+b') as f:
+                    f.truncate(os.path.getsize(path) // 2)
+
+                embeddings._embeddings.clear()
+                embeddings._statement_digests.clear()
+                with patch('embeddings._statement_index', VectorIndex()):
+                    embeddings.load_embeddings()
+                    self.assertEqual(len(embeddings._embeddings), 0)
+                    # O arquivo dos enunciados está íntegro e continua sendo usado
+                    self.assertEqual(len(embeddings._statement_index), 1)
+
+                with open(path, 'wb') as f:
+                    f.write(b'lixo')
+                embeddings.load_embeddings()
+                self.assertEqual(len(embeddings._embeddings), 0)
+            finally:
+                os.chdir(cwd)
+
+    def test_load_missing_file(self):
+        """Sem arquivo salvo, o carregamento não deve quebrar."""
+        with patch('embeddings.os.path.exists', return_value=False):
+            embeddings.load_embeddings()
+        self.assertEqual(len(embeddings._embeddings), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+# test_grading_stats.py
+
+import unittest
+from unittest.mock import patch
+import json
+import statistics
+import tempfile
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grading_stats import GradingStats, QuestionStats
+
+class TestGradingStats(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'data', 'stats.json')
+
+    # ==========================================
+    # 1. TESTES DOS AGREGADOS
+    # ==========================================
+
+    def test_running_aggregates(self):
+        """Média, desvio padrão, contagens e histograma batem com o cálculo sobre todas as respostas."""
+        similarities = [0.05, 0.15, 0.35, 0.55, 0.65, 0.75, 0.95, 1.0, 0.72]
+        scores = [0, 0, 40, 70, 70, 100, 100, 100, 100]
+        stats = QuestionStats()
+        for similarity, score in zip(similarities, scores):
+            stats.add(similarity, score, 0.0)
+
+        summary = stats.to_dict()
+        self.assertEqual(summary['attempts'], 9)
+        self.assertEqual(summary['scores'], {'0': 2, '40': 1, '70': 2, '100': 4})
+        self.assertAlmostEqual(summary['mean_score'], statistics.mean(scores))
+        self.assertAlmostEqual(summary['similarity']['mean'], statistics.mean(similarities))
+        self.assertAlmostEqual(summary['similarity']['std'], statistics.pstdev(similarities))
+        self.assertEqual(summary['similarity']['histogram'], [1, 1, 0, 1, 0, 1, 1, 2, 0, 2])
+
+    def test_out_of_range_similarity(self):
+        """Similaridades negativas ou acima de 1 vão para as pontas do histograma."""
+        stats = QuestionStats()
+        stats.add(-0.2, 0, 0.0)
+        stats.add(1.3, 100, 0.0)
+        histogram = stats.to_dict()['similarity']['histogram']
+        self.assertEqual((histogram[0], histogram[-1]), (1, 1))
+
+    def test_merge(self):
+        """Combinar agregados equivale a calcular sobre a união das respostas."""
+        left, right, both = QuestionStats(), QuestionStats(), QuestionStats()
+        for i, similarity in enumerate([0.1, 0.4, 0.8, 0.9, 0.3]):
+            (left if i < 2 else right).add(similarity, 40, float(i))
+            both.add(similarity, 40, float(i))
+        left.merge(right)
+        merged, expected = left.to_dict(), both.to_dict()
+        self.assertAlmostEqual(merged['similarity']['mean'], expected['similarity']['mean'])
+        self.assertAlmostEqual(merged['similarity']['std'], expected['similarity']['std'])
+        self.assertEqual(merged['similarity']['histogram'], expected['similarity']['histogram'])
+        self.assertEqual(merged['last_attempt_at'], 4.0)
+
+    def test_empty(self):
+        """Questão sem avaliações retorna agregados zerados."""
+        summary = GradingStats(self.path, 0).get('q1')
+        self.assertEqual(summary['attempts'], 0)
+        self.assertEqual(summary['mean_score'], 0.0)
+        self.assertIsNone(summary['last_attempt_at'])
+
+    # ==========================================
+    # 2. TESTES DO RESUMO DO BANCO
+    # ==========================================
+
+    def test_summary(self):
+        """O resumo combina as questões existentes e lista as de menor pontuação média."""
+        stats = GradingStats(self.path, 0)
+        stats.record('q1', 0.9, 100)
+        stats.record('q2', 0.1, 0)
+        stats.record('q2', 0.5, 70)
+        stats.record('removida', 0.9, 100)
+
+        summary = stats.summary(['q1', 'q2', 'q3'], k=5)
+        self.assertEqual(summary['attempts'], 3)
+        self.assertEqual(summary['questions'], 3)
+        self.assertEqual(summary['answered'], 2)
+        self.assertEqual([q['question_id'] for q in summary['hardest']], ['q2', 'q1'])
+        self.assertEqual(summary['hardest'][0]['mean_score'], 35.0)
+
+    # ==========================================
+    # 3. TESTES DE PERSISTÊNCIA
+    # ==========================================
+
+    def test_save_and_load(self):
+        """Os agregados salvos são recarregados sem recalcular."""
+        stats = GradingStats(self.path, 0)
+        stats.record('q1', 0.9, 100)
+        stats.record('q1', 0.3, 40)
+        stats.stop()
+
+        reloaded = GradingStats(self.path, 0)
+        reloaded.start()
+        self.addCleanup(reloaded.stop)
+        self.assertEqual(reloaded.get('q1'), stats.get('q1'))
+        reloaded.record('q1', 0.5, 70)
+        self.assertEqual(reloaded.get('q1')['attempts'], 3)
+
+    def test_forget(self):
+        """Estatísticas de questões removidas são descartadas e não voltam após salvar."""
+        stats = GradingStats(self.path, 0)
+        stats.record('q1', 0.9, 100)
+        stats.save()
+        stats.load() # Incorpora o arquivo deste processo a stats.json
+        stats.forget('q1')
+        stats.save()
+        stats.load()
+        self.assertEqual(stats.get('q1')['attempts'], 0)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {})
+
+    def test_corrupted_file(self):
+        """Arquivo corrompido é ignorado e as estatísticas começam vazias."""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"q1": ')
+        stats = GradingStats(self.path, 0)
+        stats.load()
+        self.assertEqual(stats.get('q1')['attempts'], 0)
+
+    def test_periodic_save(self):
+        """Com save_seconds, os agregados são gravados em segundo plano."""
+        stats = GradingStats(self.path, 0.01)
+        stats.start()
+        self.addCleanup(stats.stop)
+        stats.record('q1', 0.9, 100)
+        worker_path = stats.worker_path(os.getpid())
+        for _ in range(200):
+            if os.path.exists(worker_path):
+                break
+            stats._stop.wait(0.01)
+        with open(worker_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['questions']['q1']['attempts'], 1)
+
+    # ==========================================
+    # 4. TESTES COM VÁRIOS PROCESSOS
+    # ==========================================
+
+    def run_worker(self, pid: int, similarities: list[float], alive: set[int]) -> GradingStats:
+        """Simula um processo pid que carrega os agregados, avalia respostas e salva."""
+        with patch('grading_stats.os.getpid', return_value=pid), \
+             patch('grading_stats._pid_alive', side_effect=lambda p: p in alive):
+            stats = GradingStats(self.path, 0)
+            stats.load()
+            for similarity in similarities:
+                stats.record('q1', similarity, 100)
+            stats.save()
+        return stats
+
+    def test_workers_do_not_overwrite(self):
+        """Cada processo grava o seu arquivo; um novo processo soma os de todos."""
+        self.run_worker(101, [0.9, 0.8], alive={101, 102, 103})
+        self.run_worker(102, [0.1], alive={101, 102, 103})
+        stats = self.run_worker(103, [], alive={101, 102, 103})
+        self.assertEqual(stats.get('q1')['attempts'], 3)
+        self.assertAlmostEqual(stats.get('q1')['similarity']['mean'], 0.6) # type: ignore
+        # Arquivos de processos ativos não são alterados
+        self.assertTrue(os.path.exists(stats.worker_path(101)))
+        self.assertTrue(os.path.exists(stats.worker_path(102)))
+
+    def test_stale_workers_consolidated(self):
+        """Arquivos de processos encerrados, ou do próprio PID reutilizado, são incorporados uma única vez."""
+        self.run_worker(101, [0.9, 0.8], alive={101, 102})
+        self.run_worker(102, [0.1], alive={101, 102})
+
+        # 101 encerrou; 102 reiniciou com o mesmo PID
+        stats = self.run_worker(102, [], alive={102})
+        self.assertEqual(stats.get('q1')['attempts'], 3)
+        self.assertFalse(os.path.exists(stats.worker_path(101)))
+        self.assertFalse(os.path.exists(stats.worker_path(102)))
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['q1']['attempts'], 3)
+
+        self.run_worker(104, [0.5], alive={104})
+        self.assertEqual(self.run_worker(105, [], alive={105}).get('q1')['attempts'], 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# test_imports.py
+
+import unittest
+import subprocess
+import sys
+import os
+import json
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Orçamento de tempo para importar a API sem o modelo (réplicas que só servem o CRUD)
+IMPORT_BUDGET_S = 1.5
+
+# Mede a importação em um processo novo, pois o processo dos testes pode já ter
+# importado o torch
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'elapsed': elapsed,
+    'torch': 'torch' in sys.modules,
+    'sentence_transformers': 'sentence_transformers' in sys.modules,
+}))
+"""
+
+class TestImports(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        result = subprocess.run([sys.executable, '-c', _PROBE], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True)
+        cls.probe = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # ==========================================
+    # 1. TESTES DE IMPORTAÇÃO PREGUIÇOSA
+    # ==========================================
+
+    def test_app_does_not_import_nlp_stack(self):
+        """Importar a API não importa torch nem sentence_transformers."""
+        self.assertFalse(self.probe['torch'])
+        self.assertFalse(self.probe['sentence_transformers'])
+
+    def test_import_time_budget(self):
+        """A API é importada dentro do orçamento de tempo."""
+        self.assertLess(self.probe['elapsed'], IMPORT_BUDGET_S)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# test_inference.py
+
+import unittest
+import asyncio
+from threading import Event
+from unittest.mock import Mock
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from inference import InferenceExecutor, InferenceQueueFull
+
+class TestInferenceExecutor(unittest.TestCase):
+
+    def make_executor(self, max_workers: int, max_pending: int) -> InferenceExecutor:
+        executor = InferenceExecutor(max_workers, max_pending)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    # ==========================================
+    # 1. TESTES DE EXECUÇÃO
+    # ==========================================
+
+    def test_run_returns_result(self):
+        """A função roda no pool e seu retorno chega ao chamador."""
+        executor = self.make_executor(2, 4)
+        result = asyncio.run(executor.run(lambda a, b: a + b, 2, 3))
+        self.assertEqual(result, 5)
+
+    def test_run_propagates_exception(self):
+        """Exceções da função são repassadas ao chamador."""
+        executor = self.make_executor(1, 1)
+
+        def fail():
+            raise ValueError("erro")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(executor.run(fail))
+        self.assertEqual(executor.stats()['pending'], 0)
+
+    def test_runs_in_dedicated_threads(self):
+        """A inferência não usa o threadpool padrão do event loop."""
+        import threading
+        executor = self.make_executor(1, 1)
+        name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+        self.assertTrue(name.startswith("inference"))
+
+    # ==========================================
+    # 2. TESTES DE BACKPRESSURE
+    # ==========================================
+
+    def test_queue_full(self):
+        """Acima do limite de pendentes, novas tarefas são rejeitadas."""
+        executor = self.make_executor(1, 2)
+        release = Event()
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            self.assertEqual(executor.stats()['pending'], 2)
+            with self.assertRaises(InferenceQueueFull):
+                await executor.run(lambda: None)
+            release.set()
+            await asyncio.gather(*blocked)
+
+        asyncio.run(scenario())
+        stats = executor.stats()
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['pending'], 0)
+
+    def test_cancelled_wait_keeps_slot(self):
+        """Cancelar a espera (cliente desconectado) não libera a vaga enquanto a tarefa roda."""
+        executor = self.make_executor(1, 1)
+        release = Event()
+
+        async def scenario():
+            waiting = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            await asyncio.sleep(0.05)
+            self.assertEqual(executor.stats()['pending'], 1)
+            with self.assertRaises(InferenceQueueFull):
+                await executor.run(lambda: None)
+            release.set()
+            for _ in range(100):
+                if executor.stats()['pending'] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(await executor.run(lambda: 7), 7)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set() # Não deixa a thread presa se uma verificação falhar
+        self.assertEqual(executor.stats()['pending'], 0)
+
+    def test_wait_holds_slot_not_thread(self):
+        """Aguardar um futuro externo conta como pendente, mas não ocupa thread do pool."""
+        from concurrent.futures import Future
+        executor = self.make_executor(1, 2)
+        external: Future[float] = Future()
+
+        async def scenario():
+            waiting = asyncio.ensure_future(executor.wait(lambda: external))
+            await asyncio.sleep(0.05)
+            self.assertEqual(executor.stats()['pending'], 1)
+            # A única thread continua livre enquanto o futuro não é resolvido
+            self.assertEqual(await executor.run(lambda: 7), 7)
+            external.set_result(0.5)
+            self.assertEqual(await waiting, 0.5)
+
+        asyncio.run(scenario())
+        self.assertEqual(executor.stats()['pending'], 0)
+
+    def test_wait_queue_full(self):
+        """Com a fila cheia, wait rejeita sem enfileirar o trabalho."""
+        executor = self.make_executor(1, 1)
+        release = Event()
+        submit = Mock()
+
+        async def scenario():
+            blocked = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(InferenceQueueFull):
+                await executor.wait(submit)
+            release.set()
+            await blocked
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+        submit.assert_not_called()
+        self.assertEqual(executor.stats()['pending'], 0)
+
+    def test_slots_released(self):
+        """Após concluir, as vagas voltam a ficar disponíveis."""
+        executor = self.make_executor(1, 1)
+        for i in range(5):
+            self.assertEqual(asyncio.run(executor.run(lambda x: x, i)), i)
+
+if __name__ == "__main__":
+    unittest.main()
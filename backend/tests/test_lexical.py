@@ -0,0 +1,150 @@
+# test_lexical.py
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lexical import LexicalCascade, normalize_text, lexical_similarity
+
+def _full_similarity(answer: str, reference: str) -> float:
+    """Similaridade pela tabela completa de Levenshtein, para comparar com a versão em faixa."""
+    a, b = answer.split(), reference.split()
+    previous = list(range(len(b) + 1))
+    for i, word in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other)))
+        previous = current
+    return 1 - previous[-1] / max(len(a), len(b))
+
+class TestLexical(unittest.TestCase):
+
+    def make_cascade(self, enabled: bool = True) -> LexicalCascade:
+        return LexicalCascade(enabled, near_copy_threshold=0.9, min_chars=2)
+
+    # ==========================================
+    # 1. TESTES DE NORMALIZAÇÃO E SIMILARIDADE
+    # ==========================================
+
+    def test_normalize_text(self):
+        """Acentos, maiúsculas, pontuação e espaços extras são ignorados."""
+        self.assertEqual(normalize_text("  Ação,   REAÇÃO!  "), "acao reacao")
+        self.assertEqual(normalize_text("?!..."), "")
+
+    def test_lexical_similarity(self):
+        """Distância de edição entre as palavras: iguais valem 1, trocas de ordem e textos sem relação pesam."""
+        reference = normalize_text("A fotossíntese converte luz em energia química")
+        self.assertEqual(lexical_similarity(reference, reference), 1.0)
+        typo = normalize_text("A fotossintese converte luz em energia quimicaa")
+        self.assertAlmostEqual(lexical_similarity(typo, reference), 6 / 7)
+        swapped = normalize_text("A fotossíntese converte química em energia luz")
+        self.assertAlmostEqual(lexical_similarity(swapped, reference), 5 / 7) # luz e química trocadas
+        self.assertEqual(lexical_similarity("banana", reference), 0.0)
+        self.assertEqual(lexical_similarity("", reference), 0.0)
+
+    def test_lexical_similarity_threshold(self):
+        """Com um limiar, o resultado é exato a partir dele e 0 abaixo, como no cálculo completo."""
+        import random
+        random.seed(7)
+        vocabulary = ["a", "luz", "gera", "energia", "quimica", "nao"]
+        for _ in range(300):
+            answer = " ".join(random.choices(vocabulary, k=random.randint(1, 12)))
+            reference = " ".join(random.choices(vocabulary, k=random.randint(1, 12)))
+            threshold = random.choice([0.5, 0.8, 0.9])
+            full = _full_similarity(answer, reference)
+            expected = full if full >= threshold else 0.0
+            self.assertAlmostEqual(lexical_similarity(answer, reference, threshold), expected)
+
+    def test_lexical_similarity_length_ratio(self):
+        """Resposta muito maior que a referência é descartada sem calcular a distância."""
+        reference = normalize_text("A fotossíntese converte luz em energia química")
+        long_answer = " ".join([reference] * 500)
+        with patch('lexical._edit_distance') as mock_distance:
+            self.assertEqual(lexical_similarity(long_answer, reference, 0.9), 0.0)
+        mock_distance.assert_not_called()
+
+    # ==========================================
+    # 2. TESTES DA CASCATA
+    # ==========================================
+
+    def test_exact_copy(self):
+        """Cópia de qualquer referência, após a normalização, recebe similaridade 1."""
+        cascade = self.make_cascade()
+        self.assertEqual(cascade.check("produz AÇÚCAR.", ["Produz glicose", "Produz açúcar"]), 1.0)
+        self.assertEqual(cascade.stats()['exact'], 1)
+
+    def test_near_copy(self):
+        """Quase cópias recebem a similaridade lexical, acima da faixa de 100 pontos."""
+        cascade = self.make_cascade()
+        reference = "A mitocôndria é responsável pela respiração celular e pela produção de energia"
+        similarity = cascade.check("A mitocôndria é responsável pela respiração celular e produção de energia.", [reference])
+        self.assertIsNotNone(similarity)
+        self.assertGreaterEqual(similarity, 0.9)
+        self.assertEqual(cascade.stats()['near_copy'], 1)
+
+    def test_negation_goes_to_encoder(self):
+        """Uma quase cópia que acrescenta ou remove uma negação vai para o codificador."""
+        cascade = self.make_cascade()
+        reference = "A mitocôndria é responsável pela respiração celular e pela produção de energia"
+        negated = "A mitocôndria não é responsável pela respiração celular e pela produção de energia"
+        self.assertIsNone(cascade.check(negated, [reference]))
+        self.assertIsNone(cascade.check(reference, [negated]))
+        self.assertEqual(cascade.stats()['encoder'], 2)
+
+    def test_word_order_goes_to_encoder(self):
+        """As mesmas palavras em outra ordem podem inverter o sentido e vão para o codificador."""
+        cascade = self.make_cascade()
+        reference = "A fotossíntese converte energia luminosa em energia química"
+        swapped = "A fotossíntese converte energia química em energia luminosa"
+        self.assertIsNone(cascade.check(swapped, [reference]))
+
+    def test_empty_reference_ignored(self):
+        """Respostas sem conteúdo recebem 0 mesmo se uma referência for vazia."""
+        cascade = self.make_cascade()
+        self.assertEqual(cascade.check("?", ["A mitocôndria produz energia", ""]), 0.0)
+        self.assertIsNone(cascade.check("Produz energia química", ["", "Ela produz ATP"]))
+        self.assertEqual(cascade.stats()['exact'], 0)
+
+    def test_blank(self):
+        """Respostas sem letras nem números suficientes recebem 0."""
+        cascade = self.make_cascade()
+        self.assertEqual(cascade.check("", ["Resposta"]), 0.0)
+        self.assertEqual(cascade.check(" . ", ["Resposta"]), 0.0)
+        self.assertEqual(cascade.check("x", ["Resposta"]), 0.0)
+        self.assertEqual(cascade.stats()['blank'], 3)
+
+    def test_short_exact_answer(self):
+        """Uma resposta curta igual ao gabarito é aceita antes da verificação de conteúdo."""
+        cascade = self.make_cascade()
+        self.assertEqual(cascade.check("4", ["4"]), 1.0)
+
+    def test_paraphrase_goes_to_encoder(self):
+        """Paráfrases, com pouca sobreposição de palavras, ficam para o codificador."""
+        cascade = self.make_cascade()
+        self.assertIsNone(cascade.check("As plantas fabricam açúcar com a luz do sol", ["A fotossíntese produz glicose"]))
+        self.assertIsNone(cascade.check("Sim", ["Não"]))
+        stats = cascade.stats()
+        self.assertEqual(stats['encoder'], 2)
+        self.assertEqual(stats['hit_rate'], 0.0)
+
+    def test_disabled(self):
+        """Desativada, a cascata envia todas as respostas ao codificador sem contabilizá-las."""
+        cascade = self.make_cascade(enabled=False)
+        self.assertIsNone(cascade.check("Resposta", ["Resposta"]))
+        self.assertEqual(cascade.stats()['encoder'], 0)
+
+    def test_hit_rate(self):
+        """hit_rate é a fração das respostas decididas sem o codificador."""
+        cascade = self.make_cascade()
+        cascade.check("Resposta", ["Resposta"])
+        cascade.check("", ["Resposta"])
+        cascade.check("Outra coisa", ["Resposta"])
+        cascade.check("Mais uma", ["Resposta"])
+        self.assertAlmostEqual(cascade.stats()['hit_rate'], 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# test_loadgen.py
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import json
+import tempfile
+import sys
+import os
+
+import httpx
+
+# Adiciona as pastas backend e backend/tools ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+
+import loadgen
+from app import app
+import question
+
+class TestLoadgen(unittest.TestCase):
+
+    # ==========================================
+    # 1. TESTES DO PERFIL
+    # ==========================================
+
+    def test_load_profile_precedence(self):
+        """Arquivo sobrescreve os padrões e a linha de comando sobrescreve o arquivo."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'perfil.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'students': 10, 'admins': 3}, f)
+            profile = loadgen.load_profile(path, {'students': 20, 'seed': None})
+        self.assertEqual(profile['students'], 20)
+        self.assertEqual(profile['admins'], 3)
+        self.assertEqual(profile['seed'], loadgen.DEFAULT_PROFILE['seed'])
+
+    def test_load_profile_unknown_key(self):
+        """Chaves desconhecidas no arquivo são rejeitadas (evita erros de digitação silenciosos)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'perfil.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'studens': 10}, f)
+            with self.assertRaises(ValueError):
+                loadgen.load_profile(path, {})
+
+    # ==========================================
+    # 2. TESTES DAS ESTATÍSTICAS
+    # ==========================================
+
+    def test_endpoint_stats_summary(self):
+        """Erros HTTP (>= 400) e falhas de conexão entram na taxa de erros de cada rota."""
+        stats = loadgen.EndpointStats()
+        stats.record('GET /questions', 0.010, 200)
+        stats.record('GET /questions', 0.030, 200)
+        stats.record('POST /questions/evaluate/{id}', 0.100, 200)
+        stats.record('POST /questions/evaluate/{id}', 0.200, 503)
+        stats.record('POST /questions/evaluate/{id}', 0.300, 'ReadTimeout')
+
+        report = stats.summary(elapsed=2.0)
+        listing = report['GET /questions']
+        self.assertEqual(listing['errors'], 0)
+        self.assertAlmostEqual(listing['latency_ms']['p50'], 20.0)
+        self.assertAlmostEqual(listing['rps'], 1.0)
+
+        evaluate = report['POST /questions/evaluate/{id}']
+        self.assertEqual(evaluate['requests'], 3)
+        self.assertEqual(evaluate['errors'], 2)
+        self.assertEqual(evaluate['statuses'], {'200': 1, '503': 1, 'ReadTimeout': 1})
+        self.assertAlmostEqual(evaluate['latency_ms']['max'], 300.0)
+
+    # ==========================================
+    # 3. TESTE DE PONTA A PONTA (APP EM PROCESSO)
+    # ==========================================
+
+    @patch('app.evaluate', return_value=80)
+    def test_run_against_app(self, _):
+        """Um perfil pequeno exercita todas as rotas e remove as questões dos administradores."""
+        for patcher in (patch('question.embeddings'), patch('question._embeddings_loaded', True),
+                        patch('question._store', question.JsonStore()),
+                        patch('storage.QUESTIONS_LOG_PATH', os.path.join('inexistente', 'questions.log')),
+                        patch.dict(question.questions, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        question.embeddings.search_statements.return_value = []
+        question.questions['q1'] = {"question_id": "q1", "statement": "E1", "correct_answer": "R1"}
+
+        profile = dict(loadgen.DEFAULT_PROFILE, students=4, ramp_seconds=0.0, answers_per_student=2,
+                       think_seconds=[0.0, 0.0], admins=2, admin_edits=2, admin_interval_seconds=0.0)
+        generator = loadgen.LoadGenerator(profile, 'http://flavify', transport=httpx.ASGITransport(app=app))
+        report = asyncio.run(generator.run())
+
+        endpoints = report['endpoints']
+        self.assertEqual(endpoints['GET /questions']['requests'], 4 + 2)
+        self.assertEqual(endpoints['POST /questions/evaluate/{id}']['requests'], 4 * 2)
+        self.assertEqual(endpoints['PUT /questions/{id}']['requests'], 2 * 2)
+        self.assertEqual(endpoints['POST /questions']['requests'], 2)
+        self.assertTrue(all(stats['errors'] == 0 for stats in endpoints.values()))
+        self.assertEqual(list(question.questions), ['q1'])
+
+if __name__ == '__main__':
+    unittest.main()
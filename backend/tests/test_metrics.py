@@ -0,0 +1,92 @@
+# test_metrics.py
+
+import unittest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import metrics
+from metrics import Counter, Histogram, MetricsMiddleware, register_gauge, render
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        """Cada teste registra suas métricas em um registro vazio."""
+        patcher = patch('metrics._registry', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # ==========================================
+    # 1. TESTES DE FORMATO
+    # ==========================================
+
+    def test_counter(self):
+        """Contadores são exibidos por rótulo."""
+        counter = Counter('x_total', "Teste.", ('route',))
+        counter.inc('/a')
+        counter.inc('/a', amount=2)
+        text = render()
+        self.assertIn("# TYPE x_total counter", text)
+        self.assertIn('x_total{route="/a"} 3', text)
+
+    def test_histogram_cumulative_buckets(self):
+        """As faixas do histograma são acumuladas e terminam em +Inf."""
+        histogram = Histogram('h_seconds', "Teste.", ('stage',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, 'forward')
+        text = render()
+        self.assertIn('h_seconds_bucket{stage="forward",le="0.1"} 1', text)
+        self.assertIn('h_seconds_bucket{stage="forward",le="1.0"} 3', text)
+        self.assertIn('h_seconds_bucket{stage="forward",le="+Inf"} 4', text)
+        self.assertIn('h_seconds_count{stage="forward"} 4', text)
+        self.assertIn('h_seconds_sum{stage="forward"} 4.25', text)
+
+    def test_histogram_time(self):
+        """O cronômetro registra uma observação."""
+        histogram = Histogram('t_seconds', "Teste.")
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count(), 1)
+
+    def test_gauge_and_escaping(self):
+        """Gauges são lidos na coleta e os valores dos rótulos são escapados."""
+        register_gauge('g', "Teste.", lambda: {('a"b',): 1.5}, ('name',))
+        self.assertIn('g{name="a\\"b"} 1.5', render())
+
+    def test_failing_gauge_is_skipped(self):
+        """Uma métrica com erro não impede as demais."""
+        register_gauge('ruim', "Teste.", lambda: 1 / 0)
+        register_gauge('boa', "Teste.", lambda: 2)
+        text = render()
+        self.assertNotIn('ruim ', text)
+        self.assertIn('boa 2', text)
+
+    # ==========================================
+    # 2. TESTES DO MIDDLEWARE
+    # ==========================================
+
+    def test_middleware_uses_route_template(self):
+        """Requisições são contadas pelo caminho da rota, não pela URL concreta."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get('/items/{item_id}')
+        def item(item_id: str) -> dict[str, str]:
+            return {'id': item_id}
+
+        client = TestClient(app)
+        before = metrics.HTTP_REQUESTS.value('GET', '/items/{item_id}', '200')
+        client.get('/items/1')
+        client.get('/items/2')
+        client.get('/inexistente')
+        self.assertEqual(metrics.HTTP_REQUESTS.value('GET', '/items/{item_id}', '200'), before + 2)
+        self.assertGreaterEqual(metrics.HTTP_REQUESTS.value('GET', 'unmatched', '404'), 1)
+        self.assertGreaterEqual(metrics.HTTP_LATENCY.count('GET', '/items/{item_id}'), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ import unittest
 from unittest.mock import patch, MagicMock, Mock
 import sys
 import os
+import numpy as np
 
 # Adiciona o diretório pai ao path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -12,6 +13,10 @@ import natural_language
 
 class TestSentenceSimilarity(unittest.TestCase):
 
+    def setUp(self):
+        """Esvazia o registro de modelos para que cada teste use seu próprio mock."""
+        natural_language._models.clear()
+
     # ==========================================
     # 1. TESTES DE SUCESSO (HAPPY PATH)
     # ==========================================
@@ -91,5 +96,219 @@ class TestSentenceSimilarity(unittest.TestCase):
         with self.assertRaises(Exception):
             natural_language.sentence_similarity("A", "B")
 
+    # ==========================================
+    # 4. TESTES DO REGISTRO DE MODELOS
+    # ==========================================
+
+    @patch('natural_language.util.cos_sim')
+    @patch('natural_language.SentenceTransformer')
+    def test_model_loaded_once(self, mock_transformer_class: Mock, mock_cos_sim: Mock):
+        """O modelo deve ser carregado apenas uma vez entre avaliações."""
+        mock_cos_sim.return_value.item.return_value = 0.5
+
+        natural_language.sentence_similarity("A", "B")
+        natural_language.sentence_similarity("C", "D")
+
+        mock_transformer_class.assert_called_once()
+
+    @patch('natural_language.SentenceTransformer')
+    def test_model_device_config(self, mock_transformer_class: Mock):
+        """O dispositivo configurado deve ser repassado ao modelo."""
+        with patch('natural_language.config.MODEL_DEVICE', 'cpu'):
+            natural_language.get_model()
+        mock_transformer_class.assert_called_with("paraphrase-multilingual-MiniLM-L12-v2", device="cpu")
+
+    @patch('natural_language.SentenceTransformer')
+    def test_model_distinct_names(self, mock_transformer_class: Mock):
+        """Modelos com nomes diferentes ocupam entradas diferentes no registro."""
+        natural_language.get_model("modelo-a")
+        natural_language.get_model("modelo-b")
+        natural_language.get_model("modelo-a")
+        self.assertEqual(mock_transformer_class.call_count, 2)
+
+    @patch('natural_language.SentenceTransformer')
+    def test_model_concurrent_load(self, mock_transformer_class: Mock):
+        """Chamadas concorrentes devem compartilhar uma única instância."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(lambda _: natural_language.get_model(), range(32)))
+
+        mock_transformer_class.assert_called_once()
+        self.assertTrue(all(m is models[0] for m in models))
+
+    @patch('natural_language.util.cos_sim')
+    @patch('natural_language.SentenceTransformer')
+    def test_similarity_with_precomputed_embedding(self, mock_transformer_class: Mock, mock_cos_sim: Mock):
+        """Com o embedding do gabarito informado, apenas a resposta é codificada."""
+        mock_model_instance = mock_transformer_class.return_value
+        mock_cos_sim.return_value.item.return_value = 0.8
+
+        result = natural_language.sentence_similarity("Resposta", "Gabarito", MagicMock())
+
+        self.assertEqual(result, 0.8)
+        mock_model_instance.encode.assert_called_once_with("Resposta")
+
+    # ==========================================
+    # 5. TESTES DE AVALIAÇÃO EM LOTE
+    # ==========================================
+
+    @patch('natural_language.SentenceTransformer')
+    def test_batch_similarity(self, mock_transformer_class: Mock):
+        """Cada frase é comparada apenas com o gabarito da sua linha."""
+        mock_model_instance = mock_transformer_class.return_value
+        mock_model_instance.encode.return_value = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+        references = np.array([[1.0, 0.0], [1.0, 0.0], [-1.0, -1.0]])
+
+        result = natural_language.batch_sentence_similarity(["a", "b", "c"], references)
+
+        self.assertEqual(len(result), 3)
+        self.assertAlmostEqual(result[0], 1.0, places=5)
+        self.assertAlmostEqual(result[1], 0.0, places=5)
+        self.assertEqual(result[2], 0.0) # Negativo vira 0
+        mock_model_instance.encode.assert_called_once_with(["a", "b", "c"], batch_size=3)
+
+    @patch('natural_language.SentenceTransformer')
+    def test_batch_similarity_multiple_references(self, mock_transformer_class: Mock):
+        """Com counts, cada frase recebe o maior cosseno entre as suas referências."""
+        mock_model_instance = mock_transformer_class.return_value
+        mock_model_instance.encode.return_value = np.array([[1.0, 0.0], [0.0, 1.0]])
+        references = np.array([[-1.0, 0.0], [1.0, 1.0], [1.0, 0.0], [0.0, -1.0]])
+
+        result = natural_language.batch_sentence_similarity(["a", "b"], references, [3, 1])
+
+        self.assertAlmostEqual(result[0], 1.0, places=5)
+        self.assertEqual(result[1], 0.0) # Negativo vira 0
+
+    @patch('natural_language.SentenceTransformer')
+    def test_sentence_similarity_multiple_references(self, mock_transformer_class: Mock):
+        """A resposta é codificada uma vez e comparada com todas as referências."""
+        mock_model_instance = mock_transformer_class.return_value
+        mock_model_instance.encode.return_value = np.array([0.0, 1.0])
+        references = np.array([[1.0, 0.0], [1.0, 1.0], [-1.0, 0.0]])
+
+        result = natural_language.sentence_similarity("Resposta", ["A", "B", "C"], references)
+
+        self.assertAlmostEqual(result, 2 ** -0.5, places=5)
+        mock_model_instance.encode.assert_called_once_with("Resposta")
+
+    @patch('natural_language.SentenceTransformer')
+    def test_batch_similarity_empty(self, mock_transformer_class: Mock):
+        """Lote vazio não chama o modelo."""
+        self.assertEqual(natural_language.batch_sentence_similarity([], np.empty((0, 2))), [])
+        mock_transformer_class.assert_not_called()
+
+    # ==========================================
+    # 6. TESTES DOS BACKENDS DO CODIFICADOR
+    # ==========================================
+
+    @patch('natural_language.SentenceTransformer')
+    def test_backend_onnx(self, mock_transformer_class: Mock):
+        """O backend onnx carrega o modelo pelo ONNX Runtime."""
+        natural_language.get_model(backend="onnx")
+        mock_transformer_class.assert_called_with("paraphrase-multilingual-MiniLM-L12-v2", backend="onnx")
+
+    @patch('natural_language.export_onnx_int8', return_value="data/onnx/modelo")
+    @patch('natural_language.SentenceTransformer')
+    def test_backend_onnx_int8(self, mock_transformer_class: Mock, mock_export: Mock):
+        """O backend onnx-int8 carrega a variante quantizada exportada."""
+        with patch('natural_language.config.ONNX_QUANTIZATION', 'avx2'):
+            natural_language.get_model(backend="onnx-int8")
+        mock_transformer_class.assert_called_with(
+            "data/onnx/modelo", backend="onnx", model_kwargs={'file_name': "onnx/model_qint8_avx2.onnx"}
+        )
+
+    @patch('natural_language.SentenceTransformer')
+    def test_backend_unknown(self, mock_transformer_class: Mock):
+        """Backend desconhecido deve gerar ValueError."""
+        with self.assertRaises(ValueError):
+            natural_language.get_model(backend="tensorflow")
+
+    @patch('natural_language.SentenceTransformer')
+    def test_backends_cached_separately(self, mock_transformer_class: Mock):
+        """Backends diferentes do mesmo modelo ocupam entradas diferentes no registro."""
+        natural_language.get_model(backend="torch")
+        natural_language.get_model(backend="onnx")
+        self.assertEqual(mock_transformer_class.call_count, 2)
+
+    def test_model_version(self):
+        """A versão do modelo identifica o backend quando não é torch."""
+        self.assertEqual(natural_language.model_version("m", "torch"), "m")
+        self.assertEqual(natural_language.model_version("m", "onnx-int8"), "m@onnx-int8")
+
+    # ==========================================
+    # 7. TESTES DAS MÉTRICAS
+    # ==========================================
+
+    @patch('natural_language.SentenceTransformer')
+    def test_stage_metrics(self, mock_transformer_class: Mock):
+        """A carga do modelo e as etapas tokenize/forward são registradas nas métricas."""
+        model = mock_transformer_class.return_value
+        model.encode.side_effect = lambda sentences, **kwargs: (model.preprocess(sentences), np.ones((2, 4)))[1]
+        forward_before = natural_language.STAGE_SECONDS.count('forward')
+        tokenize_before = natural_language.STAGE_SECONDS.count('tokenize')
+
+        natural_language.encode(["a", "b"])
+
+        self.assertIn(natural_language.model_version(), natural_language.MODEL_LOAD_SECONDS)
+        self.assertEqual(natural_language.STAGE_SECONDS.count('forward'), forward_before + 1)
+        self.assertEqual(natural_language.STAGE_SECONDS.count('tokenize'), tokenize_before + 1)
+
+    # ==========================================
+    # 8. TESTES DE RESPOSTAS LONGAS
+    # ==========================================
+
+    def test_split_answer(self):
+        """Frases inteiras são agrupadas em janelas; frases maiores que a janela são divididas."""
+        self.assertEqual(natural_language.split_answer("uma resposta curta", 5, 4), ["uma resposta curta"])
+        text = "Um dois três. Quatro cinco. Seis sete oito nove dez onze doze treze."
+        self.assertEqual(natural_language.split_answer(text, 5, 10),
+                         ["Um dois três. Quatro cinco.", "Seis sete oito nove dez", "onze doze treze."])
+
+    def test_split_answer_cap(self):
+        """O limite de trechos descarta o restante da resposta (custo linear e limitado)."""
+        text = " ".join(f"p{i}" for i in range(100))
+        chunks = natural_language.split_answer(text, 10, 3)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[2].split()[-1], "p29")
+
+    @patch('natural_language.config.LONG_ANSWER_CHUNK_WORDS', 2)
+    @patch('natural_language.SentenceTransformer')
+    def test_long_answer_modes(self, mock_transformer_class: Mock):
+        """Os trechos são codificados em uma chamada e combinados conforme o modo."""
+        model = mock_transformer_class.return_value
+        # Dois trechos: um idêntico à referência e outro ortogonal a ela
+        model.encode.return_value = np.array([[1.0, 0.0], [0.0, 1.0]])
+        reference = np.array([1.0, 0.0])
+        expected = {'max': 1.0, 'mean': 0.5, 'coverage': 2 ** -0.5}
+        for mode, similarity in expected.items():
+            with patch('natural_language.config.LONG_ANSWER_MODE', mode):
+                model.encode.reset_mock()
+                result = natural_language.sentence_similarity("a b. c d.", "ref", reference)
+                self.assertAlmostEqual(result, similarity, places=5)
+                model.encode.assert_called_once_with(["a b.", "c d."], batch_size=2)
+
+    @patch('natural_language.config.LONG_ANSWER_MODE', 'max')
+    @patch('natural_language.config.LONG_ANSWER_CHUNK_WORDS', 2)
+    @patch('natural_language.SentenceTransformer')
+    def test_long_answer_batch(self, mock_transformer_class: Mock):
+        """No lote, os trechos das respostas longas e as respostas curtas vão ao modelo juntos."""
+        model = mock_transformer_class.return_value
+        model.encode.return_value = np.array([[0.0, 1.0], [1.0, 0.0], [0.0, 1.0]])
+        references = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, -1.0]])
+
+        result = natural_language.batch_sentence_similarity(["a b. c d.", "curta"], references, [1, 2])
+
+        model.encode.assert_called_once_with(["a b.", "c d.", "curta"], batch_size=3)
+        self.assertAlmostEqual(result[0], 1.0, places=5)
+        self.assertAlmostEqual(result[1], 0.0, places=5)
+
+    @patch('natural_language.config.LONG_ANSWER_MODE', 'mediana')
+    @patch('natural_language.SentenceTransformer')
+    def test_long_answer_unknown_mode(self, mock_transformer_class: Mock):
+        """Um modo desconhecido gera ValueError."""
+        with self.assertRaises(ValueError):
+            natural_language.sentence_similarity("a", "b")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
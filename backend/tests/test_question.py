@@ -5,6 +5,7 @@ from unittest.mock import patch, mock_open, Mock
 import sys
 import os
 import json
+import numpy as np
 
 # Adiciona o diretório pai (backend) ao sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -16,6 +17,24 @@ class TestQuestion(unittest.TestCase):
     def setUp(self):
         """Limpa o banco de dados em memória antes de cada teste."""
         question.questions.clear()
+        question.similarity_cache.clear()
+
+        # Evita carregar o modelo de IA ao criar ou atualizar questões
+        patcher = patch('question.embeddings')
+        self.mock_embeddings = patcher.start()
+        self.mock_embeddings.search_statements.return_value = []
+        self.addCleanup(patcher.stop)
+
+        # Como se o processo já tivesse carregado os embeddings do banco (aquecimento)
+        patcher = patch('question._embeddings_loaded', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Cada teste começa com um armazenamento sem log, e o log nunca aponta para a pasta data real
+        for patcher in (patch('question._store', question.JsonStore()),
+                        patch('storage.QUESTIONS_LOG_PATH', os.path.join('inexistente', 'questions.log'))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
     # 1. TESTES DE CRIAÇÃO (CREATE)
 
@@ -28,6 +47,56 @@ class TestQuestion(unittest.TestCase):
         q_id = list(question.questions.keys())[0]
         self.assertEqual(question.questions[q_id]['statement'], "Qual a cor?")
 
+    def test_create_questions_batch(self):
+        """Criação em lote: ids informados são preservados e a ordem de criação é mantida."""
+        ids = question.create_questions([
+            {"statement": "Q1", "correct_answer": "A1"},
+            {"question_id": "fixo", "statement": "Q2", "correct_answer": "A2"},
+        ])
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(ids[1], "fixo")
+        self.assertEqual([q['statement'] for q in question.iter_questions()], ["Q1", "Q2"])
+        self.assertEqual(question.create_questions([]), [])
+
+    def test_create_questions_single_embedding_batch(self):
+        """Um lote gera uma única gravação e um único lote de embeddings."""
+        with patch('question._store') as mock_store:
+            mock_store.has_external_changes.return_value = False
+            question.create_questions([{"statement": f"Q{i}", "correct_answer": f"A{i}"} for i in range(5)])
+        mock_store.upsert_many.assert_called_once()
+        self.assertEqual(len(self.mock_embeddings.precompute.call_args.args[0]), 5)
+        self.mock_embeddings.precompute.assert_called_once()
+
+    def test_create_questions_existing_id(self):
+        """Um id já existente (no banco ou repetido no lote) é ignorado, sem sobrescrever a questão."""
+        question.create_questions([{"question_id": "x", "statement": "Original", "correct_answer": "A"}])
+        self.mock_embeddings.reset_mock()
+
+        ids = question.create_questions([
+            {"question_id": "x", "statement": "Sobrescrita", "correct_answer": "B"},
+            {"question_id": "y", "statement": "Nova", "correct_answer": "C"},
+            {"question_id": "y", "statement": "Repetida", "correct_answer": "D"},
+        ])
+        self.assertEqual(ids, [None, "y", None])
+        self.assertEqual(question.questions["x"]['statement'], "Original")
+        self.assertEqual(question.questions["y"]['statement'], "Nova")
+        self.mock_embeddings.precompute.assert_called_once_with([("y", ["C"])])
+
+        # Um lote só com ids existentes não grava nem muda a versão
+        version = question.get_version()
+        self.assertEqual(question.create_questions([{"question_id": "x", "statement": "S", "correct_answer": "A"}]), [None])
+        self.assertEqual(question.get_version(), version)
+
+    def test_create_questions_reused_id(self):
+        """Reimportar o id de uma questão removida não a repete na listagem."""
+        question.create_questions([{"question_id": "x", "statement": "Q", "correct_answer": "A"}])
+        question.create_question("Outra", "B")
+        question.delete_question("x")
+        question.create_questions([{"question_id": "x", "statement": "Q", "correct_answer": "A"}])
+        page, _ = question.list_questions()
+        self.assertEqual(sorted(page), sorted(question.questions))
+        self.assertEqual(len(list(question.iter_questions())), 2)
+
     def test_create_question_empty_strings(self):
         """Criação com strings vazias (Limite)."""
         # O sistema permite criar questão sem texto? Sim. Vamos garantir que não quebra.
@@ -95,7 +164,8 @@ class TestQuestion(unittest.TestCase):
 
         for sim_value, expected_score in scenarios:
             mock_similarity.return_value = sim_value
-            score = question.evaluate(q_id, "Resposta")
+            # Respostas distintas, para não serem atendidas pelo cache de similaridades
+            score = question.evaluate(q_id, f"Resposta {sim_value}")
             self.assertEqual(score, expected_score, f"Falha para similaridade {sim_value}")
 
     @patch('question.sentence_similarity')
@@ -108,6 +178,239 @@ class TestQuestion(unittest.TestCase):
         score = question.evaluate(q_id, "")
         self.assertEqual(score, 0)
 
+    @patch('question.batcher')
+    def test_evaluate_micro_batching(self, mock_batcher: Mock):
+        """Com janela configurada, a avaliação passa pela fila de lotes."""
+        mock_batcher.submit.return_value.result.return_value = 0.5
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+
+        with patch('question.config.BATCH_WINDOW_MS', 5):
+            score = question.evaluate(q_id, "Resposta")
+
+        self.assertEqual(score, 70)
+        mock_batcher.submit.assert_called_once()
+
+    @patch('question.batch_similarity')
+    def test_evaluate_worker_pool(self, mock_batch: Mock):
+        """Com processos de inferência configurados, a avaliação é enviada ao pool."""
+        self.mock_embeddings.get_reference_embeddings.return_value = np.zeros((1, 4))
+        mock_batch.return_value = [0.95]
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+
+        with patch('question.config.INFERENCE_PROCESSES', 2):
+            score = question.evaluate(q_id, "Resposta")
+
+        self.assertEqual(score, 100)
+        answers, matrix, counts = mock_batch.call_args.args
+        self.assertEqual(answers, ["Resposta"])
+        self.assertEqual(matrix.shape, (1, 4))
+        self.assertEqual(counts, [1])
+
+    @patch('question.grading_stats')
+    @patch('question.submissions')
+    @patch('question.sentence_similarity', return_value=0.65)
+    def test_evaluate_records_submission(self, _, mock_submissions: Mock, mock_stats: Mock):
+        """Cada avaliação, inclusive as atendidas pelo cache, é enviada ao histórico e às estatísticas."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+
+        question.evaluate(q_id, "Resposta")
+        question.evaluate(q_id, "Resposta")
+        question.evaluate("id_falso", "Resposta")
+
+        self.assertEqual(mock_submissions.record.call_count, 2)
+        mock_submissions.record.assert_called_with(q_id, "Resposta", 0.65, 70)
+        self.assertEqual(mock_stats.record.call_count, 2)
+        mock_stats.record.assert_called_with(q_id, 0.65, 70)
+
+        question.delete_question(q_id)
+        mock_stats.forget.assert_called_once_with(q_id)
+
+    @patch('question.batch_similarity')
+    @patch('question.sentence_similarity', return_value=0.5)
+    def test_evaluate_lexical_cascade(self, mock_similarity: Mock, mock_batch: Mock):
+        """Cópias do gabarito (ou de uma alternativa) e respostas vazias não chamam o modelo."""
+        question.create_question("Q", "A fotossíntese produz glicose.", ["Produz açúcar"])
+        q_id = list(question.questions.keys())[0]
+        mock_batch.return_value = [0.5]
+
+        with patch('question._embeddings_loaded', False):
+            self.assertEqual(question.evaluate(q_id, "a FOTOSSINTESE produz glicose"), 100)
+            self.assertEqual(question.evaluate(q_id, "produz açúcar!"), 100)
+            self.assertEqual(question.evaluate(q_id, "  ?  "), 0)
+            self.assertEqual(question.evaluate_batch([(q_id, "A fotossíntese produz glicose."), (q_id, "Luz")]), [100, 70])
+            mock_similarity.assert_not_called()
+            self.mock_embeddings.load_embeddings.assert_called_once()
+
+            self.assertEqual(question.evaluate(q_id, "Energia solar"), 70)
+            mock_similarity.assert_called_once()
+
+        with patch('question.cascade.enabled', False):
+            question.evaluate(q_id, "Produz açúcar")
+        self.assertEqual(mock_similarity.call_count, 2)
+
+    @patch('question.batch_similarity')
+    def test_evaluate_batch_scores(self, mock_batch: Mock):
+        """Avaliação em lote mantém a ordem e as faixas de pontuação."""
+        self.mock_embeddings.get_reference_embeddings.return_value = np.zeros((1, 4))
+        question.create_question("Q1", "A1")
+        question.create_question("Q2", "A2")
+        id1, id2 = list(question.questions.keys())
+        mock_batch.return_value = [0.95, 0.15, 0.35]
+
+        scores = question.evaluate_batch([(id1, "r1"), (id2, "r2"), ("id_falso", "r3"), (id1, "r4")])
+
+        self.assertEqual(scores, [100, 0, -1, 40])
+        mock_batch.assert_called_once()
+        answers, matrix, _ = mock_batch.call_args.args
+        self.assertEqual(answers, ["r1", "r2", "r4"])
+        self.assertEqual(matrix.shape, (3, 4))
+
+    @patch('question.batch_similarity')
+    def test_evaluate_batch_all_missing(self, mock_batch: Mock):
+        """Lote só com questões inexistentes não chama o modelo."""
+        scores = question.evaluate_batch([("x", "r"), ("y", "r")])
+        self.assertEqual(scores, [-1, -1])
+        mock_batch.assert_not_called()
+
+    @patch('question.batch_similarity')
+    def test_evaluate_batch_empty(self, mock_batch: Mock):
+        """Lote vazio retorna lista vazia."""
+        self.assertEqual(question.evaluate_batch([]), [])
+        mock_batch.assert_not_called()
+
+    # TESTES DO CACHE DE SIMILARIDADES
+
+    @patch('question.sentence_similarity')
+    def test_evaluate_cached_repeat(self, mock_similarity: Mock):
+        """Respostas repetidas (mesmo com espaços diferentes) não chamam o modelo."""
+        mock_similarity.return_value = 0.95
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+
+        self.assertEqual(question.evaluate(q_id, "não sei"), 100)
+        self.assertEqual(question.evaluate(q_id, "  não   sei "), 100)
+
+        mock_similarity.assert_called_once()
+        self.assertEqual(question.similarity_cache.stats()['hits'], 1)
+
+    @patch('question.sentence_similarity')
+    def test_update_invalidates_cached_similarity(self, mock_similarity: Mock):
+        """Mudar o gabarito descarta as similaridades memorizadas."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+
+        mock_similarity.return_value = 0.95
+        question.evaluate(q_id, "Resposta")
+        question.update_question(q_id, "Q", "Outro gabarito")
+        mock_similarity.return_value = 0.10
+
+        self.assertEqual(question.evaluate(q_id, "Resposta"), 0)
+        self.assertEqual(mock_similarity.call_count, 2)
+
+    @patch('question.batch_similarity')
+    def test_evaluate_batch_uses_cache(self, mock_batch: Mock):
+        """A avaliação em lote só codifica as respostas fora do cache."""
+        self.mock_embeddings.get_reference_embeddings.return_value = np.zeros((1, 4))
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        question.similarity_cache.put(q_id, "memorizada", 0.95, question.similarity_cache.generation(q_id))
+        mock_batch.return_value = [0.10]
+
+        scores = question.evaluate_batch([(q_id, "memorizada"), (q_id, "nova")])
+
+        self.assertEqual(scores, [100, 0])
+        self.assertEqual(mock_batch.call_args.args[0], ["nova"])
+
+    # TESTES DE PAGINAÇÃO (list_questions)
+
+    def test_list_questions_pages(self):
+        """Percorrer as páginas retorna cada questão uma vez, na ordem de criação."""
+        for i in range(7):
+            question.create_question(f"Q{i}", f"A{i}")
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page, cursor = question.list_questions(limit=3, cursor=cursor)
+            seen.extend(q['statement'] for q in page.values())
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f"Q{i}" for i in range(7)])
+
+    def test_list_questions_delete_between_pages(self):
+        """Remoções entre páginas não invalidam o cursor nem repetem questões."""
+        for i in range(6):
+            question.create_question(f"Q{i}", "A")
+        ids = list(question.questions.keys())
+
+        page, cursor = question.list_questions(limit=2)
+        question.delete_question(ids[1])
+        question.delete_question(ids[2])
+        page, cursor = question.list_questions(limit=2, cursor=cursor)
+
+        self.assertEqual([q['statement'] for q in page.values()], ["Q3", "Q4"])
+
+    def test_list_questions_filter(self):
+        """O filtro de texto considera apenas o enunciado."""
+        question.create_question("Qual a COR do céu?", "Azul")
+        question.create_question("Quanto é 2+2?", "cor")
+        page, _ = question.list_questions(text="cor")
+        self.assertEqual([q['statement'] for q in page.values()], ["Qual a COR do céu?"])
+
+    def test_list_questions_fields(self):
+        """A projeção retorna apenas os campos pedidos."""
+        question.create_question("Q", "A")
+        page, _ = question.list_questions(fields=['question_id', 'statement'])
+        self.assertNotIn('correct_answer', list(page.values())[0])
+
+    def test_list_questions_invalid(self):
+        """Cursor ou campos inválidos geram ValueError."""
+        with self.assertRaises(ValueError):
+            question.list_questions(cursor="abc")
+        with self.assertRaises(ValueError):
+            question.list_questions(fields=['senha'])
+
+    def test_iter_questions(self):
+        """A iteração segue a ordem de criação, com projeção e sem questões removidas."""
+        for i in range(4):
+            question.create_question(f"Q{i}", f"A{i}")
+        question.delete_question(list(question.questions)[1])
+        rows = list(question.iter_questions(['statement']))
+        self.assertEqual(rows, [{'statement': "Q0"}, {'statement': "Q2"}, {'statement': "Q3"}])
+        with self.assertRaises(ValueError):
+            question.iter_questions(['senha'])
+
+    def test_list_questions_external_changes(self):
+        """Alterações diretas no dicionário são refletidas na listagem."""
+        question.create_question("Q1", "A1")
+        question.questions.clear()
+        question.questions["x"] = {"question_id": "x", "statement": "S", "correct_answer": "C"}
+        page, _ = question.list_questions()
+        self.assertEqual(list(page.keys()), ["x"])
+
+    def test_version_bumped_by_mutations(self):
+        """Criação, atualização e remoção incrementam a versão; leituras não."""
+        v0 = question.get_version()
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        v1 = question.get_version()
+        self.assertEqual(question.get_version(), v1)
+        question.update_question(q_id, "Q2", "A2")
+        v2 = question.get_version()
+        question.delete_question(q_id)
+        v3 = question.get_version()
+        self.assertTrue(v0 < v1 < v2 < v3)
+
+    def test_version_failed_mutation(self):
+        """Operações em questões inexistentes não mudam a versão."""
+        v0 = question.get_version()
+        question.update_question("fake_id", "Q", "A")
+        question.delete_question("fake_id")
+        self.assertEqual(question.get_version(), v0)
+
     # 4. TESTES DE ATUALIZAÇÃO (UPDATE)
 
     def test_update_question_success(self):
@@ -146,15 +449,185 @@ class TestQuestion(unittest.TestCase):
         result = question.delete_question("fake_id")
         self.assertEqual(result, 0)
 
-    # 6. TESTES DE PERSISTÊNCIA (JSON)
+    # 6. TESTES DE EMBEDDINGS DOS GABARITOS
 
+    def test_create_question_precomputes_embedding(self):
+        """A criação deve calcular o embedding do gabarito."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.precompute.assert_called_with([(q_id, ["A"])])
+
+    def test_update_question_refreshes_embedding(self):
+        """O update deve recalcular o embedding do gabarito, sem recodificar o enunciado inalterado."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.index_statements.reset_mock()
+        question.update_question(q_id, "Q", "B")
+        self.mock_embeddings.precompute.assert_called_with([(q_id, ["B"])])
+        self.mock_embeddings.index_statements.assert_not_called()
+
+    def test_update_question_unchanged(self):
+        """Um update sem mudanças não recodifica nada, não grava e mantém as similaridades memorizadas."""
+        question.create_question("Q", "A", ["A2"])
+        q_id = list(question.questions.keys())[0]
+        question.similarity_cache.put(q_id, "resposta", 0.9, question.similarity_cache.generation(q_id))
+        self.mock_embeddings.reset_mock()
+        version = question.get_version()
+
+        self.assertEqual(question.update_question(q_id, "Q", "A"), 1)
+        self.assertEqual(question.update_question(q_id, "Q", "A", ["A2"]), 1)
+        self.mock_embeddings.precompute.assert_not_called()
+        self.mock_embeddings.index_statements.assert_not_called()
+        self.mock_embeddings.invalidate.assert_not_called()
+        self.assertEqual(question.get_version(), version)
+        self.assertEqual(question.similarity_cache.get(q_id, "resposta"), 0.9)
+
+        # Só o enunciado mudou: o gabarito não é recodificado e as similaridades continuam válidas
+        question.update_question(q_id, "Q editada", "A")
+        self.mock_embeddings.precompute.assert_not_called()
+        self.mock_embeddings.index_statements.assert_called_once_with([(q_id, "Q editada")])
+        self.assertEqual(question.similarity_cache.get(q_id, "resposta"), 0.9)
+
+    def test_alternative_answers(self):
+        """As respostas alternativas entram nas referências; o update sem alternativas as mantém."""
+        question.create_question("Q", "A", ["A2", "A3"])
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.precompute.assert_called_with([(q_id, ["A", "A2", "A3"])])
+        self.assertEqual(question.get_reference_answers(q_id), ["A", "A2", "A3"])
+
+        question.update_question(q_id, "Q", "B")
+        self.assertEqual(question.get_reference_answers(q_id), ["B", "A2", "A3"])
+        question.update_question(q_id, "Q", "B", [])
+        self.assertEqual(question.get_reference_answers(q_id), ["B"])
+        self.assertNotIn('alternative_answers', question.questions[q_id])
+
+    @patch('question.batch_similarity')
+    def test_evaluate_batch_multiple_references(self, mock_batch: Mock):
+        """No lote, as referências de todas as questões formam uma única matriz, com a contagem de cada uma."""
+        question.create_question("Q1", "A1", ["A1b", "A1c"])
+        question.create_question("Q2", "A2")
+        id1, id2 = list(question.questions.keys())
+        self.mock_embeddings.get_reference_embeddings.side_effect = lambda qid, texts: np.zeros((len(texts), 4))
+        mock_batch.return_value = [0.95, 0.15]
+
+        self.assertEqual(question.evaluate_batch([(id1, "r1"), (id2, "r2")]), [100, 0])
+        answers, matrix, counts = mock_batch.call_args.args
+        self.assertEqual(matrix.shape, (4, 4))
+        self.assertEqual(counts, [3, 1])
+
+    def test_delete_question_invalidates_embedding(self):
+        """O delete deve remover o embedding do gabarito."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        question.delete_question(q_id)
+        self.mock_embeddings.invalidate.assert_called_with(q_id)
+
+    def test_crud_maintains_statement_index(self):
+        """Criação e update devem indexar o enunciado; o delete o remove junto com os embeddings."""
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.index_statements.assert_called_with([(q_id, "Q")], None)
+        question.update_question(q_id, "Q2", "A")
+        self.mock_embeddings.index_statements.assert_called_with([(q_id, "Q2")])
+
+    def test_get_similar_questions(self):
+        """As questões similares trazem o enunciado e ignoram ids que não existem mais."""
+        question.create_question("Q1", "A")
+        question.create_question("Q2", "A")
+        q1, q2 = list(question.questions.keys())
+        self.mock_embeddings.similar_statements.return_value = [(q2, 0.8), ("removida", 0.5)]
+        result = question.get_similar_questions(q1, 3)
+        self.assertEqual(result, [{'question_id': q2, 'statement': "Q2", 'similarity': 0.8}])
+        self.mock_embeddings.similar_statements.assert_called_with(q1, 3)
+        self.assertIsNone(question.get_similar_questions("fake_id"))
+
+    def test_find_duplicates_threshold(self):
+        """Só enunciados acima do limiar são sinalizados como duplicatas."""
+        question.create_question("Q1", "A")
+        question.create_question("Q2", "A")
+        q1, q2 = list(question.questions.keys())
+        self.mock_embeddings.search_statements.return_value = [(q1, 0.95), (q2, 0.5)]
+        self.assertEqual(question.find_duplicates("Q1", threshold=0.9), [q1])
+        self.assertEqual(question.find_duplicates(""), [])
+
+    def test_search_questions(self):
+        """A busca semântica traz o enunciado e ignora ids que não existem mais."""
+        question.create_question("Fotossíntese", "Luz")
+        q_id = list(question.questions.keys())[0]
+        self.mock_embeddings.search_questions.return_value = [("removida", 0.9), (q_id, 0.7)]
+        result = question.search_questions("plantas", 2)
+        self.assertEqual(result, [{'question_id': q_id, 'statement': "Fotossíntese", 'similarity': 0.7}])
+        self.mock_embeddings.search_questions.assert_called_with("plantas", 2)
+
+    @patch('question.sentence_similarity', return_value=0.9)
+    def test_lazy_embeddings(self, mock_similarity: Mock):
+        """Sem embeddings carregados, o CRUD não chama o modelo; a primeira avaliação carrega tudo."""
+        with patch('question._embeddings_loaded', False):
+            question.create_question("Q", "A")
+            q_id = list(question.questions.keys())[0]
+            question.update_question(q_id, "Q", "B")
+            self.mock_embeddings.precompute.assert_not_called()
+            self.mock_embeddings.index_statements.assert_not_called()
+            self.assertIsNone(question.find_duplicates("Q"))
+
+            # Uma resposta que não é cópia do gabarito, para passar pelo modelo
+            question.evaluate(q_id, "Resposta")
+            self.mock_embeddings.load_embeddings.assert_called_once()
+            self.mock_embeddings.precompute.assert_called_once_with([(q_id, ["B"])])
+            question.evaluate(q_id, "outra")
+            self.mock_embeddings.load_embeddings.assert_called_once()
+
+    def test_precompute_concurrent_crud(self):
+        """Questões criadas, alteradas ou removidas durante o cálculo do banco são reindexadas ao final."""
+        question.create_question("Antiga", "A")
+        question.create_question("Removida", "R")
+        old_id, removed_id = list(question.questions.keys())
+        created: list[str] = []
+
+        def crud_during_precompute(items):
+            # Simula requisições do CRUD chegando enquanto o aquecimento codifica o banco
+            if not created:
+                question.create_question("Nova", "N")
+                created.append(list(question.questions.keys())[-1])
+                question.update_question(old_id, "Antiga editada", "A2")
+                question.delete_question(removed_id)
+
+        with patch('question._embeddings_loaded', False):
+            self.mock_embeddings.precompute.side_effect = crud_during_precompute
+            question.precompute_embeddings()
+            self.assertTrue(question._embeddings_loaded)
+
+        self.assertIsNone(question._pending_embeddings)
+        final_precompute = self.mock_embeddings.precompute.call_args_list[-1].args[0]
+        self.assertEqual(sorted(final_precompute), sorted([(created[0], ["N"]), (old_id, ["A2"])]))
+        final_index = self.mock_embeddings.index_statements.call_args_list[-1].args[0]
+        self.assertEqual(sorted(final_index), sorted([(created[0], "Nova"), (old_id, "Antiga editada")]))
+        self.mock_embeddings.invalidate.assert_any_call(removed_id)
+
+    @patch('question.sentence_similarity')
+    def test_evaluate_uses_reference_embedding(self, mock_similarity: Mock):
+        """A avaliação deve reutilizar o embedding do gabarito em cache."""
+        mock_similarity.return_value = 0.9
+        question.create_question("Q", "A")
+        q_id = list(question.questions.keys())[0]
+
+        question.evaluate(q_id, "Resposta")
+
+        reference = self.mock_embeddings.get_reference_embeddings.return_value
+        mock_similarity.assert_called_with("Resposta", ["A"], reference)
+
+    # 7. TESTES DE PERSISTÊNCIA (JSON)
+
+    @patch('storage.os.replace')
+    @patch('storage.os.fsync')
     @patch('builtins.open', new_callable=mock_open)
     @patch('json.dump')
-    def test_save_questions(self, mock_json_dump: Mock, mock_file: Mock):
-        """Salvar no arquivo JSON."""
+    def test_save_questions(self, mock_json_dump: Mock, mock_file: Mock, mock_fsync: Mock, mock_replace: Mock):
+        """Salvar no arquivo JSON (de forma atômica, via arquivo temporário)."""
         question.create_question("Q", "A")
         question.save_questions_to_json()
-        mock_file.assert_called_with('data/questions.json', 'w', encoding='utf-8')
+        mock_file.assert_called_with('data/questions.json.tmp', 'w', encoding='utf-8')
+        mock_replace.assert_called_with('data/questions.json.tmp', 'data/questions.json')
         self.assertTrue(mock_json_dump.called)
 
     @patch('builtins.open', new_callable=mock_open, read_data='[{"question_id": "1", "statement": "A", "correct_answer": "B"}]')
@@ -163,6 +636,16 @@ class TestQuestion(unittest.TestCase):
         question.load_questions_from_json()
         self.assertIn("1", question.questions)
 
+    @patch('builtins.open', new_callable=mock_open, read_data='[{"question_id": "1", "statement": "S", "correct_answer": "A"}]')
+    def test_load_questions_without_precompute(self, mock_file: Mock):
+        """Sem pré-cálculo, os embeddings ficam para precompute_embeddings (aquecimento)."""
+        question.load_questions_from_json(precompute=False)
+        self.assertIn("1", question.questions)
+        self.mock_embeddings.precompute.assert_not_called()
+        question.precompute_embeddings()
+        self.mock_embeddings.precompute.assert_called_once_with([("1", ["A"])])
+        self.mock_embeddings.index_statements.assert_called_once_with([("1", "S")])
+
     @patch('builtins.open', side_effect=FileNotFoundError)
     def test_load_questions_file_not_found(self, mock_file: Mock):
         """Carregar sem arquivo (não deve quebrar)."""
@@ -171,6 +654,29 @@ class TestQuestion(unittest.TestCase):
         except Exception:
             self.fail("Deveria tratar FileNotFoundError silenciosamente")
 
+    def test_crud_writes_through_to_store(self):
+        """Cada alteração é gravada imediatamente no armazenamento."""
+        with patch('question._store') as mock_store:
+            mock_store.has_external_changes.return_value = False
+            question.create_question("Q", "A")
+            q_id = list(question.questions.keys())[0]
+            mock_store.upsert.assert_called_with(question.questions[q_id])
+
+            question.update_question(q_id, "Novo", "Nova")
+            self.assertEqual(mock_store.upsert.call_args.args[0]['statement'], "Novo")
+
+            question.delete_question(q_id)
+            mock_store.delete.assert_called_with(q_id)
+
+    def test_sync_external_changes(self):
+        """Alterações de outro processo recarregam o dicionário de questões."""
+        question.create_question("Antiga", "A")
+        with patch('question._store') as mock_store:
+            mock_store.has_external_changes.return_value = True
+            mock_store.load_all.return_value = [{"question_id": "x", "statement": "S", "correct_answer": "C"}]
+            all_q = question.get_all_questions()
+        self.assertEqual(list(all_q.keys()), ["x"])
+
     @patch('builtins.open', new_callable=mock_open, read_data='INVALID JSON')
     def test_load_questions_corrupted_json(self, mock_file: Mock):
         """Carregar arquivo JSON corrompido (Deve gerar JSONDecodeError)."""
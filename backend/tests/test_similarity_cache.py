@@ -0,0 +1,89 @@
+# test_similarity_cache.py
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from similarity_cache import SimilarityCache, normalize_answer
+
+class TestSimilarityCache(unittest.TestCase):
+
+    # ==========================================
+    # 1. TESTES DE NORMALIZAÇÃO
+    # ==========================================
+
+    def test_normalize_whitespace(self):
+        """Espaços extras não mudam a chave."""
+        self.assertEqual(normalize_answer("  não   sei \n"), "não sei")
+
+    def test_normalize_unicode(self):
+        """Formas Unicode equivalentes geram a mesma chave."""
+        self.assertEqual(normalize_answer("não"), normalize_answer("não"))
+
+    def test_normalize_keeps_case(self):
+        """Maiúsculas são preservadas (o modelo diferencia)."""
+        self.assertNotEqual(normalize_answer("Não"), normalize_answer("não"))
+
+    # ==========================================
+    # 2. TESTES DO CACHE LRU
+    # ==========================================
+
+    def test_hit_and_miss(self):
+        """Contadores de acertos e falhas."""
+        cache = SimilarityCache(10)
+        self.assertIsNone(cache.get("q", "a"))
+        cache.put("q", "a", 0.5, 0)
+        self.assertEqual(cache.get("q", "a"), 0.5)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_lru_eviction(self):
+        """A entrada usada há mais tempo é descartada quando o cache enche."""
+        cache = SimilarityCache(2)
+        cache.put("q", "a", 0.1, 0)
+        cache.put("q", "b", 0.2, 0)
+        cache.get("q", "a")          # "a" passa a ser a mais recente
+        cache.put("q", "c", 0.3, 0)     # descarta "b"
+        self.assertIsNone(cache.get("q", "b"))
+        self.assertEqual(cache.get("q", "a"), 0.1)
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_invalidate_question(self):
+        """A invalidação remove apenas as entradas da questão."""
+        cache = SimilarityCache(10)
+        cache.put("q1", "a", 0.1, 0)
+        cache.put("q2", "a", 0.2, 0)
+        cache.invalidate("q1")
+        self.assertIsNone(cache.get("q1", "a"))
+        self.assertEqual(cache.get("q2", "a"), 0.2)
+
+    def test_stale_put_after_invalidate(self):
+        """Uma similaridade calculada antes de uma alteração da questão não é memorizada."""
+        cache = SimilarityCache(10)
+        generation = cache.generation("q")     # avaliação lê a geração e o gabarito antigo
+        cache.invalidate("q")                  # a questão é alterada durante o cálculo
+        cache.put("q", "a", 0.9, generation)
+        self.assertIsNone(cache.get("q", "a"))
+        cache.put("q", "a", 0.4, cache.generation("q"))
+        self.assertEqual(cache.get("q", "a"), 0.4)
+
+    def test_keyed_by_model_version(self):
+        """Trocar o modelo não reaproveita similaridades antigas."""
+        cache = SimilarityCache(10)
+        cache.put("q", "a", 0.5, 0)
+        with patch('natural_language.config.ENCODER_BACKEND', 'onnx-int8'):
+            self.assertIsNone(cache.get("q", "a"))
+
+    def test_disabled(self):
+        """Com tamanho 0, nada é armazenado."""
+        cache = SimilarityCache(0)
+        cache.put("q", "a", 0.5, 0)
+        self.assertIsNone(cache.get("q", "a"))
+
+if __name__ == "__main__":
+    unittest.main()
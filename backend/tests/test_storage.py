@@ -0,0 +1,309 @@
+# test_storage.py
+
+import unittest
+from unittest.mock import patch
+import tempfile
+import json
+import sqlite3
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import storage
+from storage import QuestionStore, JsonStore, SqliteStore
+
+def make_question(question_id: str, statement: str = "Q", correct_answer: str = "A") -> dict[str, str]:
+    return {'question_id': question_id, 'statement': statement, 'correct_answer': correct_answer}
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        """Cada teste usa uma pasta temporária própria."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def open_sqlite(self) -> SqliteStore:
+        store = SqliteStore(os.path.join(self.tmp, 'questions.db'))
+        self.addCleanup(store.close)
+        return store
+
+    # ==========================================
+    # 1. TESTES DO ARMAZENAMENTO JSON
+    # ==========================================
+
+    def test_json_snapshot_and_load(self):
+        """O snapshot reescreve o arquivo e load_all o relê."""
+        store = JsonStore(os.path.join(self.tmp, 'questions.json'))
+        store.snapshot([make_question("1"), make_question("2")])
+        self.assertEqual([q['question_id'] for q in store.load_all()], ["1", "2"])
+
+    def test_json_missing_file(self):
+        """Sem arquivo, load_all retorna lista vazia."""
+        store = JsonStore(os.path.join(self.tmp, 'inexistente.json'))
+        self.assertEqual(store.load_all(), [])
+
+    # ==========================================
+    # 2. TESTES DO LOG DE ALTERAÇÕES (JSON)
+    # ==========================================
+
+    def open_logged(self, compact_threshold: int = 1000) -> JsonStore:
+        store = JsonStore(os.path.join(self.tmp, 'questions.json'),
+                          os.path.join(self.tmp, 'questions.log'), compact_threshold)
+        self.addCleanup(store.close)
+        return store
+
+    def test_log_replayed_after_crash(self):
+        """Alterações sem snapshot (queda do processo) são recuperadas pelo log."""
+        store = self.open_logged()
+        store.snapshot([make_question("1"), make_question("2")])
+        store.upsert(make_question("3"))
+        store.upsert(make_question("1", "Atualizada"))
+        store.delete("2")
+        store.close() # Sem snapshot: simula uma queda
+
+        loaded = self.open_logged().load_all()
+        self.assertEqual([q['question_id'] for q in loaded], ["1", "3"])
+        self.assertEqual(loaded[0]['statement'], "Atualizada")
+
+    def test_log_without_snapshot(self):
+        """O log é reaplicado mesmo se questions.json ainda não existir."""
+        store = self.open_logged()
+        store.upsert(make_question("1"))
+        self.assertEqual(len(self.open_logged().load_all()), 1)
+
+    def test_log_partial_last_line(self):
+        """Uma última linha incompleta é ignorada."""
+        store = self.open_logged()
+        store.upsert(make_question("1"))
+        store.close()
+        with open(store.log_path, 'a', encoding='utf-8') as f: # type: ignore
+            f.write('{"op": "upsert", "quest')
+
+        self.assertEqual([q['question_id'] for q in self.open_logged().load_all()], ["1"])
+
+    def test_log_partial_line_then_restart(self):
+        """Após uma queda no meio de uma linha, as alterações seguintes sobrevivem a uma nova queda."""
+        store = self.open_logged()
+        store.upsert(make_question("1"))
+        store.close()
+        with open(store.log_path, 'a', encoding='utf-8') as f: # type: ignore
+            f.write('{"op": "upsert", "quest') # Primeira queda
+
+        restarted = self.open_logged()
+        self.assertEqual([q['question_id'] for q in restarted.load_all()], ["1"])
+        restarted.upsert(make_question("2"))
+        restarted.delete("1")
+        restarted.close() # Segunda queda, sem snapshot
+
+        self.assertEqual([q['question_id'] for q in self.open_logged().load_all()], ["2"])
+        with open(store.log_path, 'r', encoding='utf-8') as f: # type: ignore
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_log_invalid_middle_line(self):
+        """Uma linha inválida no meio do log é ignorada sem interromper a reaplicação."""
+        store = self.open_logged()
+        store.upsert(make_question("1"))
+        store.close()
+        with open(store.log_path, 'a', encoding='utf-8') as f: # type: ignore
+            f.write('{"op": "upsert", "quest\n')
+        store.upsert(make_question("2"))
+
+        self.assertEqual([q['question_id'] for q in self.open_logged().load_all()], ["1", "2"])
+
+    def test_log_one_line_per_change(self):
+        """Cada alteração acrescenta exatamente uma linha ao log."""
+        store = self.open_logged()
+        for i in range(5):
+            store.upsert(make_question(str(i)))
+        with open(store.log_path, 'r', encoding='utf-8') as f: # type: ignore
+            self.assertEqual(len(f.readlines()), 5)
+
+    def test_log_upsert_many_single_fsync(self):
+        """Uma gravação em lote acrescenta uma linha por questão com um único fsync."""
+        store = self.open_logged()
+        with patch('storage.os.fsync') as mock_fsync:
+            store.upsert_many([make_question(str(i)) for i in range(50)])
+        mock_fsync.assert_called_once()
+        self.assertEqual(len(self.open_logged().load_all()), 50)
+
+    def test_snapshot_clears_log(self):
+        """Após o snapshot, o log já incorporado é descartado."""
+        store = self.open_logged()
+        store.upsert(make_question("1"))
+        store.snapshot([make_question("1")])
+        self.assertFalse(os.path.exists(store.log_path)) # type: ignore
+        self.assertEqual(len(self.open_logged().load_all()), 1)
+
+    def test_compaction(self):
+        """Ao passar do limite, o log é incorporado ao snapshot em segundo plano."""
+        store = self.open_logged(compact_threshold=3)
+        for i in range(4):
+            store.upsert(make_question(str(i)))
+        compaction = store._compaction
+        if compaction is not None:
+            compaction.join()
+
+        with open(store.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 3)
+        self.assertFalse(os.path.exists(store.log_path + '.1')) # type: ignore
+        self.assertEqual(len(self.open_logged().load_all()), 4)
+
+    def test_interrupted_compaction(self):
+        """Um log rotacionado que sobrou de uma compactação interrompida é reaplicado."""
+        store = self.open_logged()
+        store.upsert(make_question("1"))
+        store.close()
+        os.replace(store.log_path, store.log_path + '.1') # type: ignore
+        store.upsert(make_question("2"))
+        store.close()
+
+        self.assertEqual([q['question_id'] for q in self.open_logged().load_all()], ["1", "2"])
+
+    def test_rotation_after_interrupted_compaction(self):
+        """Um log rotacionado pendente é incorporado ao snapshot antes da próxima rotação."""
+        with open(os.path.join(self.tmp, 'questions.json'), 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        with open(os.path.join(self.tmp, 'questions.log.1'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'op': 'upsert', 'question': make_question("A")}) + '\n')
+
+        store = self.open_logged(compact_threshold=2)
+        store.upsert(make_question("B"))
+        store.upsert(make_question("C"))
+        compaction = store._compaction
+        if compaction is not None:
+            compaction.join()
+
+        self.assertEqual(sorted(q['question_id'] for q in self.open_logged().load_all()), ["A", "B", "C"])
+
+    def test_failed_compaction_kept(self):
+        """Se a compactação falhar, o log rotacionado é mantido e reaplicado."""
+        store = self.open_logged(compact_threshold=2)
+        with patch.object(JsonStore, '_write_snapshot', side_effect=OSError("disco cheio")):
+            store.upsert(make_question("1"))
+            store.upsert(make_question("2"))
+            compaction = store._compaction
+            if compaction is not None:
+                compaction.join()
+        self.assertTrue(os.path.exists(store.log_path + '.1')) # type: ignore
+
+        store.upsert(make_question("3"))
+        store.upsert(make_question("4"))
+        compaction = store._compaction
+        if compaction is not None:
+            compaction.join()
+        self.assertEqual(sorted(q['question_id'] for q in self.open_logged().load_all()), ["1", "2", "3", "4"])
+
+    # ==========================================
+    # 3. TESTES DO ARMAZENAMENTO SQLITE
+    # ==========================================
+
+    def test_sqlite_wal_mode(self):
+        """O banco é aberto em modo WAL."""
+        store = self.open_sqlite()
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_sqlite_upsert_and_delete(self):
+        """Inserção, atualização e remoção são gravadas imediatamente."""
+        store = self.open_sqlite()
+        store.upsert(make_question("1", "Q1", "A1"))
+        store.upsert(make_question("2", "Q2", "A2"))
+        store.upsert(make_question("1", "Novo", "Nova"))
+        store.delete("2")
+
+        self.assertEqual(store.load_all(), [make_question("1", "Novo", "Nova")])
+
+    def test_sqlite_keeps_creation_order(self):
+        """Atualizar uma questão não muda sua posição."""
+        store = self.open_sqlite()
+        for question_id in ["c", "a", "b"]:
+            store.upsert(make_question(question_id))
+        store.upsert(make_question("c", "Atualizada"))
+        self.assertEqual([q['question_id'] for q in store.load_all()], ["c", "a", "b"])
+
+    def test_sqlite_survives_reopen(self):
+        """Os dados permanecem após fechar e reabrir o banco (sem snapshot)."""
+        store = SqliteStore(os.path.join(self.tmp, 'questions.db'))
+        store.upsert(make_question("1"))
+        store.close()
+
+        self.assertEqual(len(self.open_sqlite().load_all()), 1)
+
+    def test_sqlite_external_changes(self):
+        """Alterações de outra conexão (outro processo) são detectadas."""
+        store = self.open_sqlite()
+        store.load_all()
+        self.assertFalse(store.has_external_changes())
+
+        store.upsert(make_question("1"))
+        self.assertFalse(store.has_external_changes()) # Alterações próprias não contam
+
+        other = self.open_sqlite()
+        other.upsert(make_question("2"))
+        self.assertTrue(store.has_external_changes())
+        store.load_all()
+        self.assertFalse(store.has_external_changes())
+
+    def test_sqlite_alternative_answers(self):
+        """As respostas alternativas sobrevivem à gravação; bancos antigos ganham a coluna."""
+        path = os.path.join(self.tmp, 'antigo.db')
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE questions (question_id TEXT PRIMARY KEY, statement TEXT NOT NULL,"
+                     " correct_answer TEXT NOT NULL)")
+        conn.execute("INSERT INTO questions VALUES ('1', 'Q', 'A')")
+        conn.commit()
+        conn.close()
+
+        store = SqliteStore(path)
+        self.addCleanup(store.close)
+        self.assertEqual(store.load_all(), [make_question("1")])
+        store.upsert(dict(make_question("2"), alternative_answers=["B", "C"]))
+        self.assertEqual(store.load_all()[1]['alternative_answers'], ["B", "C"])
+
+    def test_sqlite_insert_many(self):
+        """Inserção em lote numa única transação."""
+        store = self.open_sqlite()
+        store.insert_many([make_question(str(i)) for i in range(100)])
+        self.assertEqual(store.count(), 100)
+        store.upsert_many([make_question("0"), make_question("100")])
+        self.assertEqual(store.count(), 101)
+
+    # ==========================================
+    # 4. TESTES DE open_store
+    # ==========================================
+
+    def test_open_store_imports_json(self):
+        """Um banco SQLite vazio é preenchido com o questions.json existente."""
+        json_path = os.path.join(self.tmp, 'questions.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump([make_question("1"), make_question("2")], f)
+
+        with patch('storage.QUESTIONS_PATH', json_path), \
+             patch('storage.config.STORAGE', 'sqlite'), \
+             patch('storage.config.SQLITE_PATH', os.path.join(self.tmp, 'questions.db')):
+            store = storage.open_store()
+        self.addCleanup(store.close)
+
+        self.assertIsInstance(store, SqliteStore)
+        self.assertEqual(len(store.load_all()), 2)
+
+    def test_open_store_unknown(self):
+        """Armazenamento desconhecido deve gerar ValueError."""
+        with patch('storage.config.STORAGE', 'mongodb'):
+            with self.assertRaises(ValueError):
+                storage.open_store()
+
+    def test_incomplete_store_rejected(self):
+        """Uma implementação que não define load_all, upsert e delete não pode ser instanciada."""
+        class Incomplete(QuestionStore):
+            def load_all(self) -> list[dict[str, str]]:
+                return []
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+# test_submissions.py
+
+import unittest
+from unittest.mock import patch, Mock
+import time
+from threading import Event
+import json
+import sqlite3
+import tempfile
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from submissions import SubmissionLog
+from natural_language import model_version
+
+class TestSubmissionLog(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def make_log(self, storage: str = 'json', flush_ms: float = 50, max_batch_size: int = 1000, **kwargs) -> SubmissionLog:
+        extension = 'db' if storage == 'sqlite' else 'log'
+        log = SubmissionLog(storage, os.path.join(self.tmp, 'data', f'submissions.{extension}'),
+                            flush_ms, max_batch_size, **kwargs)
+        self.addCleanup(log.stop)
+        return log
+
+    def read_json(self, log: SubmissionLog) -> list[dict]:
+        with open(log.path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    # ==========================================
+    # 1. TESTES DE GRAVAÇÃO
+    # ==========================================
+
+    def test_json_records(self):
+        """As submissões são gravadas em NDJSON com pontuação, modelo e horário."""
+        log = self.make_log()
+        log.start()
+        log.record('q1', "Resposta", 0.81, 100)
+        log.record('q2', "Outra", 0.3, 40)
+        self.assertTrue(log.flush(timeout=5))
+
+        entries = self.read_json(log)
+        self.assertEqual([(e['question_id'], e['answer'], e['score']) for e in entries],
+                         [('q1', "Resposta", 100), ('q2', "Outra", 40)])
+        self.assertAlmostEqual(entries[0]['similarity'], 0.81)
+        self.assertEqual(entries[0]['model'], model_version())
+        self.assertGreater(entries[0]['created_at'], 0)
+
+    def test_sqlite_records(self):
+        """Com 'sqlite', as submissões vão para a tabela submissions."""
+        log = self.make_log('sqlite')
+        log.start()
+        for i in range(10):
+            log.record(f'q{i % 2}', f"Resposta {i}", 0.5, 70)
+        log.stop()
+
+        conn = sqlite3.connect(log.path)
+        self.addCleanup(conn.close)
+        rows = conn.execute("SELECT question_id, COUNT(*) FROM submissions GROUP BY question_id").fetchall()
+        self.assertEqual(dict(rows), {'q0': 5, 'q1': 5})
+
+    def test_group_commit(self):
+        """Submissões que chegam dentro da janela são gravadas com uma única sincronização."""
+        log = self.make_log(flush_ms=10_000)
+        log.start()
+        for i in range(50):
+            log.record('q1', f"Resposta {i}", 0.5, 70)
+        self.assertTrue(log.flush(timeout=5))
+
+        stats = log.stats()
+        self.assertEqual(stats['written'], 50)
+        self.assertEqual(stats['flushes'], 1)
+        self.assertEqual(len(self.read_json(log)), 50)
+
+    def test_max_batch_size(self):
+        """Um lote é gravado ao atingir max_batch_size, sem esperar a janela."""
+        log = self.make_log(flush_ms=10_000, max_batch_size=10)
+        log.start()
+        for i in range(25):
+            log.record('q1', f"Resposta {i}", 0.5, 70)
+        self.assertTrue(log.flush(timeout=5))
+        self.assertEqual(log.stats()['flushes'], 3)
+
+    # ==========================================
+    # 2. TESTES DE CICLO DE VIDA
+    # ==========================================
+
+    def test_stop_flushes_pending(self):
+        """stop grava as submissões pendentes antes de encerrar a thread."""
+        log = self.make_log(flush_ms=10_000)
+        log.start()
+        for i in range(5):
+            log.record('q1', f"Resposta {i}", 0.5, 70)
+        log.stop()
+        self.assertEqual(len(self.read_json(log)), 5)
+
+    def test_record_before_start(self):
+        """Sem a thread gravadora (ex.: fora do lifespan), record não faz nada."""
+        log = self.make_log()
+        log.record('q1', "Resposta", 0.5, 70)
+        self.assertTrue(log.flush())
+        self.assertFalse(os.path.exists(log.path))
+
+    def test_off(self):
+        """Com 'off', nenhum arquivo é criado."""
+        log = self.make_log('off')
+        log.start()
+        log.record('q1', "Resposta", 0.5, 70)
+        log.stop()
+        self.assertFalse(os.path.exists(log.path))
+
+    def test_unknown_storage(self):
+        """Armazenamento desconhecido é rejeitado ao iniciar."""
+        with self.assertRaises(ValueError):
+            self.make_log('csv').start()
+
+    def test_queue_full_drops(self):
+        """Com a fila cheia, as novas submissões são descartadas sem bloquear a avaliação."""
+        log = self.make_log(max_pending=2)
+        # A thread é simulada, sem consumir a fila
+        with patch.object(log, '_thread', Mock(is_alive=Mock(return_value=True))):
+            for i in range(5):
+                log.record('q1', f"Resposta {i}", 0.5, 70)
+            self.assertEqual(log.stats()['dropped'], 3)
+
+    def test_write_failure(self):
+        """Falhas de gravação são contabilizadas e não derrubam a thread."""
+        log = self.make_log()
+        log.start()
+        with patch('submissions.os.fsync', side_effect=OSError("disco cheio")):
+            log.record('q1', "Resposta", 0.5, 70)
+            self.assertTrue(log.flush(timeout=5))
+        log.record('q1', "Outra", 0.5, 70)
+        self.assertTrue(log.flush(timeout=5))
+        self.assertEqual(log.stats()['errors'], 1)
+        self.assertEqual(log.stats()['written'], 1)
+
+    def test_setup_failure(self):
+        """Se o histórico não puder ser aberto, a thread termina e record, flush e stop não travam."""
+        # Um arquivo no lugar da pasta data impede a criação do histórico
+        with open(os.path.join(self.tmp, 'data'), 'w', encoding='utf-8') as f:
+            f.write("não é uma pasta")
+
+        for storage in ('json', 'sqlite'):
+            with self.subTest(storage=storage):
+                log = self.make_log(storage)
+                log.start()
+                log._thread.join(5) # type: ignore
+                log.record('q1', "Resposta", 0.5, 70)
+                self.assertEqual(log.stats()['pending'], 0)
+
+                started = time.monotonic()
+                self.assertFalse(log.flush())
+                log.stop()
+                self.assertLess(time.monotonic() - started, 5)
+
+    def test_setup_failure_releases_waiters(self):
+        """Pedidos já enfileirados quando a abertura falha são liberados; as submissões contam como erro."""
+        log = self.make_log()
+        waiter = Event()
+        with patch('submissions.os.makedirs', side_effect=OSError("sem permissão")):
+            log._queue.put({'question_id': 'q1'})
+            log._queue.put(waiter)
+            log.start()
+            log._thread.join(5) # type: ignore
+        self.assertTrue(waiter.is_set())
+        self.assertEqual(log.stats()['errors'], 1)
+        self.assertFalse(log.flush(timeout=1))
+
+if __name__ == "__main__":
+    unittest.main()
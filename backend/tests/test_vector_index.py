@@ -0,0 +1,121 @@
+# test_vector_index.py
+
+import unittest
+import importlib.util
+import sys
+import os
+import numpy as np
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vector_index import VectorIndex, HnswIndex, create_index
+
+HAS_HNSWLIB = importlib.util.find_spec('hnswlib') is not None
+
+
+def random_vectors(n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+class IndexTests:
+    """Testes comuns aos dois tipos de índice."""
+
+    def make_index(self) -> VectorIndex | HnswIndex:
+        raise NotImplementedError
+
+    def test_search_ranks_by_cosine(self):
+        """O vetor mais parecido vem primeiro, com similaridade de cosseno."""
+        index = self.make_index()
+        index.upsert("x", np.array([1.0, 0.0, 0.0]))
+        index.upsert("y", np.array([0.0, 1.0, 0.0]))
+        index.upsert("xy", np.array([1.0, 1.0, 0.0]))
+        result = index.search(np.array([2.0, 0.1, 0.0]), 2)
+        self.assertEqual([key for key, _ in result], ["x", "xy"])
+        self.assertAlmostEqual(result[0][1], 0.9988, places=3)
+
+    def test_search_exclude(self):
+        """O identificador excluído não aparece e k resultados ainda são retornados."""
+        index = self.make_index()
+        for i, vector in enumerate(random_vectors(20)):
+            index.upsert(str(i), vector)
+        vector = index.get("3")
+        assert vector is not None
+        result = index.search(vector, 5, exclude="3")
+        self.assertEqual(len(result), 5)
+        self.assertNotIn("3", [key for key, _ in result])
+
+    def test_upsert_replaces_and_remove(self):
+        """Substituir e remover vetores mantém o índice consistente."""
+        index = self.make_index()
+        index.upsert("a", np.array([1.0, 0.0]))
+        index.upsert("b", np.array([0.0, 1.0]))
+        index.upsert("a", np.array([0.0, 1.0]))
+        self.assertEqual(len(index), 2)
+        self.assertAlmostEqual(index.search(np.array([0.0, 1.0]), 2)[1][1], 1.0, places=5)
+        index.remove("b")
+        index.remove("inexistente")
+        self.assertNotIn("b", index)
+        self.assertEqual([key for key, _ in index.search(np.array([0.0, 1.0]), 5)], ["a"])
+
+    def test_grows_past_capacity(self):
+        """O índice cresce além da capacidade inicial."""
+        index = self.make_index()
+        vectors = random_vectors(3000)
+        for i, vector in enumerate(vectors):
+            index.upsert(str(i), vector)
+        self.assertEqual(len(index), 3000)
+        self.assertEqual(index.search(vectors[1234], 1)[0][0], "1234")
+
+    def test_empty(self):
+        """Consultas a um índice vazio retornam lista vazia."""
+        index = self.make_index()
+        self.assertEqual(index.search(np.ones(4), 3), [])
+        self.assertIsNone(index.get("a"))
+
+
+class TestVectorIndex(IndexTests, unittest.TestCase):
+
+    def make_index(self) -> VectorIndex:
+        return VectorIndex(capacity=4)
+
+    def test_remove_moves_last_row(self):
+        """Remover do meio mantém a associação entre identificadores e vetores."""
+        index = self.make_index()
+        vectors = random_vectors(6)
+        for i, vector in enumerate(vectors):
+            index.upsert(str(i), vector)
+        index.remove("1")
+        for i in (0, 2, 3, 4, 5):
+            self.assertEqual(index.search(vectors[i], 1)[0][0], str(i))
+
+    def test_matches_brute_force(self):
+        """O resultado é igual ao de uma ordenação completa das similaridades."""
+        index = self.make_index()
+        vectors = random_vectors(200)
+        for i, vector in enumerate(vectors):
+            index.upsert(str(i), vector)
+        query = random_vectors(1, seed=1)[0]
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = [str(i) for i in np.argsort(-(normalized @ query))[:10]]
+        self.assertEqual([key for key, _ in index.search(query, 10)], expected)
+
+
+@unittest.skipUnless(HAS_HNSWLIB, "hnswlib não instalado")
+class TestHnswIndex(IndexTests, unittest.TestCase):
+
+    def make_index(self) -> HnswIndex:
+        return HnswIndex(capacity=4)
+
+
+class TestCreateIndex(unittest.TestCase):
+
+    def test_exact(self):
+        self.assertIsInstance(create_index('exact'), VectorIndex)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            create_index('faiss')
+
+if __name__ == "__main__":
+    unittest.main()
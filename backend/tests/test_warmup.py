@@ -0,0 +1,77 @@
+# test_warmup.py
+
+import unittest
+from unittest.mock import patch, Mock
+import sys
+import os
+import numpy as np
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import warmup as warmup_module
+import question
+from warmup import Warmup
+
+def fake_encode(sentences: list[str]) -> np.ndarray:
+    return np.ones((len(sentences), 4), dtype=np.float32)
+
+class TestWarmup(unittest.TestCase):
+
+    def setUp(self):
+        """Substitui o modelo por funções falsas."""
+        self.mocks: dict[str, Mock] = {}
+        for name, kwargs in (('load_model', {}),
+                             ('encode', {'side_effect': fake_encode}),
+                             ('batch_similarity', {'return_value': []})):
+            patcher = patch(f'warmup.{name}', **kwargs)
+            self.mocks[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    # ==========================================
+    # 1. TESTES DE ESTADO
+    # ==========================================
+
+    def test_not_ready_before_run(self):
+        """Antes do aquecimento, a aplicação não está pronta."""
+        warmup = Warmup(1)
+        self.assertFalse(warmup.is_ready())
+        self.assertEqual(warmup.status()['state'], 'pending')
+
+    def test_run_steps(self):
+        """O aquecimento carrega o modelo, codifica as frases de teste e calcula os embeddings."""
+        precompute = Mock()
+        warmup = Warmup(2, precompute)
+        warmup.run()
+        self.assertTrue(warmup.is_ready())
+        self.mocks['load_model'].assert_called_once()
+        self.assertEqual(self.mocks['batch_similarity'].call_count, 2)
+        precompute.assert_called_once()
+        self.assertEqual(set(warmup.status()['durations']), {'model_load', 'encode', 'embeddings'}) # pyright: ignore[reportArgumentType]
+
+    def test_failure(self):
+        """Um erro no aquecimento mantém a aplicação fora do ar e é informado no estado."""
+        warmup = Warmup(1, Mock(side_effect=OSError("sem rede")))
+        warmup.run()
+        self.assertFalse(warmup.is_ready())
+        status = warmup.status()
+        self.assertEqual(status['state'], 'failed')
+        self.assertEqual(status['error'], "OSError: sem rede")
+
+    def test_start_in_background(self):
+        """start executa o aquecimento em outra thread."""
+        warmup = Warmup(1)
+        warmup.start()
+        self.assertTrue(warmup.wait(timeout=5))
+        self.assertEqual(warmup.status()['state'], 'ready')
+
+    def test_shares_embeddings_lock(self):
+        """O aquecimento carrega os embeddings pela mesma função (e trava) das requisições."""
+        self.assertIs(warmup_module.warmup.precompute, question.ensure_embeddings)
+        with patch('question._embeddings_loaded', False), \
+             patch('question.precompute_embeddings') as mock_precompute:
+            question.ensure_embeddings()
+        mock_precompute.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# test_worker_pool.py
+
+import unittest
+from unittest.mock import patch, Mock
+import sys
+import os
+import numpy as np
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import worker_pool
+from worker_pool import WorkerPool
+
+def noop_initializer(torch_threads: int) -> None:
+    """Inicializador que não carrega o modelo (os processos filhos não herdam os mocks)."""
+
+class TestWorkerPool(unittest.TestCase):
+
+    # ==========================================
+    # 1. TESTES DO POOL DE PROCESSOS
+    # ==========================================
+
+    def test_runs_in_other_process(self):
+        """A inferência roda em um processo diferente, criado sem fork."""
+        pool = WorkerPool(2, 1, initializer=noop_initializer, preload=())
+        self.addCleanup(pool.shutdown)
+
+        pool.start()
+        worker_pid = pool._get_executor().submit(os.getpid).result()
+
+        self.assertNotEqual(worker_pid, os.getpid())
+        self.assertNotEqual(pool._get_executor()._mp_context.get_start_method(), 'fork')
+
+    def test_shutdown_without_start(self):
+        """Encerrar um pool que nunca foi usado não deve quebrar."""
+        WorkerPool(2, 1).shutdown()
+
+    # ==========================================
+    # 2. TESTES DE ROTEAMENTO
+    # ==========================================
+
+    @patch('worker_pool.batch_sentence_similarity', return_value=[0.5])
+    def test_batch_similarity_local(self, mock_similarity: Mock):
+        """Sem processos configurados, a inferência roda localmente."""
+        with patch('worker_pool.config.INFERENCE_PROCESSES', 0):
+            self.assertEqual(worker_pool.batch_similarity(["a"], np.zeros((1, 4))), [0.5])
+        mock_similarity.assert_called_once()
+
+    @patch('worker_pool.pool')
+    def test_batch_similarity_pool(self, mock_pool: Mock):
+        """Com processos configurados, a inferência é enviada ao pool."""
+        mock_pool.similarities.return_value = [0.7]
+        with patch('worker_pool.config.INFERENCE_PROCESSES', 2):
+            self.assertEqual(worker_pool.batch_similarity(["a"], np.zeros((1, 4))), [0.7])
+
+    @patch('worker_pool.natural_language.encode', return_value=np.ones((1, 4)))
+    @patch('worker_pool.pool')
+    def test_encode_routing(self, mock_pool: Mock, mock_encode: Mock):
+        """A codificação segue a mesma regra: no pool se configurado, senão no próprio processo."""
+        with patch('worker_pool.config.INFERENCE_PROCESSES', 0):
+            worker_pool.encode(["a"])
+        mock_encode.assert_called_once_with(["a"])
+        mock_pool.encode.assert_not_called()
+
+        with patch('worker_pool.config.INFERENCE_PROCESSES', 2):
+            worker_pool.encode(["b"])
+        mock_pool.encode.assert_called_once_with(["b"])
+
+    @patch('worker_pool.get_model')
+    @patch('worker_pool.pool')
+    def test_load_model_skips_parent(self, mock_pool: Mock, mock_get_model: Mock):
+        """Com processos de inferência, o modelo não é carregado no processo da API."""
+        with patch('worker_pool.config.INFERENCE_PROCESSES', 2):
+            worker_pool.load_model()
+        mock_pool.start.assert_called_once()
+        mock_get_model.assert_not_called()
+
+        with patch('worker_pool.config.INFERENCE_PROCESSES', 0):
+            worker_pool.load_model()
+        mock_get_model.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,382 @@
+# benchmark.py
+
+"""
+Mede latência (p50/p95/p99), vazão e pico de memória (RSS) da avaliação de respostas,
+chamando evaluate diretamente e as rotas /questions/evaluate pelo cliente de testes
+do FastAPI (no mesmo processo), com um ou vários clientes simultâneos.
+
+O corpus de respostas é gerado de forma determinística (--seed) a partir do banco em
+data/questions.json. O resultado é salvo em JSON para comparação entre execuções.
+
+Uso (na pasta backend):
+    python tools/benchmark.py --output bench/antes.json
+    python tools/benchmark.py --output bench/depois.json --compare bench/antes.json
+
+Com --compare, termina com código 1 se algum cenário piorar mais que --threshold
+(p95 maior ou vazão menor).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from threading import Event, Thread
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'questions.json')
+
+SCENARIOS: tuple[str, ...] = ('evaluate', 'route', 'route-batch')
+
+
+def build_bank(question_list: list[dict[str, str]], size: int | None) -> list[dict[str, str]]:
+    """
+    Monta o banco do benchmark. Se size for maior que o banco original, as questões são
+    replicadas com um sufixo numérico, o que mantém o tamanho dos textos realista.
+
+    Args:
+        question_list (list[dict[str, str]]): Questões de data/questions.json.
+        size (int | None): Quantidade de questões desejada. Se None, usa o banco original.
+    Returns:
+        (list[dict[str, str]]): Questões com question_id únicos.
+    """
+
+    if size is None or size <= len(question_list):
+        return list(question_list[:size] if size else question_list)
+    bank: list[dict[str, str]] = []
+    for i in range(size):
+        base = question_list[i % len(question_list)]
+        copy = i // len(question_list)
+        suffix = f" ({copy})" if copy else ""
+        bank.append({
+            'question_id': f"{base['question_id']}-{copy}" if copy else base['question_id'],
+            'statement': base['statement'] + suffix,
+            'correct_answer': base['correct_answer'] + suffix,
+        })
+    return bank
+
+
+def build_corpus(bank: list[dict[str, str]], size: int, seed: int) -> list[tuple[str, str]]:
+    """
+    Gera respostas de alunos para as questões do banco, cobrindo todas as faixas de
+    pontuação: o gabarito, o gabarito com palavras embaralhadas ou cortado, o enunciado
+    e o gabarito de outra questão. Cada resposta recebe um marcador único, para que o
+    cache de similaridades não transforme o benchmark em um teste do cache.
+
+    Args:
+        bank (list[dict[str, str]]): Questões do banco.
+        size (int): Quantidade de respostas.
+        seed (int): Semente do gerador (mesma semente, mesmo corpus).
+    Returns:
+        (list[tuple[str, str]]): Pares (question_id, resposta).
+    """
+
+    rng = random.Random(seed)
+    corpus: list[tuple[str, str]] = []
+    for i in range(size):
+        question = rng.choice(bank)
+        words = question['correct_answer'].split()
+        kind = i % 5
+        if kind == 0:
+            answer = question['correct_answer']
+        elif kind == 1:
+            answer = ' '.join(rng.sample(words, len(words)))
+        elif kind == 2:
+            answer = ' '.join(words[:max(len(words) // 2, 1)])
+        elif kind == 3:
+            answer = question['statement']
+        else:
+            answer = rng.choice(bank)['correct_answer']
+        corpus.append((question['question_id'], f"{answer} #{i}"))
+    return corpus
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """
+    Percentil p (0 a 100) por interpolação linear entre as amostras ordenadas.
+
+    Args:
+        samples (list[float]): Amostras (não precisam estar ordenadas).
+        p (float): Percentil desejado.
+    Returns:
+        (float): Valor do percentil, ou 0.0 se não houver amostras.
+    """
+
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> float | None:
+    """Pico de memória residente do processo desde o início, em MB (None se indisponível)."""
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb() -> float | None:
+    """Memória residente atual do processo, em MB (None fora do Linux)."""
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+class RssSampler:
+    """
+    Amostra a memória residente em uma thread durante um cenário e guarda o maior valor.
+    O ru_maxrss é o pico de toda a vida do processo, então repetiria, em cada cenário,
+    o maior pico dos cenários anteriores.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Args:
+            interval (float): Intervalo entre as amostras, em segundos.
+        """
+
+        self.interval = interval
+        self.peak: float | None = None
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def __enter__(self) -> 'RssSampler':
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def peak_mb(self) -> float | None:
+        """Pico amostrado, ou o pico de toda a vida do processo onde não há amostragem."""
+        return self.peak if self.peak is not None else peak_rss_mb()
+
+    def _sample(self) -> None:
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak = rss if self.peak is None else max(self.peak, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+
+def run_scenario(name: str, call: Callable[[list[tuple[str, str]]], object],
+                 requests: list[list[tuple[str, str]]], concurrency: int) -> dict[str, object]:
+    """
+    Executa todas as requisições com concurrency clientes simultâneos e resume as latências.
+
+    Args:
+        name (str): Nome do cenário.
+        call (Callable): Função que atende uma requisição (lista de pares (question_id, resposta)).
+        requests (list[list[tuple[str, str]]]): Requisições a executar.
+        concurrency (int): Quantidade de clientes simultâneos.
+    Returns:
+        (dict[str, object]): Objeto contendo scenario, concurrency, requests, answers, errors,
+        seconds, throughput (respostas/s), latency_ms (p50, p95, p99, mean, max) e peak_rss_mb
+        (pico de memória durante o cenário).
+    """
+
+    latencies: list[float] = []
+    errors = 0
+
+    def timed(request: list[tuple[str, str]]) -> float | None:
+        start = time.perf_counter()
+        try:
+            call(request)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with RssSampler() as sampler, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency in pool.map(timed, requests):
+            if latency is None:
+                errors += 1
+            else:
+                latencies.append(latency)
+    seconds = time.perf_counter() - start
+
+    answers = sum(len(request) for request in requests)
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        'scenario': name,
+        'concurrency': concurrency,
+        'requests': len(requests),
+        'answers': answers,
+        'errors': errors,
+        'seconds': seconds,
+        'throughput': answers / seconds if seconds else 0.0,
+        'latency_ms': {
+            'p50': percentile(ms, 50),
+            'p95': percentile(ms, 95),
+            'p99': percentile(ms, 99),
+            'mean': sum(ms) / len(ms) if ms else 0.0,
+            'max': max(ms, default=0.0),
+        },
+        'peak_rss_mb': sampler.peak_mb(),
+    }
+
+
+def compare(baseline: dict[str, object], current: dict[str, object], threshold: float) -> list[str]:
+    """
+    Compara dois resultados e lista os cenários que pioraram mais que threshold.
+
+    Args:
+        baseline (dict): Resultado de referência (JSON salvo por este script).
+        current (dict): Resultado atual.
+        threshold (float): Piora relativa tolerada (ex.: 0.10 para 10%).
+    Returns:
+        (list[str]): Descrição de cada regressão encontrada.
+    """
+
+    def key(result: dict[str, object]) -> tuple[object, object]:
+        return result['scenario'], result['concurrency']
+
+    before = {key(r): r for r in baseline['scenarios']} # pyright: ignore[reportGeneralTypeIssues]
+    regressions: list[str] = []
+    for result in current['scenarios']: # pyright: ignore[reportGeneralTypeIssues]
+        old = before.get(key(result))
+        if old is None:
+            continue
+        name = f"{result['scenario']} x{result['concurrency']}"
+        old_p95, new_p95 = old['latency_ms']['p95'], result['latency_ms']['p95']
+        if old_p95 and (new_p95 - old_p95) / old_p95 > threshold:
+            regressions.append(f"{name}: p95 {old_p95:.1f} ms -> {new_p95:.1f} ms")
+        old_tp, new_tp = old['throughput'], result['throughput']
+        if old_tp and (old_tp - new_tp) / old_tp > threshold:
+            regressions.append(f"{name}: vazão {old_tp:.1f}/s -> {new_tp:.1f}/s")
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', default=QUESTIONS_PATH, help="arquivo de questões")
+    parser.add_argument('--bank-size', type=int, default=None, help="questões no banco (replica o arquivo)")
+    parser.add_argument('--answers', type=int, default=400, help="respostas por cenário")
+    parser.add_argument('--batch-size', type=int, default=32, help="respostas por requisição em route-batch")
+    parser.add_argument('--concurrency', default='1,8', help="clientes simultâneos, separados por vírgula")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="cenários a executar")
+    parser.add_argument('--seed', type=int, default=42, help="semente do corpus")
+    parser.add_argument('--output', help="arquivo JSON de saída")
+    parser.add_argument('--compare', help="resultado anterior para detectar regressões")
+    parser.add_argument('--threshold', type=float, default=0.10, help="piora tolerada com --compare")
+    args = parser.parse_args()
+
+    # Importados aqui para que --help não carregue a aplicação
+    from fastapi.testclient import TestClient
+    import config
+    import question
+    from app import app
+    from similarity_cache import similarity_cache
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        bank = build_bank(json.load(f), args.bank_size)
+    question.questions.clear()
+    question.questions.update({q['question_id']: q for q in bank})
+
+    start = time.perf_counter()
+    question.precompute_embeddings()
+    warmup_seconds = time.perf_counter() - start
+    print(f"Banco: {len(bank)} questões, embeddings em {warmup_seconds:.1f}s")
+
+    client = TestClient(app)
+    calls: dict[str, Callable[[list[tuple[str, str]]], object]] = {
+        'evaluate': lambda request: question.evaluate(*request[0]),
+        'route': lambda request: client.post(
+            f"/questions/evaluate/{request[0][0]}", json={'answer': request[0][1]}).raise_for_status(),
+        'route-batch': lambda request: client.post(
+            "/questions/evaluate",
+            json=[{'question_id': qid, 'answer': answer} for qid, answer in request]).raise_for_status(),
+    }
+
+    corpus = build_corpus(bank, args.answers, args.seed)
+    # Uma rodada curta fora da medição, para que a primeira amostra não pague a inicialização
+    question.evaluate_batch(corpus[:8])
+
+    results: list[dict[str, object]] = []
+    for name in args.scenarios.split(','):
+        size = args.batch_size if name == 'route-batch' else 1
+        requests = [corpus[i:i + size] for i in range(0, len(corpus), size)]
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            similarity_cache.clear()
+            result = run_scenario(name, calls[name], requests, concurrency)
+            results.append(result)
+            latency = result['latency_ms']
+            print(f"{name:12} x{concurrency:<3} p50 {latency['p50']:8.1f} ms  p95 {latency['p95']:8.1f} ms  " # pyright: ignore[reportIndexIssue]
+                  f"p99 {latency['p99']:8.1f} ms  {result['throughput']:8.1f} resp/s  " # pyright: ignore[reportIndexIssue]
+                  f"erros {result['errors']}  RSS {result['peak_rss_mb'] or 0:.0f} MB")
+
+    report: dict[str, object] = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'model': config.MODEL_NAME,
+            'encoder_backend': config.ENCODER_BACKEND,
+            'batch_window_ms': config.BATCH_WINDOW_MS,
+            'inference_threads': config.INFERENCE_THREADS,
+            'inference_processes': config.INFERENCE_PROCESSES,
+            'bank_size': len(bank),
+            'answers': args.answers,
+            'seed': args.seed,
+            'embeddings_seconds': warmup_seconds,
+        },
+        'scenarios': results,
+    }
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"✅ Resultado salvo em {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for regression in regressions:
+            print(f"⚠️ Regressão: {regression}")
+        if regressions:
+            return 1
+        print("✅ Nenhuma regressão em relação ao resultado anterior")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
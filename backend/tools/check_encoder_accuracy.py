@@ -0,0 +1,115 @@
+# check_encoder_accuracy.py
+
+"""
+Compara as similaridades e pontuações de um backend do codificador (ex.: onnx-int8)
+com as do backend torch, sobre o banco de questões em data/questions.json.
+
+Uso (na pasta backend):
+    python tools/check_encoder_accuracy.py --backend onnx-int8
+
+Termina com código 1 se alguma pontuação (0/40/70/100) mudar entre os backends.
+"""
+
+import argparse
+import json
+import sys
+import os
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sentence_transformers import util
+
+from natural_language import get_model
+from question import similarity_to_score
+
+QUESTIONS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'questions.json')
+
+
+def build_pairs(question_list: list[dict[str, str]]) -> list[tuple[str, str]]:
+    """
+    Monta pares (resposta, gabarito) que cobrem todas as faixas de pontuação: o próprio
+    gabarito, o gabarito pela metade, o enunciado e o gabarito de outra questão.
+
+    Args:
+        question_list (list[dict[str, str]]): Questões do banco.
+    Returns:
+        (list[tuple[str, str]]): Pares (resposta, gabarito).
+    """
+
+    pairs: list[tuple[str, str]] = []
+    for i, question in enumerate(question_list):
+        reference = question['correct_answer']
+        words = reference.split()
+        other = question_list[(i + 1) % len(question_list)]['correct_answer']
+        pairs.append((reference, reference))
+        pairs.append((' '.join(words[:max(len(words) // 2, 1)]), reference))
+        pairs.append((question['statement'], reference))
+        pairs.append((other, reference))
+    return pairs
+
+
+def similarities(backend: str, pairs: list[tuple[str, str]]) -> list[float]:
+    """Calcula a similaridade de cada par com o backend informado."""
+
+    model = get_model(backend=backend)
+    answers = model.encode([answer for answer, _ in pairs]) # pyright: ignore[reportUnknownMemberType]
+    references = model.encode([reference for _, reference in pairs]) # pyright: ignore[reportUnknownMemberType]
+    return util.pairwise_cos_sim(answers, references).clamp(min=0).tolist() # pyright: ignore[reportUnknownMemberType]
+
+
+def compare(baseline: list[float], candidate: list[float]) -> dict[str, float | int | list[int]]:
+    """
+    Compara duas listas de similaridades.
+
+    Args:
+        baseline (list[float]): Similaridades do backend de referência (torch).
+        candidate (list[float]): Similaridades do backend avaliado.
+    Returns:
+        (dict): Objeto contendo pairs, max_abs_diff, mean_abs_diff e grade_mismatches
+        (índices dos pares cuja pontuação mudou).
+    """
+
+    diffs = [abs(a - b) for a, b in zip(baseline, candidate)]
+    mismatches = [
+        i for i, (a, b) in enumerate(zip(baseline, candidate))
+        if similarity_to_score(a) != similarity_to_score(b)
+    ]
+    return {
+        'pairs': len(diffs),
+        'max_abs_diff': max(diffs, default=0.0),
+        'mean_abs_diff': sum(diffs) / len(diffs) if diffs else 0.0,
+        'grade_mismatches': mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', default='onnx-int8', help="backend avaliado (onnx ou onnx-int8)")
+    parser.add_argument('--questions', default=QUESTIONS_PATH, help="arquivo de questões")
+    args = parser.parse_args()
+
+    with open(args.questions, 'r', encoding='utf-8') as f:
+        question_list = json.load(f)
+
+    pairs = build_pairs(question_list)
+    baseline = similarities('torch', pairs)
+    candidate = similarities(args.backend, pairs)
+    report = compare(baseline, candidate)
+
+    print(f"Pares avaliados: {report['pairs']}")
+    print(f"Diferença absoluta máxima: {report['max_abs_diff']:.4f}")
+    print(f"Diferença absoluta média: {report['mean_abs_diff']:.4f}")
+    for i in report['grade_mismatches']: # pyright: ignore[reportGeneralTypeIssues]
+        answer, reference = pairs[i]
+        print(f"⚠️ Pontuação diferente ({baseline[i]:.3f} x {candidate[i]:.3f}): {answer!r} / {reference!r}")
+
+    if report['grade_mismatches']:
+        print(f"⚠️ {len(report['grade_mismatches'])} pontuações mudaram com o backend {args.backend}") # pyright: ignore[reportArgumentType]
+        return 1
+    print(f"✅ Nenhuma pontuação mudou com o backend {args.backend}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
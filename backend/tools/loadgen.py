@@ -0,0 +1,288 @@
+# loadgen.py
+
+"""
+Gerador de carga que reproduz o início de uma prova contra uma instância local da API:
+os alunos chegam em rajada e buscam a lista de questões (GET /questions), depois enviam
+respostas espaçadas por um tempo de reflexão, enquanto administradores criam, editam e
+removem questões. Ao final, informa percentis de latência e taxa de erros por rota.
+
+Uso (na pasta backend, com a API rodando em outro terminal):
+    python app.py
+    python tools/loadgen.py --url http://127.0.0.1:5000 --students 300
+    python tools/loadgen.py --profile perfil.json --output bench/prova.json
+
+O perfil (--profile) é um JSON com qualquer subconjunto das chaves de DEFAULT_PROFILE;
+opções da linha de comando têm precedência. As questões criadas pelos administradores
+têm o enunciado marcado com ADMIN_MARKER e são removidas ao final.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Any
+
+# Adiciona o diretório das ferramentas ao path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import percentile
+
+DEFAULT_PROFILE: dict[str, Any] = {
+    'students': 100,                 # alunos simultâneos
+    'ramp_seconds': 5.0,             # janela em que os alunos chegam (rajada de GET /questions)
+    'answers_per_student': 5,        # respostas enviadas por aluno
+    'think_seconds': [2.0, 10.0],    # intervalo (mín., máx.) entre as respostas de um aluno
+    'list_fields': 'question_id,statement',
+    'admins': 1,                     # administradores editando durante a prova
+    'admin_edits': 5,                # edições por administrador
+    'admin_interval_seconds': 3.0,   # intervalo entre as edições de um administrador
+    'timeout_seconds': 30.0,
+    'seed': 42,
+}
+
+ADMIN_MARKER = "[loadgen]"
+
+
+def load_profile(path: str | None, overrides: dict[str, Any]) -> dict[str, Any]:
+    """
+    Monta o perfil de tráfego: valores padrão, depois o arquivo JSON, depois overrides.
+
+    Args:
+        path (str | None): Arquivo JSON do perfil.
+        overrides (dict[str, Any]): Valores da linha de comando (None é ignorado).
+    Returns:
+        (dict[str, Any]): Perfil completo.
+
+    ## Assertivas de saída:
+        - Levanta ValueError se o arquivo tiver chaves desconhecidas.
+    """
+
+    profile = dict(DEFAULT_PROFILE)
+    if path is not None:
+        with open(path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        unknown = set(loaded) - set(DEFAULT_PROFILE)
+        if unknown:
+            raise ValueError(f"Chaves desconhecidas no perfil: {', '.join(sorted(unknown))}")
+        profile.update(loaded)
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+    return profile
+
+
+class EndpointStats:
+    """Latências e códigos de resposta de cada rota, identificada por 'MÉTODO /caminho'."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[str, int]] = {}
+
+    def record(self, endpoint: str, seconds: float, status: int | str) -> None:
+        """
+        Registra uma requisição.
+
+        Args:
+            endpoint (str): Rota (ex.: 'POST /questions/evaluate/{id}').
+            seconds (float): Latência da requisição.
+            status (int | str): Código HTTP, ou nome da exceção em caso de falha de conexão.
+        """
+
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def summary(self, elapsed: float) -> dict[str, dict[str, Any]]:
+        """
+        Resume as requisições de cada rota.
+
+        Args:
+            elapsed (float): Duração total da carga, em segundos.
+        Returns:
+            (dict[str, dict[str, Any]]): Por rota: requests, errors, error_rate, rps,
+            statuses e latency_ms (p50, p95, p99, max).
+        """
+
+        report: dict[str, dict[str, Any]] = {}
+        for endpoint in sorted(self.latencies):
+            ms = [seconds * 1000 for seconds in self.latencies[endpoint]]
+            statuses = self.statuses[endpoint]
+            errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+            report[endpoint] = {
+                'requests': len(ms),
+                'errors': errors,
+                'error_rate': errors / len(ms),
+                'rps': len(ms) / elapsed if elapsed else 0.0,
+                'statuses': dict(sorted(statuses.items())),
+                'latency_ms': {
+                    'p50': percentile(ms, 50),
+                    'p95': percentile(ms, 95),
+                    'p99': percentile(ms, 99),
+                    'max': max(ms),
+                },
+            }
+        return report
+
+
+class LoadGenerator:
+    """Executa o perfil de tráfego com um cliente HTTP assíncrono (httpx)."""
+
+    def __init__(self, profile: dict[str, Any], base_url: str, transport: Any = None):
+        """
+        Args:
+            profile (dict[str, Any]): Perfil de tráfego (ver load_profile).
+            base_url (str): Endereço da API (ex.: http://127.0.0.1:5000).
+            transport (Any): Transporte httpx alternativo (ex.: httpx.ASGITransport nos testes).
+        """
+
+        self.profile = profile
+        self.base_url = base_url
+        self.transport = transport
+        self.stats = EndpointStats()
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Executa a carga completa.
+
+        Returns:
+            (dict[str, Any]): Objeto contendo profile, seconds e endpoints (ver EndpointStats.summary).
+        """
+
+        import httpx
+
+        profile = self.profile
+        limits = httpx.Limits(max_connections=profile['students'] + profile['admins'])
+        async with httpx.AsyncClient(base_url=self.base_url, transport=self.transport, limits=limits,
+                                     timeout=profile['timeout_seconds']) as client:
+            start = time.perf_counter()
+            tasks = [self._student(client, i) for i in range(profile['students'])]
+            tasks += [self._admin(client, i) for i in range(profile['admins'])]
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - start
+            await self._cleanup(client)
+
+        return {'profile': profile, 'seconds': elapsed, 'endpoints': self.stats.summary(elapsed)}
+
+    async def _request(self, client: Any, endpoint: str, method: str, url: str, **kwargs: Any) -> Any:
+        """Executa uma requisição e registra a latência e o código de resposta."""
+
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception as e:
+            self.stats.record(endpoint, time.perf_counter() - start, type(e).__name__)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    async def _student(self, client: Any, index: int) -> None:
+        """Aluno: chega durante a rampa, busca as questões e responde algumas delas."""
+
+        profile = self.profile
+        rng = random.Random(profile['seed'] * 100003 + index)
+        await asyncio.sleep(rng.uniform(0, profile['ramp_seconds']))
+
+        response = await self._request(client, 'GET /questions', 'GET', '/questions',
+                                       params={'fields': profile['list_fields']})
+        if response is None or response.status_code != 200:
+            return
+        question_ids = [qid for qid, q in response.json().items() if ADMIN_MARKER not in q.get('statement', '')]
+        if not question_ids:
+            return
+
+        low, high = profile['think_seconds']
+        for i in range(profile['answers_per_student']):
+            await asyncio.sleep(rng.uniform(low, high))
+            question_id = rng.choice(question_ids)
+            answer = f"Resposta {i} do aluno {index}: " + ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(3, 20)))
+            await self._request(client, 'POST /questions/evaluate/{id}', 'POST',
+                                f'/questions/evaluate/{question_id}', json={'answer': answer})
+
+    async def _admin(self, client: Any, index: int) -> None:
+        """Administrador: cria uma questão e a edita repetidamente durante a prova."""
+
+        profile = self.profile
+        # O ponto final evita que a busca por 'administrador #1' encontre também o #10
+        statement = f"{ADMIN_MARKER} Questão do administrador #{index}."
+        await self._request(client, 'POST /questions', 'POST', '/questions',
+                            json={'statement': statement, 'correct_answer': "Gabarito inicial"})
+        response = await self._request(client, 'GET /questions', 'GET', '/questions',
+                                       params={'q': statement, 'fields': 'question_id'})
+        if response is None or response.status_code != 200 or not response.json():
+            return
+        question_id = next(iter(response.json()))
+
+        for i in range(profile['admin_edits']):
+            await asyncio.sleep(profile['admin_interval_seconds'])
+            await self._request(client, 'PUT /questions/{id}', 'PUT', f'/questions/{question_id}',
+                                json={'statement': statement, 'correct_answer': f"Gabarito revisado {i}"})
+
+    async def _cleanup(self, client: Any) -> None:
+        """Remove as questões criadas pelos administradores (fora das estatísticas)."""
+
+        try:
+            response = await client.get('/questions', params={'q': ADMIN_MARKER, 'fields': 'question_id'})
+            for question_id in response.json():
+                await client.delete(f'/questions/{question_id}')
+        except Exception as e:
+            print(f"⚠️ Falha ao remover as questões do gerador de carga: {e}")
+
+
+_WORDS: list[str] = (
+    "a o de que energia célula processo sistema projeto escopo variável fixo luz água "
+    "tempo resultado porque então função estrutura dados memória rede valor"
+).split()
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Exibe o resumo por rota em formato de tabela."""
+
+    print(f"Duração: {report['seconds']:.1f}s")
+    print(f"{'Rota':34} {'Req.':>6} {'Erros':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'máx. ms':>9}")
+    for endpoint, stats in report['endpoints'].items():
+        latency = stats['latency_ms']
+        print(f"{endpoint:34} {stats['requests']:6} {stats['error_rate']:6.1%} {latency['p50']:9.1f} "
+              f"{latency['p95']:9.1f} {latency['p99']:9.1f} {latency['max']:9.1f}")
+        for status, count in stats['statuses'].items():
+            if not status.isdigit() or int(status) >= 400:
+                print(f"    ⚠️ {status}: {count}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="endereço da API")
+    parser.add_argument('--profile', help="arquivo JSON com o perfil de tráfego")
+    parser.add_argument('--students', type=int, help="alunos simultâneos")
+    parser.add_argument('--ramp-seconds', type=float, help="janela de chegada dos alunos")
+    parser.add_argument('--answers-per-student', type=int, help="respostas por aluno")
+    parser.add_argument('--admins', type=int, help="administradores editando questões")
+    parser.add_argument('--seed', type=int, help="semente do perfil")
+    parser.add_argument('--output', help="arquivo JSON de saída")
+    args = parser.parse_args()
+
+    profile = load_profile(args.profile, {
+        'students': args.students,
+        'ramp_seconds': args.ramp_seconds,
+        'answers_per_student': args.answers_per_student,
+        'admins': args.admins,
+        'seed': args.seed,
+    })
+    report = asyncio.run(LoadGenerator(profile, args.url).run())
+    print_report(report)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+        print(f"✅ Resultado salvo em {args.output}")
+
+    errors = sum(stats['errors'] for stats in report['endpoints'].values())
+    if errors:
+        print(f"⚠️ {errors} requisições com erro")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+# vector_index.py
+
+from threading import Lock
+import numpy as np
+from numpy import ndarray
+
+import config
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["VectorIndex", "HnswIndex", "create_index", "INDEX_KINDS"]
+
+INDEX_KINDS: tuple[str, ...] = ("exact", "hnsw")
+
+
+def _normalize(vector: ndarray) -> ndarray:
+    """Normaliza o vetor (norma 1), para que o produto interno seja a similaridade de cosseno."""
+
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+
+class VectorIndex:
+    """
+    Índice exato de vetores identificados por texto (ex.: question_id), guardados
+    normalizados nas linhas de uma matriz NumPy. Uma consulta é um único produto
+    matriz-vetor seguido de uma seleção parcial dos k maiores valores.
+
+    Inserções usam a próxima linha livre (a matriz dobra de tamanho quando enche) e
+    remoções movem a última linha para a posição liberada, ambas em O(1) amortizado.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity (int): Quantidade inicial de linhas reservadas na matriz.
+
+        ## Assertivas de entrada:
+            - capacity deve ser maior que 0.
+        """
+
+        self._capacity = capacity
+        self._matrix: ndarray | None = None
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def upsert(self, key: str, vector: ndarray) -> None:
+        """
+        Insere ou substitui o vetor associado a key.
+
+        Args:
+            key (str): Identificador do vetor.
+            vector (ndarray): Vetor 1D. Todos os vetores do índice devem ter a mesma dimensão.
+        """
+
+        vector = _normalize(vector)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self._capacity, vector.shape[0]), dtype=np.float32)
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._ids)
+                if row == self._matrix.shape[0]:
+                    grown = np.zeros((2 * row, self._matrix.shape[1]), dtype=np.float32)
+                    grown[:row] = self._matrix
+                    self._matrix = grown
+                self._ids.append(key)
+                self._rows[key] = row
+            self._matrix[row] = vector
+
+    def upsert_many(self, keys: list[str], vectors: ndarray) -> None:
+        """
+        Insere ou substitui vários vetores (ex.: carga inicial do banco).
+
+        Args:
+            keys (list[str]): Identificadores dos vetores.
+            vectors (ndarray): Matriz com um vetor por linha, na ordem de keys.
+        """
+
+        for key, vector in zip(keys, vectors):
+            self.upsert(key, vector)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove o vetor associado a key, se existir.
+
+        Args:
+            key (str): Identificador do vetor.
+        """
+
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+            assert self._matrix is not None
+            last = len(self._ids) - 1
+            if row != last:
+                moved = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved
+                self._rows[moved] = row
+            self._ids.pop()
+
+    def export(self) -> tuple[list[str], ndarray]:
+        """
+        Retorna todos os vetores do índice, para persistência.
+
+        Returns:
+            (tuple[list[str], ndarray]): Identificadores e matriz com os vetores normalizados,
+            um por linha, na mesma ordem.
+        """
+
+        with self._lock:
+            if self._matrix is None:
+                return [], np.zeros((0, 0), dtype=np.float32)
+            return list(self._ids), self._matrix[:len(self._ids)].copy()
+
+    def get(self, key: str) -> ndarray | None:
+        """Retorna uma cópia do vetor (normalizado) associado a key, ou None."""
+
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None or self._matrix is None:
+                return None
+            return self._matrix[row].copy()
+
+    def search(self, vector: ndarray, k: int, exclude: str | None = None) -> list[tuple[str, float]]:
+        """
+        Retorna os k vetores mais similares ao vetor consultado.
+
+        Args:
+            vector (ndarray): Vetor consultado.
+            k (int): Quantidade máxima de resultados.
+            exclude (str | None): Identificador a ser ignorado (ex.: a própria questão).
+        Returns:
+            (list[tuple[str, float]]): Pares (identificador, similaridade de cosseno),
+            em ordem decrescente de similaridade.
+        """
+
+        query = _normalize(vector)
+        with self._lock:
+            n = len(self._ids)
+            if n == 0 or k <= 0 or self._matrix is None:
+                return []
+            scores = self._matrix[:n] @ query
+            excluded = self._rows.get(exclude) if exclude is not None else None
+            if excluded is not None:
+                scores[excluded] = -np.inf
+                n -= 1
+            k = min(k, n)
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])][:k]
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+
+class HnswIndex:
+    """
+    Índice aproximado (grafo HNSW, biblioteca opcional hnswlib), com a mesma interface
+    de VectorIndex. Indicado para bancos grandes, em que o produto matriz-vetor do
+    índice exato passa a dominar o tempo da consulta.
+    """
+
+    def __init__(self, capacity: int = 1024, m: int = 16, ef_construction: int = 200, ef_search: int = 64):
+        """
+        Args:
+            capacity (int): Quantidade inicial de vetores reservados (o índice cresce sozinho).
+            m (int): Arestas por nó do grafo.
+            ef_construction (int): Largura da busca durante a inserção.
+            ef_search (int): Largura da busca durante a consulta (maior é mais preciso e mais lento).
+
+        ## Assertivas de saída:
+            - Levanta ImportError se a biblioteca hnswlib não estiver instalada.
+        """
+
+        try:
+            import hnswlib
+        except ImportError as e:
+            raise ImportError("O índice 'hnsw' precisa da biblioteca hnswlib (pip install hnswlib)") from e
+
+        self._hnswlib = hnswlib
+        self._capacity = capacity
+        self._m = m
+        self._ef_construction = ef_construction
+        self._ef_search = ef_search
+        self._index = None
+        self._labels: dict[str, int] = {}
+        self._keys: dict[int, str] = {}
+        self._next_label = 0
+        self._deleted = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._labels
+
+    def upsert(self, key: str, vector: ndarray) -> None:
+        vector = _normalize(vector)
+        with self._lock:
+            if self._index is None:
+                self._index = self._hnswlib.Index(space='ip', dim=vector.shape[0])
+                self._index.init_index(max_elements=self._capacity, ef_construction=self._ef_construction,
+                                       M=self._m, allow_replace_deleted=True)
+                self._index.set_ef(self._ef_search)
+            self._remove_locked(key)
+            if self._deleted == 0 and self._index.get_current_count() >= self._index.get_max_elements():
+                self._index.resize_index(2 * self._index.get_max_elements())
+            label = self._next_label
+            self._next_label += 1
+            # Reaproveita o espaço de um vetor removido, se houver
+            self._index.add_items(vector[None], np.array([label]), replace_deleted=self._deleted > 0)
+            if self._deleted > 0:
+                self._deleted -= 1
+            self._labels[key] = label
+            self._keys[label] = key
+
+    def upsert_many(self, keys: list[str], vectors: ndarray) -> None:
+        """Insere ou substitui vários vetores em uma única chamada à hnswlib (construção em paralelo)."""
+
+        if len(keys) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        self.upsert(keys[0], vectors[0])
+        assert self._index is not None
+        with self._lock:
+            for key in keys[1:]:
+                self._remove_locked(key)
+            needed = self._index.get_current_count() + len(keys) - 1
+            if needed > self._index.get_max_elements():
+                self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+            labels = np.arange(self._next_label, self._next_label + len(keys) - 1)
+            self._next_label += len(keys) - 1
+            self._index.add_items(vectors[1:], labels)
+            for key, label in zip(keys[1:], labels):
+                self._labels[key] = int(label)
+                self._keys[int(label)] = key
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove_locked(key)
+
+    def export(self) -> tuple[list[str], ndarray]:
+        with self._lock:
+            if self._index is None or not self._labels:
+                return [], np.zeros((0, 0), dtype=np.float32)
+            keys = list(self._labels)
+            matrix = self._index.get_items([self._labels[key] for key in keys])
+            return keys, np.asarray(matrix, dtype=np.float32)
+
+    def get(self, key: str) -> ndarray | None:
+        with self._lock:
+            label = self._labels.get(key)
+            if label is None or self._index is None:
+                return None
+            return np.asarray(self._index.get_items([label]), dtype=np.float32)[0]
+
+    def search(self, vector: ndarray, k: int, exclude: str | None = None) -> list[tuple[str, float]]:
+        query = _normalize(vector)
+        with self._lock:
+            live = len(self._labels)
+            extra = 1 if exclude in self._labels else 0
+            k = min(k + extra, live)
+            if k <= 0 or self._index is None:
+                return []
+            labels, distances = self._index.knn_query(query[None], k=k)
+        # No espaço 'ip', a distância é 1 - produto interno
+        results = [
+            (self._keys[int(label)], 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0])
+            if self._keys.get(int(label)) not in (None, exclude)
+        ]
+        return results[:k - extra]
+
+    def _remove_locked(self, key: str) -> None:
+        """Marca o vetor de key como removido. Deve ser chamado com self._lock adquirido."""
+
+        label = self._labels.pop(key, None)
+        if label is None or self._index is None:
+            return
+        del self._keys[label]
+        self._index.mark_deleted(label)
+        self._deleted += 1
+
+
+def create_index(kind: str | None = None) -> VectorIndex | HnswIndex:
+    """
+    Cria um índice de vetores do tipo informado.
+
+    Args:
+        kind (str | None): 'exact' ou 'hnsw'. Se None, usa config.VECTOR_INDEX.
+    Returns:
+        (VectorIndex | HnswIndex): Índice vazio.
+
+    ## Assertivas de saída:
+        - Levanta ValueError se o tipo não estiver em INDEX_KINDS.
+        - Levanta ImportError se o tipo for 'hnsw' e a biblioteca hnswlib não estiver instalada.
+    """
+
+    kind = kind or config.VECTOR_INDEX
+    if kind == 'exact':
+        return VectorIndex()
+    if kind == 'hnsw':
+        return HnswIndex()
+    raise ValueError(f"Índice desconhecido: {kind} (opções: {', '.join(INDEX_KINDS)})")
@@ -0,0 +1,127 @@
+# warmup.py
+
+import time
+from collections.abc import Callable
+from threading import Event, Thread
+
+from worker_pool import batch_similarity, encode, load_model
+from question import ensure_embeddings
+import config
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["Warmup", "warmup"]
+
+# Frases de tamanhos variados, para que a primeira avaliação real não pague a
+# inicialização do torch nem a primeira execução de cada formato de lote
+_SAMPLES: list[str] = [
+    "Sim.",
+    "A fotossíntese converte luz em energia química.",
+    "A Revolução Francesa começou em 1789 e marcou o fim do absolutismo na França, "
+    "influenciando movimentos liberais em toda a Europa ao longo do século XIX.",
+]
+
+
+class Warmup:
+    """
+    Aquecimento da aplicação após a inicialização: carrega o modelo, executa
+    codificações de teste e calcula os embeddings do banco de questões. Enquanto
+    não termina, a aplicação responde /healthz, mas não /readyz.
+    """
+
+    def __init__(self, rounds: int, precompute: Callable[[], None] | None = None):
+        """
+        Args:
+            rounds (int): Quantidade de rodadas de codificação de teste.
+            precompute (Callable[[], None] | None): Função que calcula os embeddings do
+                banco de questões (ex.: question.ensure_embeddings).
+        """
+
+        self.rounds = rounds
+        self.precompute = precompute
+        self._ready = Event()
+        self._state = 'pending'
+        self._error: str | None = None
+        self._durations: dict[str, float] = {}
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Inicia o aquecimento em segundo plano."""
+
+        self._state = 'warming'
+        self._thread = Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def run(self) -> None:
+        """
+        Executa o aquecimento na thread atual.
+
+        ## Assertivas de saída:
+            - Em caso de sucesso, is_ready passa a retornar True.
+            - Em caso de erro, o estado fica 'failed' e o erro é informado em status.
+        """
+
+        self._state = 'warming'
+        try:
+            self._timed('model_load', load_model)
+            self._timed('encode', self._encode_samples)
+            if self.precompute is not None:
+                self._timed('embeddings', self.precompute)
+        except Exception as e:
+            self._state = 'failed'
+            self._error = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Falha no aquecimento: {self._error}")
+            return
+
+        self.mark_ready()
+        print(f"✅ Aquecimento concluído em {sum(self._durations.values()):.1f}s")
+
+    def mark_ready(self) -> None:
+        """Marca a aplicação como pronta (ex.: com o aquecimento desativado)."""
+
+        self._state = 'ready'
+        self._ready.set()
+
+    def is_ready(self) -> bool:
+        """Indica se a aplicação está pronta para receber tráfego."""
+        return self._ready.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Aguarda o fim do aquecimento. Retorna is_ready()."""
+        return self._ready.wait(timeout)
+
+    def status(self) -> dict[str, object]:
+        """
+        Retorna o estado do aquecimento.
+
+        Returns:
+            (dict[str, object]): Objeto contendo ready, state ('pending', 'warming',
+            'ready' ou 'failed'), error e durations (segundos de cada etapa).
+        """
+
+        return {
+            'ready': self.is_ready(),
+            'state': self._state,
+            'error': self._error,
+            'durations': dict(self._durations),
+        }
+
+    def _encode_samples(self) -> None:
+        """Codifica as frases de teste em lotes de tamanhos diferentes e calcula similaridades."""
+
+        batch = (_SAMPLES * config.BATCH_MAX_SIZE)[:config.BATCH_MAX_SIZE]
+        for _ in range(self.rounds):
+            for sentence in _SAMPLES:
+                encode([sentence])
+            references = encode(batch)
+            batch_similarity(batch, references)
+
+    def _timed(self, stage: str, fn: Callable[[], object]) -> None:
+        """Executa uma etapa do aquecimento e registra a sua duração."""
+
+        start = time.perf_counter()
+        fn()
+        self._durations[stage] = time.perf_counter() - start
+
+
+warmup: Warmup = Warmup(config.WARMUP_ROUNDS, ensure_embeddings)
+"""Instância compartilhada pelo processo, com config.WARMUP_ROUNDS rodadas de codificação."""
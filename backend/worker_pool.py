@@ -0,0 +1,200 @@
+# worker_pool.py
+
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from numpy import ndarray
+
+import config
+import natural_language
+from natural_language import batch_sentence_similarity, get_model
+
+# Encapsulamento dos atributos e disponibilização apenas das funções de acesso
+__all__ = ["WorkerPool", "pool", "batch_similarity", "encode", "load_model"]
+
+# Módulo importado pelo forkserver antes de criar os processos (ver worker_preload)
+_PRELOAD: tuple[str, ...] = ('worker_preload',)
+
+
+def _init_worker(torch_threads: int) -> None:
+    """
+    Inicializa um processo de inferência: limita as threads do PyTorch e garante o
+    modelo carregado antes da primeira tarefa. Com forkserver, o modelo já veio do
+    processo servidor (ver worker_preload) e get_model apenas o reutiliza.
+    """
+
+    import torch
+    torch.set_num_threads(torch_threads)
+    get_model()
+
+
+def _worker_similarities(answers: list[str], references: ndarray, counts: list[int] | None) -> list[float]:
+    """Tarefa executada dentro de um processo de inferência."""
+    return batch_sentence_similarity(answers, references, counts)
+
+
+def _worker_encode(sentences: list[str]) -> ndarray:
+    """Codificação executada dentro de um processo de inferência."""
+    return natural_language.encode(sentences)
+
+
+def _worker_ready() -> int:
+    """Tarefa vazia, usada para criar os processos antes do primeiro pedido."""
+    return os.getpid()
+
+
+class WorkerPool:
+    """
+    Pool de processos de inferência, separado dos workers do uvicorn.
+
+    Os processos são criados com forkserver (ou spawn, onde ele não existe), nunca com
+    fork: o processo da API tem várias threads (uvicorn, pools do torch e do OpenMP), e
+    um fork a partir dele pode herdar travas ocupadas e travar o processo filho.
+
+    Com forkserver, o modelo é carregado uma única vez no processo servidor, que tem uma
+    só thread (módulos em preload), e os processos de inferência nascem de um fork dele:
+    os pesos são compartilhados por cópia na escrita em vez de duplicados por processo.
+    Com spawn, cada processo carrega o próprio modelo em _init_worker. Nos dois casos, o
+    processo da API não carrega o modelo: a codificação também é feita no pool (encode).
+    """
+
+    def __init__(self, processes: int, torch_threads: int,
+                 initializer: Callable[[int], None] = _init_worker,
+                 preload: tuple[str, ...] = _PRELOAD):
+        """
+        Args:
+            processes (int): Quantidade de processos de inferência.
+            torch_threads (int): Threads do PyTorch em cada processo.
+            initializer (Callable[[int], None]): Função executada em cada processo ao iniciar,
+                com torch_threads (ex.: substituída nos testes para não carregar o modelo).
+            preload (tuple[str, ...]): Módulos importados pelo forkserver antes de criar os
+                processos. Só têm efeito se o forkserver do processo ainda não tiver iniciado.
+
+        ## Assertivas de entrada:
+            - processes e torch_threads devem ser maiores que 0.
+        """
+
+        self.processes = processes
+        self.torch_threads = torch_threads
+        self.initializer = initializer
+        self.preload = preload
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+
+    def similarities(self, answers: list[str], references: ndarray, counts: list[int] | None = None) -> list[float]:
+        """
+        Avalia um lote de respostas em um dos processos de inferência.
+
+        Args:
+            answers (list[str]): Respostas a serem avaliadas.
+            references (ndarray): Matriz de embeddings das referências, agrupadas por resposta.
+            counts (list[int] | None): Referências de cada resposta. Se None, uma por resposta.
+        Returns:
+            (list[float]): Maior similaridade de cada resposta com as suas referências.
+        """
+
+        return self._get_executor().submit(_worker_similarities, answers, references, counts).result()
+
+    def encode(self, sentences: list[str]) -> ndarray:
+        """
+        Calcula os embeddings de várias frases em um dos processos de inferência.
+
+        Args:
+            sentences (list[str]): Frases a serem codificadas.
+        Returns:
+            (ndarray): Matriz com um embedding por linha, na mesma ordem das frases.
+        """
+
+        return self._get_executor().submit(_worker_encode, sentences).result()
+
+    def start(self) -> None:
+        """Cria todos os processos de inferência (e carrega o modelo) antes do primeiro pedido."""
+
+        executor = self._get_executor()
+        for future in [executor.submit(_worker_ready) for _ in range(self.processes)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Encerra os processos de inferência."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Cria o pool na primeira utilização."""
+
+        if self._executor is not None:
+            return self._executor
+        with self._lock:
+            if self._executor is None:
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                context = multiprocessing.get_context(method)
+                if method == 'forkserver':
+                    context.set_forkserver_preload(list(self.preload))
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=context,
+                    initializer=self.initializer,
+                    initargs=(self.torch_threads,),
+                )
+                print(f"✅ Pool de inferência iniciado com {self.processes} processos")
+        return self._executor
+
+
+pool: WorkerPool = WorkerPool(max(config.INFERENCE_PROCESSES, 1), config.WORKER_TORCH_THREADS)
+"""Instância compartilhada pelo processo, usada quando config.INFERENCE_PROCESSES é maior que 0."""
+
+
+def batch_similarity(answers: list[str], references: ndarray, counts: list[int] | None = None) -> list[float]:
+    """
+    Avalia um lote de respostas no pool de processos, se configurado, ou no próprio processo.
+
+    Args:
+        answers (list[str]): Respostas a serem avaliadas.
+        references (ndarray): Matriz de embeddings das referências, agrupadas por resposta.
+        counts (list[int] | None): Referências de cada resposta. Se None, uma por resposta.
+    Returns:
+        (list[float]): Maior similaridade de cada resposta com as suas referências.
+
+    ## Assertivas de saída:
+        - O resultado é o mesmo de natural_language.batch_sentence_similarity.
+    """
+
+    if config.INFERENCE_PROCESSES > 0:
+        return pool.similarities(answers, references, counts)
+    return batch_sentence_similarity(answers, references, counts)
+
+
+def encode(sentences: list[str]) -> ndarray:
+    """
+    Calcula os embeddings de várias frases no pool de processos, se configurado, ou no
+    próprio processo.
+
+    Args:
+        sentences (list[str]): Frases a serem codificadas.
+    Returns:
+        (ndarray): Matriz com um embedding por linha, na mesma ordem das frases.
+
+    ## Assertivas de saída:
+        - O resultado é o mesmo de natural_language.encode.
+    """
+
+    if config.INFERENCE_PROCESSES > 0:
+        return pool.encode(sentences)
+    return natural_language.encode(sentences)
+
+
+def load_model() -> None:
+    """
+    Carrega o modelo onde a inferência vai rodar: nos processos do pool, se configurado
+    (sem carregá-lo no processo da API), ou no próprio processo.
+    """
+
+    if config.INFERENCE_PROCESSES > 0:
+        pool.start()
+    else:
+        get_model()
@@ -0,0 +1,13 @@
+# worker_preload.py
+
+# Importado pelo forkserver do pool de inferência (worker_pool) antes de criar os
+# processos: o modelo é carregado uma única vez no processo servidor e herdado pelos
+# processos de inferência por cópia na escrita.
+
+from natural_language import get_model
+
+try:
+    get_model()
+except Exception as e:
+    # Cada processo tenta de novo em worker_pool._init_worker
+    print(f"⚠️ Falha ao pré-carregar o modelo no forkserver: {e}")
@@ -18,7 +18,8 @@ export default function Questions() {
     useEffect(() => {
         async function loadQuestions() {
             try {
-                const response = await fetch("http://127.0.0.1:5000/questions");
+                // Os alunos só precisam do enunciado; o gabarito não é baixado
+                const response = await fetch("http://127.0.0.1:5000/questions?fields=question_id,statement");
                 const data: QuestionsResponse = await response.json();
                 // O backend retorna um dicionário, transformamos em array aqui
                 setQuestions(Object.values(data));